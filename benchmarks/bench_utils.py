@@ -0,0 +1,152 @@
+"""
+Shared helpers for the benchmark scripts in this directory.
+
+Benchmarks run against a throwaway test database created with Django's test
+machinery (``test_<NAME>`` on PostgreSQL, a temporary file on SQLite), never
+against real data. Run them from the project root, e.g.::
+
+    python benchmarks/ingest_memory.py --sizes 10000 100000
+"""
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+SEED_BATCH_SIZE = 5000
+
+
+def setup_django():
+    """Configure Django using DJANGO_SETTINGS_MODULE (default: coophive.settings)"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'coophive.settings')
+    import django
+    from django.conf import settings
+    django.setup()
+    # Like the test runner: DEBUG would keep every executed query in memory
+    settings.DEBUG = False
+
+
+def create_benchmark_db(name=None, keepdb=False):
+    """Create the throwaway benchmark database and point the default connection at it"""
+    from django.db import connection
+
+    if connection.vendor == 'sqlite':
+        test_settings = connection.settings_dict.setdefault('TEST', {})
+        test_settings['NAME'] = os.path.join(
+            tempfile.gettempdir(), f"coophive_benchmark_{name or os.getpid()}.sqlite3"
+        )
+    connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False, keepdb=keepdb
+    )
+    return connection
+
+
+def destroy_benchmark_db(old_name, keepdb=False):
+    from django.db import connection
+    connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+@contextmanager
+def timed(results, key):
+    """Store the wall-clock seconds spent in the block under ``results[key]``"""
+    start = time.perf_counter()
+    yield
+    results[key] = time.perf_counter() - start
+
+
+def simple_tweet(tweet_id):
+    """A scraped tweet in the n8n simple format"""
+    return {
+        "Tweet ID": str(tweet_id),
+        "URL": f"https://x.com/coophive/status/{tweet_id}",
+        "Content": (
+            f"Benchmark tweet {tweet_id} about decentralized compute "
+            "and agent-first marketplaces #coophive"
+        ),
+        "Likes": tweet_id % 500,
+        "Retweets": tweet_id % 70,
+        "Replies": tweet_id % 30,
+        "Quotes": tweet_id % 11,
+        "Views": tweet_id % 50000,
+        "Date": "Thu Aug 14 14:30:31 +0000 2025",
+        "Status": "success",
+        "Tweet": f"https://twitter.com/coophive/status/{tweet_id}",
+    }
+
+
+def seed_source_tweets(rows, executions=500):
+    """
+    Insert ``rows`` SourceTweets over ``executions`` executions with plain executemany.
+
+    Dates spread over 2025, engagement is heavy-tailed, ~3% have status
+    'error' and ~10% are unprocessed. Deterministic for a given ``rows``.
+    Index triggers on the table (FTS, trigram) run for every row, so drop
+    them first when they are not what is being measured.
+    """
+    from django.db import connection, transaction
+
+    from twitter.models import Execution
+
+    rng = random.Random(42)
+    Execution.objects.bulk_create([
+        Execution(execution_id=f"exec_{n:04d}", source_url="https://n8n.coophive.network")
+        for n in range(executions)
+    ])
+    start = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+    sql = (
+        "INSERT INTO twitter_sourcetweet (tweet_id, url, content, likes, retweets, replies, "
+        "quotes, views, date, status, tweet_url, execution_id, source_url, processed_at, "
+        "is_processed) "
+        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
+    )
+    with transaction.atomic(), connection.cursor() as cursor:
+        for offset in range(0, rows, SEED_BATCH_SIZE):
+            batch = []
+            for n in range(offset, min(offset + SEED_BATCH_SIZE, rows)):
+                likes = int(rng.paretovariate(1.2)) - 1
+                date = start + timedelta(seconds=rng.randrange(365 * 24 * 3600))
+                batch.append((
+                    # Snowflake-like 19-digit IDs; the multiplier is coprime to 10**17,
+                    # so they stay unique
+                    str(18 * 10 ** 17 + n * 2654435761 % 10 ** 17),
+                    f"https://x.com/coophive/status/{n}",
+                    f"Benchmark tweet {n}",
+                    likes, likes // 4, likes // 10, likes // 20,
+                    likes * 40 + rng.randrange(100),
+                    date,
+                    'success' if rng.random() < 0.97 else 'error',
+                    f"https://twitter.com/coophive/status/{n}",
+                    f"exec_{rng.randrange(executions):04d}",
+                    "https://n8n.coophive.network",
+                    date,
+                    rng.random() >= 0.1,
+                ))
+            cursor.executemany(sql, batch)
+        if connection.vendor == 'postgresql':
+            cursor.execute("ANALYZE twitter_sourcetweet")
+        else:
+            cursor.execute("ANALYZE")
+
+
+def print_table(headers, rows):
+    """Print rows as a fixed-width table"""
+    widths = [max(len(str(value)) for value in column) for column in zip(headers, *rows)]
+    for row in [headers, ['-' * width for width in widths], *rows]:
+        print('  '.join(str(value).rjust(width) for value, width in zip(row, widths)))
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Bulk export and import of SourceTweet: COPY fast path vs the ORM paths.
+
+Seeds a throwaway database with ``--rows`` tweets, then times:
+
+- view loop: model instances written into a plain ``HttpResponse``, the
+  ``ExportTweetsView`` loop before it streamed
+- streaming view: ``export_response`` (values_list + iterator), what
+  ``ExportTweetsView`` does now
+- bulk_copy export: ``COPY ... TO STDOUT`` on PostgreSQL, the ORM stream
+  elsewhere (and with ``--orm`` on PostgreSQL, for comparison)
+- bulk_copy import: the dump loaded back into the emptied table, through
+  ``COPY ... FROM STDIN`` on PostgreSQL or batched executemany elsewhere
+
+Usage::
+
+    python benchmarks/bulk_copy.py [--rows 200000]
+"""
+import argparse
+import io
+
+import bench_utils
+from export_memory import buffered_export
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=200_000)
+    args = parser.parse_args()
+
+    bench_utils.setup_django()
+    from django.db import connection
+
+    from twitter.bulk_copy import copy_export, copy_import, uses_copy
+    from twitter.exports import export_response
+    from twitter.models import SourceTweet
+    from twitter.search import drop_search_index
+    from twitter.trigram import drop_trigram_indexes
+
+    old_name = bench_utils.create_benchmark_db()
+    try:
+        # Index triggers would dominate the import; they are not what is measured here
+        drop_search_index(connection)
+        drop_trigram_indexes(connection)
+        bench_utils.seed_source_tweets(args.rows)
+        queryset = SourceTweet.objects.order_by('-date')
+
+        results = {}
+        with bench_utils.timed(results, 'view loop'):
+            size = sum(len(chunk) for chunk in buffered_export(queryset))
+        with bench_utils.timed(results, 'streaming view'):
+            sum(len(chunk) for chunk in export_response(queryset).streaming_content)
+
+        modes = [True, False] if uses_copy() else [False]
+        dumps = {}
+        for use_copy in modes:
+            label = 'COPY' if use_copy else 'ORM'
+            dumps[use_copy] = io.StringIO(newline='')
+            with bench_utils.timed(results, f'bulk_copy export ({label})'):
+                copy_export('source_tweets', dumps[use_copy], use_copy=use_copy)
+        for use_copy in modes:
+            label = 'COPY' if use_copy else 'ORM'
+            SourceTweet.objects.all().delete()
+            dumps[use_copy].seek(0)
+            with bench_utils.timed(results, f'bulk_copy import ({label})'):
+                copy_import('source_tweets', dumps[use_copy], use_copy=use_copy)
+    finally:
+        bench_utils.destroy_benchmark_db(old_name)
+
+    print(f"{args.rows:,} rows on {connection.vendor}, CSV {size / (1024 * 1024):.1f} MB\n")
+    baseline = results['view loop']
+    bench_utils.print_table(
+        ['path', 'seconds', 'rows/s', 'vs view loop'],
+        [
+            [
+                name, f"{seconds:.2f}", f"{args.rows / seconds:,.0f}",
+                '-' if 'import' in name else f"{baseline / seconds:.1f}x",
+            ]
+            for name, seconds in results.items()
+        ],
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Peak memory and time to first byte of the scraped tweets CSV export.
+
+For every size each mode runs in a fresh subprocess on its own seeded
+database, so ``ru_maxrss`` reflects that mode alone:
+
+- buffered: model instances written into a plain ``HttpResponse``, which
+  is what ``ExportTweetsView`` did before
+- streaming: ``export_response``, consuming the streamed response
+
+Usage::
+
+    python benchmarks/export_memory.py [--sizes 100000 1000000] [--modes buffered streaming]
+"""
+import argparse
+import csv
+import json
+import subprocess
+import sys
+import time
+
+import bench_utils
+
+
+def buffered_export(queryset):
+    """The pre-streaming export: every row as a model instance, the whole CSV in memory"""
+    from django.http import HttpResponse
+
+    response = HttpResponse(content_type='text/csv')
+    writer = csv.writer(response)
+    writer.writerow([
+        'Tweet ID', 'Content', 'URL', 'Likes', 'Retweets', 'Replies', 'Quotes', 'Views', 'Date',
+        'Execution ID', 'Status',
+    ])
+    for tweet in queryset:
+        writer.writerow([
+            tweet.tweet_id, tweet.content, tweet.url, tweet.likes, tweet.retweets, tweet.replies,
+            tweet.quotes, tweet.views, tweet.date.strftime('%Y-%m-%d %H:%M:%S'),
+            tweet.execution_id, tweet.status,
+        ])
+    return [response.content]
+
+
+def run_child(mode, size):
+    """Export ``size`` seeded tweets with ``mode`` and print a JSON result line"""
+    bench_utils.setup_django()
+    old_name = bench_utils.create_benchmark_db()
+
+    from django.db import connection
+
+    from twitter.exports import export_response
+    from twitter.models import SourceTweet
+    from twitter.search import drop_search_index
+
+    drop_search_index(connection)
+    bench_utils.seed_source_tweets(size)
+    queryset = SourceTweet.objects.order_by('-date')
+
+    baseline = bench_utils.peak_rss_mb()
+    start = time.perf_counter()
+    first_byte = None
+    response_bytes = 0
+    if mode == 'buffered':
+        chunks = buffered_export(queryset)
+    else:
+        chunks = export_response(queryset).streaming_content
+    for chunk in chunks:
+        if first_byte is None:
+            first_byte = time.perf_counter() - start
+        response_bytes += len(chunk)
+    seconds = time.perf_counter() - start
+
+    results = dict(
+        baseline_mb=baseline, peak_mb=bench_utils.peak_rss_mb(), first_byte=first_byte,
+        seconds=seconds, response_bytes=response_bytes,
+    )
+    bench_utils.destroy_benchmark_db(old_name)
+    print(json.dumps(results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument(
+        '--modes', nargs='+', default=['buffered', 'streaming'], choices=['buffered', 'streaming']
+    )
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'SIZE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child[0], int(args.child[1]))
+        return
+
+    rows = []
+    for size in args.sizes:
+        for mode in args.modes:
+            output = subprocess.run(
+                [sys.executable, __file__, '--child', mode, str(size)],
+                check=True, capture_output=True, text=True
+            ).stdout.strip().splitlines()[-1]
+            result = json.loads(output)
+            rows.append([
+                f"{size:,}", mode, f"{result['response_bytes'] / (1024 * 1024):.1f}",
+                f"{result['peak_mb'] - result['baseline_mb']:.1f}",
+                f"{result['first_byte'] * 1000:.1f}", f"{result['seconds']:.2f}",
+            ])
+
+    bench_utils.print_table(
+        ['tweets', 'mode', 'CSV MB', 'growth MB', 'first byte ms', 'seconds'], rows
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Partial tweet_id / execution_id lookups with and without the trigram indexes.
+
+Seeds a throwaway database with ``--rows`` tweets (19-digit snowflake-like
+IDs, ``--executions`` executions), then times the browser's partial-ID
+lookups twice:
+
+- before: plain ``icontains``, a full scan on every backend
+- after: ``trigram.substring_condition`` over the indexes from migration
+  0012 (pg_trgm GIN on PostgreSQL, FTS5 trigram tables on SQLite)
+
+Prints the median latency of ``--repeat`` runs, the number of matches and
+the time to build the indexes. Needles shorter than three characters have
+no trigram and stay on ``icontains`` by design.
+
+Usage::
+
+    python benchmarks/id_substring_search.py [--rows 1000000] [--repeat 5]
+"""
+import argparse
+import statistics
+import time
+
+import bench_utils
+
+
+def median_ms(queryset, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        matches = len(queryset)
+        timings.append(time.perf_counter() - start)
+        queryset = queryset.all()  # Drop the result cache for the next run
+    return statistics.median(timings) * 1000, matches
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--executions', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    bench_utils.setup_django()
+    from django.db import connection
+    from django.db.models import Q
+
+    from twitter.models import Execution, SourceTweet
+    from twitter.search import drop_search_index
+    from twitter.trigram import create_trigram_indexes, drop_trigram_indexes, substring_condition
+
+    old_name = bench_utils.create_benchmark_db()
+    try:
+        results = {}
+        with bench_utils.timed(results, 'seed'):
+            drop_search_index(connection)
+            drop_trigram_indexes(connection)
+            bench_utils.seed_source_tweets(args.rows, args.executions)
+        print(f"Seeded {args.rows} rows in {results['seed']:.1f}s ({connection.vendor})")
+
+        tweet_ids = SourceTweet.objects.order_by('id').values_list('tweet_id', flat=True)
+        sample = tweet_ids[args.rows // 2]
+        lookups = [
+            (SourceTweet, 'tweet_id', sample),  # full ID
+            (SourceTweet, 'tweet_id', sample[7:15]),  # 8 digits from the middle
+            (SourceTweet, 'tweet_id', sample[-6:]),  # last 6 digits
+            (SourceTweet, 'tweet_id', sample[5:9]),  # 4 digits, many matches
+            (SourceTweet, 'tweet_id', '424242424'),  # no match
+            (SourceTweet, 'tweet_id', sample[-2:]),  # too short for trigrams
+            (Execution, 'execution_id', 'c_042'),
+        ]
+
+        def ids(model, condition):
+            return model.objects.filter(condition).values_list('id', flat=True)
+
+        before = [
+            median_ms(ids(model, Q(**{f'{field}__icontains': needle})), args.repeat)
+            for model, field, needle in lookups
+        ]
+        with bench_utils.timed(results, 'index'):
+            create_trigram_indexes(connection)
+        print(f"Built trigram indexes in {results['index']:.1f}s\n")
+        after = [
+            median_ms(ids(model, substring_condition(model, field, needle)), args.repeat)
+            for model, field, needle in lookups
+        ]
+    finally:
+        bench_utils.destroy_benchmark_db(old_name)
+
+    bench_utils.print_table(
+        ['field', 'needle', 'matches', 'icontains ms', 'trigram ms', 'speedup'],
+        [
+            [
+                field, needle, matches,
+                f"{before_ms:.2f}", f"{after_ms:.2f}", f"{before_ms / after_ms:.0f}x",
+            ]
+            for (_, field, needle), (before_ms, matches), (after_ms, _)
+            in zip(lookups, before, after)
+        ],
+    )
+
+
+if __name__ == '__main__':
+    main()
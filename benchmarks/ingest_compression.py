@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Compressed n8n payloads: wire size and end-to-end ingest time per codec.
+
+For every size a simple-format scrape payload is built and encoded as
+identity, gzip, deflate and (when ``zstandard`` is installed) zstd. Each
+encoding is POSTed to check-duplicate-tweet through the Django test client
+against an empty SourceTweet table. The benchmark reports the request size,
+the compression ratio and the response size with and without
+``Accept-Encoding: gzip``.
+
+Usage::
+
+    python benchmarks/ingest_compression.py [--sizes 1000 10000] [--level 6]
+"""
+import argparse
+import gzip
+import json
+import zlib
+
+import bench_utils
+
+
+def encode(body, encoding, level):
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=level)
+    if encoding == 'deflate':
+        return zlib.compress(body, level)
+    if encoding == 'zstd':
+        import zstandard
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    return body
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--level', type=int, default=6, help="gzip/deflate compression level")
+    args = parser.parse_args()
+
+    bench_utils.setup_django()
+    from django.test import Client
+    from django.test.utils import setup_test_environment
+    from django.urls import reverse
+
+    from twitter.compression import supported_encodings
+    from twitter.models import SourceTweet
+
+    setup_test_environment()
+    old_name = bench_utils.create_benchmark_db()
+    url = reverse('twitter:api_check_duplicate')
+    client = Client()
+    rows = []
+    try:
+        for size in args.sizes:
+            payload = {
+                "execution_id": "exec_benchmark",
+                "source_url": "https://n8n.coophive.network",
+                "tweets": [bench_utils.simple_tweet(tweet_id) for tweet_id in range(1, size + 1)],
+            }
+            body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+            for encoding in ['identity', *supported_encodings()]:
+                encoded = encode(body, encoding, args.level)
+                for accept in ('', 'gzip'):
+                    SourceTweet.objects.all().delete()
+                    results = {}
+                    with bench_utils.timed(results, 'seconds'):
+                        response = client.post(
+                            url, data=encoded, content_type='application/json',
+                            HTTP_CONTENT_ENCODING=encoding, HTTP_ACCEPT_ENCODING=accept
+                        )
+                        response_bytes = len(response.content)
+                    assert response.status_code == 200, response.status_code
+                    rows.append([
+                        size, encoding, accept or '-', len(encoded),
+                        f"{len(body) / len(encoded):.1f}x", response_bytes,
+                        f"{results['seconds']:.3f}",
+                    ])
+    finally:
+        bench_utils.destroy_benchmark_db(old_name)
+
+    bench_utils.print_table(
+        ['tweets', 'encoding', 'accept', 'request bytes', 'ratio', 'response bytes', 'seconds'],
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Peak memory of check-duplicate-tweet ingestion: buffered vs streaming.
+
+For every size a scrape payload is written to a temporary file, then each
+mode runs in a fresh subprocess so ``ru_maxrss`` reflects that mode alone:
+
+- buffered: ``json.load`` + ``process_duplicate_check`` + DRF rendering,
+  which is what the endpoint does with ``request.data``
+- streaming: ``stream_duplicate_check`` over the file, consuming the
+  streamed response
+
+Usage::
+
+    python benchmarks/ingest_memory.py [--sizes 10000 100000 1000000] [--modes buffered streaming]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import bench_utils
+
+
+def write_payload(path, size):
+    """Write a single-execution scrape payload without holding it in memory"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(
+            '{"execution_id":"exec_benchmark",'
+            '"source_url":"https://n8n.coophive.network","tweets":['
+        )
+        for tweet_id in range(1, size + 1):
+            if tweet_id > 1:
+                f.write(',')
+            f.write(json.dumps(bench_utils.simple_tweet(tweet_id), separators=(',', ':')))
+        f.write(']}')
+
+
+def run_child(mode, payload_path):
+    """Ingest ``payload_path`` with ``mode`` and print a JSON result line"""
+    bench_utils.setup_django()
+    old_name = bench_utils.create_benchmark_db()
+
+    from rest_framework.renderers import JSONRenderer
+
+    from twitter.ingestion import process_duplicate_check
+    from twitter.streaming import stream_duplicate_check
+
+    baseline = bench_utils.peak_rss_mb()
+    results = {}
+    with bench_utils.timed(results, 'seconds'):
+        if mode == 'buffered':
+            with open(payload_path, 'rb') as f:
+                data = json.load(f)
+            body, _ = process_duplicate_check(data)
+            response_bytes = len(JSONRenderer().render(body))
+        else:
+            with open(payload_path, 'rb') as f:
+                response = stream_duplicate_check(f)
+                response_bytes = sum(len(chunk) for chunk in response.streaming_content)
+
+    results.update(
+        baseline_mb=baseline, peak_mb=bench_utils.peak_rss_mb(), response_bytes=response_bytes
+    )
+    bench_utils.destroy_benchmark_db(old_name)
+    print(json.dumps(results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument(
+        '--modes', nargs='+', default=['buffered', 'streaming'], choices=['buffered', 'streaming']
+    )
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'PAYLOAD'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child)
+        return
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for size in args.sizes:
+            payload_path = os.path.join(tmpdir, f"payload_{size}.json")
+            write_payload(payload_path, size)
+            payload_mb = os.path.getsize(payload_path) / (1024 * 1024)
+            for mode in args.modes:
+                output = subprocess.run(
+                    [sys.executable, __file__, '--child', mode, payload_path],
+                    check=True, capture_output=True, text=True
+                ).stdout.strip().splitlines()[-1]
+                result = json.loads(output)
+                rows.append([
+                    f"{size:,}", mode, f"{payload_mb:.1f}", f"{result['baseline_mb']:.1f}",
+                    f"{result['peak_mb']:.1f}", f"{result['peak_mb'] - result['baseline_mb']:.1f}",
+                    f"{result['seconds']:.2f}",
+                ])
+
+    bench_utils.print_table(
+        ['tweets', 'mode', 'payload MB', 'baseline MB', 'peak RSS MB', 'growth MB', 'seconds'], rows
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for scraped tweet timestamps.
+
+Compares, per date format:
+
+- ``legacy``: the parser ingestion used before ``twitter.dates``
+  (``fromisoformat`` when the string contains a 'T', else ``dateutil``)
+- ``dateutil``: ``dateutil.parser.parse`` alone, the old path for
+  Twitter-format dates once the 'T' check is out of the way
+- ``parse_tweet_date``: the fast path, one value at a time
+- ``parse_tweet_dates``: the batch API over the whole column
+
+The ``legacy ok`` column counts values the legacy parser actually parsed
+rather than replacing with now(). Every "Thu ..." date contains a 'T' and
+was silently replaced. No database is needed.
+
+Usage::
+
+    python benchmarks/parse_dates.py [--values 100000] [--distinct 20000] [--repeat 5]
+"""
+import argparse
+import gc
+import time
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+import bench_utils
+
+
+def legacy_parse_tweet_date(date_str, date_parser, timezone):
+    """parse_tweet_date as it was before twitter.dates"""
+    try:
+        if date_str:
+            if 'T' in date_str:
+                return timezone.datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+            tweet_date = date_parser.parse(date_str)
+            if tweet_date.tzinfo is None:
+                tweet_date = timezone.make_aware(tweet_date)
+            return tweet_date
+    except (ValueError, AttributeError, ImportError):
+        pass
+    return timezone.now()
+
+
+def build_column(fmt, values, distinct):
+    """``values`` dates drawn from ``distinct`` timestamps, like a scrape of many accounts"""
+    start = datetime(2025, 8, 14, 14, 30, 31, 837000, tzinfo=dt_timezone.utc)
+    stamps = [start - timedelta(seconds=7 * i) for i in range(distinct)]
+    column = [stamps[i % distinct] for i in range(values)]
+    if fmt == 'twitter':
+        return [stamp.strftime('%a %b %d %H:%M:%S +0000 %Y') for stamp in column]
+    return [
+        stamp.strftime('%Y-%m-%dT%H:%M:%S.') + f"{stamp.microsecond // 1000:03d}Z"
+        for stamp in column
+    ]
+
+
+def best_of(repeat, func):
+    """Fastest of ``repeat`` runs, with the GC paused like timeit does"""
+    best = None
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--values', type=int, default=100000)
+    parser.add_argument(
+        '--distinct', type=int, default=20000, help="distinct timestamps in the column"
+    )
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    bench_utils.setup_django()
+    from dateutil import parser as date_parser
+    from django.utils import timezone
+
+    from twitter.dates import parse_tweet_date, parse_tweet_dates
+
+    rows = []
+    for fmt in ('twitter', 'iso'):
+        column = build_column(fmt, args.values, args.distinct)
+        expected = parse_tweet_dates(column)
+        assert all(d.year == 2025 for d in expected)
+
+        legacy_results = [legacy_parse_tweet_date(v, date_parser, timezone) for v in column[:1000]]
+        legacy_ok = sum(a == b for a, b in zip(legacy_results, expected))
+
+        def legacy():
+            return [legacy_parse_tweet_date(v, date_parser, timezone) for v in column]
+
+        timings = {
+            'legacy': best_of(args.repeat, legacy),
+            'dateutil': best_of(args.repeat, lambda: [date_parser.parse(v) for v in column]),
+            'single': best_of(args.repeat, lambda: [parse_tweet_date(v) for v in column]),
+            'batch': best_of(args.repeat, lambda: parse_tweet_dates(column)),
+        }
+        per_value = {key: seconds / args.values * 1e6 for key, seconds in timings.items()}
+        rows.append([
+            fmt, args.values, f"{legacy_ok / 10:.0f}%",
+            *(f"{per_value[key]:.2f}" for key in ('legacy', 'dateutil', 'single', 'batch')),
+            f"{timings['dateutil'] / timings['batch']:.0f}x",
+        ])
+
+    bench_utils.print_table(
+        [
+            'format', 'values', 'legacy ok', 'legacy us', 'dateutil us', 'single us', 'batch us',
+            'batch vs dateutil',
+        ],
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
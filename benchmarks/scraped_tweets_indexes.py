@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Scraped tweets browser queries with and without the SourceTweet indexes.
+
+Seeds a throwaway database with ``--rows`` tweets (dates over a year,
+skewed engagement, a few hundred executions, ~10% unprocessed), then runs
+the filter/sort combinations of ``ScrapedTweetsView`` twice:
+
+- before: the composite indexes dropped and total engagement sorted through
+  the ``likes + retweets + replies + quotes`` expression, as the view did
+- after: the indexes from ``SourceTweet.Meta.indexes`` and the stored
+  ``total_engagement`` column
+
+For every query it prints the plan (``EXPLAIN QUERY PLAN`` on SQLite, the
+top plan node on PostgreSQL) and the median latency of ``--repeat`` runs
+fetching one 51-row page. The FTS index is dropped while seeding; search is
+not part of this benchmark.
+
+Usage::
+
+    python benchmarks/scraped_tweets_indexes.py [--rows 1000000] [--repeat 5]
+"""
+import argparse
+import re
+import statistics
+import time
+from datetime import datetime
+from datetime import timezone as dt_timezone
+
+import bench_utils
+
+PAGE = 51  # per_page + 1, like paginate_keyset
+
+
+def build_queries(stored_engagement):
+    """(name, queryset) pairs for one page of each filter/sort combination"""
+    from django.db.models import F
+
+    from twitter.models import SourceTweet
+
+    tweets = SourceTweet.objects.all()
+    if stored_engagement:
+        by_engagement = tweets.order_by('-total_engagement', '-id')
+    else:
+        by_engagement = tweets.annotate(
+            engagement=F('likes') + F('retweets') + F('replies') + F('quotes')
+        ).order_by('-engagement', '-id')
+    newest = tweets.order_by('-date', '-id')
+    middle = datetime(2025, 7, 1, tzinfo=dt_timezone.utc)
+    return [
+        ('newest first', newest),
+        ('deep keyset page', newest.filter(date__lt=middle)),
+        ('last 7 days', newest.filter(date__gte=datetime(2025, 12, 24, tzinfo=dt_timezone.utc))),
+        ('most liked', tweets.order_by('-likes', '-id')),
+        ('most viewed', tweets.order_by('-views', '-id')),
+        ('total engagement', by_engagement),
+        ('min_likes=50', newest.filter(likes__gte=50)),
+        ('one execution', newest.filter(execution_id='exec_0042')),
+        ('status=error', newest.filter(status='error')),
+        ('unprocessed', newest.filter(is_processed=False)),
+    ]
+
+
+def plan_summary(queryset):
+    from django.db import connection
+
+    plan = queryset[:PAGE].explain()
+    if connection.vendor == 'sqlite':
+        # Lines look like '4 0 0 SCAN twitter_sourcetweet'; keep the detail column
+        return '; '.join(re.sub(r'^[\d ]+', '', line.strip(' |-`')) for line in plan.splitlines())
+    return plan.splitlines()[0].split('  (cost')[0]
+
+
+def measure(queries, repeat):
+    rows = []
+    for name, queryset in queries:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            list(queryset[:PAGE])
+            timings.append(time.perf_counter() - start)
+        rows.append((name, statistics.median(timings) * 1000, plan_summary(queryset)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--executions', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    bench_utils.setup_django()
+    from django.db import connection
+
+    from twitter.models import SourceTweet
+    from twitter.search import drop_search_index
+
+    old_name = bench_utils.create_benchmark_db()
+    try:
+        results = {}
+        with bench_utils.timed(results, 'seed'):
+            drop_search_index(connection)
+            bench_utils.seed_source_tweets(args.rows, args.executions)
+        print(f"Seeded {args.rows} rows in {results['seed']:.1f}s ({connection.vendor})\n")
+
+        indexes = SourceTweet._meta.indexes
+        with connection.schema_editor() as editor:
+            for index in indexes:
+                editor.remove_index(SourceTweet, index)
+        before = measure(build_queries(stored_engagement=False), args.repeat)
+
+        with bench_utils.timed(results, 'index'):
+            with connection.schema_editor() as editor:
+                for index in indexes:
+                    editor.add_index(SourceTweet, index)
+            with connection.cursor() as cursor:
+                if connection.vendor == 'postgresql':
+                    cursor.execute("ANALYZE twitter_sourcetweet")
+                else:
+                    cursor.execute("ANALYZE")
+        print(f"Built {len(indexes)} indexes in {results['index']:.1f}s\n")
+        after = measure(build_queries(stored_engagement=True), args.repeat)
+    finally:
+        bench_utils.destroy_benchmark_db(old_name)
+
+    bench_utils.print_table(
+        ['query', 'before ms', 'after ms', 'speedup'],
+        [
+            [name, f"{before_ms:.2f}", f"{after_ms:.2f}", f"{before_ms / after_ms:.0f}x"]
+            for (name, before_ms, _), (_, after_ms, _) in zip(before, after)
+        ],
+    )
+    print()
+    for (name, _, before_plan), (_, _, after_plan) in zip(before, after):
+        print(f"{name}\n  before: {before_plan}\n  after:  {after_plan}")
+
+
+if __name__ == '__main__':
+    main()
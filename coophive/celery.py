@@ -0,0 +1,15 @@
+"""
+Celery application for coophive project.
+
+Background work (n8n ingestion jobs) is defined in each app's ``tasks.py``.
+Without ``CELERY_BROKER_URL`` tasks run eagerly in-process, see settings.py.
+"""
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'coophive.settings')
+
+app = Celery('coophive')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -279,6 +279,71 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Celery - background processing for async n8n ingestion
+# Without a broker URL tasks run eagerly in-process (tests, single-node installs);
+# background exports are refused then, since they would run inside the request
+CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'memory://')
+CELERY_TASK_ALWAYS_EAGER = os.getenv(
+    'CELERY_TASK_ALWAYS_EAGER', 'False' if os.getenv('CELERY_BROKER_URL') else 'True'
+).lower() == 'true'
+CELERY_TASK_IGNORE_RESULT = True  # Job state lives in twitter.IngestionJob
+CELERY_TASK_ACKS_LATE = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+
+# n8n ingestion - JSON bodies at least this large (bytes) are parsed incrementally
+N8N_STREAMING_THRESHOLD = int(os.getenv('N8N_STREAMING_THRESHOLD', str(5 * 1024 * 1024)))
+# Upper bound (bytes) for gzip/deflate/zstd request bodies once inflated
+N8N_MAX_DECOMPRESSED_BYTES = int(os.getenv('N8N_MAX_DECOMPRESSED_BYTES', str(200 * 1024 * 1024)))
+# Hours a finished async ingestion job stays pollable (`manage.py purge_ingestion_jobs`);
+# its payload is cleared as soon as it finishes
+INGESTION_JOB_TTL_HOURS = int(os.getenv('INGESTION_JOB_TTL_HOURS', '24'))
+# Seconds a stored n8n response is replayed to webhook retries (0 disables replay)
+N8N_IDEMPOTENCY_TTL = int(os.getenv('N8N_IDEMPOTENCY_TTL', str(24 * 60 * 60)))
+# Update likes/retweets/... of re-scraped duplicates by default (per request: ?refresh=true)
+N8N_REFRESH_ENGAGEMENT = os.getenv('N8N_REFRESH_ENGAGEMENT', 'False').lower() == 'true'
+
+# Engagement time series - ingestion appends a snapshot per scraped tweet;
+# `manage.py downsample_engagement` folds old raw rows into hourly, then daily rows
+N8N_ENGAGEMENT_SNAPSHOTS = os.getenv('N8N_ENGAGEMENT_SNAPSHOTS', 'True').lower() == 'true'
+ENGAGEMENT_RAW_RETENTION_HOURS = int(os.getenv('ENGAGEMENT_RAW_RETENTION_HOURS', '48'))
+ENGAGEMENT_HOURLY_RETENTION_DAYS = int(os.getenv('ENGAGEMENT_HOURLY_RETENTION_DAYS', '30'))
+
+# Scraped tweets browser - show the PostgreSQL planner's row estimate instead of an
+# exact COUNT(*) for the table total when it is large
+SCRAPED_TWEETS_APPROXIMATE_COUNT = os.getenv(
+    'SCRAPED_TWEETS_APPROXIMATE_COUNT', 'True'
+).lower() == 'true'
+# Cache backend for the scraped tweets browser: per-process memory by default, set a
+# redis:// URL to share results and the ingestion generation across web nodes
+SCRAPED_TWEETS_CACHE_URL = os.getenv('SCRAPED_TWEETS_CACHE_URL', '')
+# Seconds filtered pages, stats and the execution list stay cached (0 disables); entries
+# are keyed by an ingestion generation, so new tweets make them unreachable immediately.
+# That only holds across processes with a shared backend: the per-process default never
+# sees ingestion in other workers, Celery or bulk_copy, so it only absorbs reload bursts
+SCRAPED_TWEETS_CACHE_SECONDS = int(os.getenv(
+    'SCRAPED_TWEETS_CACHE_SECONDS', '600' if SCRAPED_TWEETS_CACHE_URL else '5'
+))
+
+# Background exports - gzipped files written by the worker, served with Range support
+# and removed `EXPORT_JOB_TTL_HOURS` after they finish (`manage.py purge_export_jobs`)
+EXPORT_JOBS_ROOT = os.getenv('EXPORT_JOBS_ROOT', os.path.join(MEDIA_ROOT, 'exports'))
+EXPORT_JOB_TTL_HOURS = int(os.getenv('EXPORT_JOB_TTL_HOURS', '24'))
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'scraped_tweets': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': SCRAPED_TWEETS_CACHE_URL,
+        'KEY_PREFIX': 'coophive',
+    } if SCRAPED_TWEETS_CACHE_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'scraped-tweets',
+        'OPTIONS': {'MAX_ENTRIES': 2000},
+    },
+}
+
 # Authentication Settings
 AUTHENTICATION_BACKENDS = [
     # Custom backend for email/username login
@@ -1,12 +1,39 @@
 from django.contrib import admin
-from .models import TwitterPost, SourceTweet, CampaignBatch, GeneratedTweet
+from django.db.models import Q
+from .models import TwitterPost, Execution, SourceTweet, CampaignBatch, GeneratedTweet, IngestionJob, ExportJob, IdempotencyRecord, EngagementSnapshot
+from .search import search_condition
+from .trigram import substring_condition
+
+@admin.register(Execution)
+class ExecutionAdmin(admin.ModelAdmin):
+    list_display = ('execution_id', 'source_url', 'received_count', 'new_count', 'duplicate_count', 'call_count', 'duration_ms', 'last_call_at')
+    list_filter = ('last_call_at',)
+    search_fields = ('execution_id', 'source_url')
+    readonly_fields = (
+        'received_count', 'new_count', 'duplicate_count', 'refreshed_count', 'call_count', 'duration_ms',
+        'created_at', 'last_call_at',
+    )
 
 @admin.register(SourceTweet)
 class SourceTweetAdmin(admin.ModelAdmin):
     list_display = ('tweet_id', 'content_preview', 'likes', 'retweets', 'date', 'is_processed')
     list_filter = ('is_processed', 'status', 'date')
-    search_fields = ('tweet_id', 'content', 'execution_id')
+    search_fields = ('tweet_id', 'content', 'execution__execution_id')
+    search_help_text = 'Content uses the full-text index: "exact phrase", prefix*'
     readonly_fields = ('processed_at',)
+    raw_id_fields = ('execution',)
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        condition = (
+            search_condition(search_term)
+            | substring_condition(SourceTweet, 'tweet_id', search_term)
+            | Q(execution_id__in=Execution.objects.filter(
+                substring_condition(Execution, 'execution_id', search_term)
+            ).values('execution_id'))
+        )
+        return queryset.filter(condition), False
     
     def content_preview(self, obj):
         return obj.content[:100] + "..." if len(obj.content) > 100 else obj.content
@@ -14,10 +41,13 @@ class SourceTweetAdmin(admin.ModelAdmin):
 
 @admin.register(CampaignBatch)
 class CampaignBatchAdmin(admin.ModelAdmin):
-    list_display = ('batch_id', 'title', 'total_tweets', 'status', 'brand_alignment_score', 'created_at')
+    list_display = ('batch_id', 'title', 'total_tweets', 'stored_tweets', 'approved_count', 'posted_count', 'status', 'brand_alignment_score', 'created_at')
     list_filter = ('status', 'source_type', 'created_at')
     search_fields = ('batch_id', 'title', 'description')
-    readonly_fields = ('created_at', 'secure_token')
+    readonly_fields = (
+        'created_at', 'secure_token', 'brand_aligned_count', 'draft_count', 'approved_count',
+        'posted_count', 'rejected_count', 'deleted_count',
+    )
 
 @admin.register(GeneratedTweet)
 class GeneratedTweetAdmin(admin.ModelAdmin):
@@ -30,6 +60,35 @@ class GeneratedTweetAdmin(admin.ModelAdmin):
         return obj.content[:100] + "..." if len(obj.content) > 100 else obj.content
     content_preview.short_description = 'Content'
 
+@admin.register(IngestionJob)
+class IngestionJobAdmin(admin.ModelAdmin):
+    list_display = ('job_id', 'kind', 'status', 'response_status', 'created_at', 'finished_at')
+    list_filter = ('kind', 'status', 'created_at')
+    search_fields = ('job_id',)
+    readonly_fields = ('job_id', 'created_at', 'started_at', 'finished_at')
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ('job_id', 'kind', 'export_format', 'status', 'rows_written', 'file_size', 'created_by', 'created_at', 'expires_at')
+    list_filter = ('kind', 'export_format', 'status', 'created_at')
+    search_fields = ('job_id',)
+    raw_id_fields = ('created_by',)
+    readonly_fields = ('job_id', 'created_at', 'started_at', 'finished_at')
+
+@admin.register(IdempotencyRecord)
+class IdempotencyRecordAdmin(admin.ModelAdmin):
+    list_display = ('key', 'endpoint', 'response_status', 'created_at', 'expires_at')
+    list_filter = ('endpoint', 'created_at')
+    search_fields = ('key',)
+    readonly_fields = ('created_at',)
+
+@admin.register(EngagementSnapshot)
+class EngagementSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('source_tweet_id', 'post_id', 'captured_at', 'resolution', 'likes', 'retweets', 'views')
+    list_filter = ('resolution', 'captured_at')
+    search_fields = ('source_tweet__tweet_id',)
+    raw_id_fields = ('source_tweet', 'post')
+
 @admin.register(TwitterPost)
 class TwitterPostAdmin(admin.ModelAdmin):
     list_display = ('content_preview', 'status', 'is_thread', 'thread_position', 'retweets', 'likes', 'scheduled_time')
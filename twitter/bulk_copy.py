@@ -0,0 +1,283 @@
+"""
+Bulk dump and load of SourceTweet, GeneratedTweet and CampaignBatch.
+
+On PostgreSQL both directions use ``COPY`` through psycopg2's
+``copy_expert``, so rows never become Python objects:
+
+- export: ``COPY (SELECT ...) TO STDOUT``, optionally for a filtered queryset
+- import: ``COPY staging FROM STDIN`` into a temporary table, then one
+  ``INSERT ... SELECT ... ON CONFLICT DO NOTHING`` into the real table, so
+  rows already present (same natural key) are skipped rather than failing
+  the load
+
+Other databases (SQLite in development) take the ORM path. The export
+streams ``values_list().iterator()`` through the csv module. The import
+parses rows in batches of IMPORT_BATCH_SIZE and runs one
+``INSERT ... ON CONFLICT DO NOTHING`` executemany per batch.
+
+Both paths read and write the same file: CSV with a header row and ``\\N``
+for NULL (COPY's notation), booleans as ``t``/``f``, and JSON columns as
+JSON text. A dump taken on one backend loads on the other. Generated tweets
+carry their campaign's ``batch_id`` instead of the batch's primary key, and
+rows whose batch does not exist are skipped. Imported tweets get their
+Execution rows registered, batch counters are reconciled and the browser
+cache is invalidated, as after a regular ingestion.
+"""
+import csv
+import json
+import logging
+from itertools import islice
+
+from django.db import connection, connections, models, transaction
+
+from .counters import reconcile_status_counts
+from .ingestion import register_executions
+from .models import CampaignBatch, GeneratedTweet, SourceTweet
+from .result_cache import bump_ingestion_generation
+
+logger = logging.getLogger(__name__)
+
+NULL_MARKER = '\\N'
+EXPORT_CHUNK_SIZE = 5000
+IMPORT_BATCH_SIZE = 5000
+
+
+class CopyColumn:
+    """
+    One CSV column: its header, the ORM lookup that reads it, the field that
+    parses it and the model field (``target``) it is inserted into.
+    """
+
+    def __init__(self, header, lookup, field, target=None):
+        self.header = header
+        self.lookup = lookup
+        self.field = field
+        self.target = target or field
+
+
+class CopyTable:
+    """
+    The portable columns of one model and the natural key its import deduplicates on.
+
+    Every concrete field except the primary key and generated columns is
+    copied. ``foreign_key`` names a ForeignKey to write as the related row's
+    ``natural_key`` instead of its primary key.
+    """
+
+    def __init__(self, model, conflict_fields, foreign_key=None, natural_key=None):
+        self.model = model
+        self.db_table = model._meta.db_table
+        self.conflict_columns = [model._meta.get_field(name).column for name in conflict_fields]
+        self.foreign_key = model._meta.get_field(foreign_key) if foreign_key else None
+        self.natural_key = natural_key
+        self.columns = []
+        for field in model._meta.concrete_fields:
+            if field.primary_key or field.generated:
+                continue
+            if field is self.foreign_key:
+                related = field.related_model._meta.get_field(natural_key)
+                lookup = f'{field.name}__{natural_key}'
+                self.columns.append(CopyColumn(natural_key, lookup, related, target=field))
+            else:
+                self.columns.append(CopyColumn(field.column, field.attname, field))
+
+    @property
+    def headers(self):
+        return [column.header for column in self.columns]
+
+    def export_queryset(self, queryset=None):
+        queryset = self.model.objects.all() if queryset is None else queryset
+        return queryset.order_by('pk').values_list(*(column.lookup for column in self.columns))
+
+
+COPY_TABLES = {
+    'source_tweets': CopyTable(SourceTweet, ['tweet_id']),
+    'campaign_batches': CopyTable(CampaignBatch, ['batch_id']),
+    'generated_tweets': CopyTable(
+        GeneratedTweet, ['campaign_batch', 'tweet_id'],
+        foreign_key='campaign_batch', natural_key='batch_id',
+    ),
+}
+
+
+def uses_copy(conn=connection):
+    return conn.vendor == 'postgresql'
+
+
+def _to_csv(value):
+    if type(value) in (str, int):
+        return value  # Most values: no conversion
+    if value is None:
+        return NULL_MARKER
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat(sep=' ') if hasattr(value, 'hour') else value.isoformat()
+    return value
+
+
+# Parsed values of these fields are already what the database driver takes
+PLAIN_FIELDS = (
+    models.CharField, models.TextField, models.IntegerField, models.BooleanField, models.ForeignKey,
+)
+
+
+def _parser(field):
+    """Function turning a CSV value into ``field``'s Python value"""
+    if isinstance(field, models.JSONField):
+        parse = json.loads
+    elif isinstance(field, models.BooleanField):
+        def parse(value):
+            return value in ('t', 'true', 'True', '1')
+    elif isinstance(field, (models.CharField, models.TextField)):
+        parse = str
+    elif isinstance(field, models.IntegerField):
+        parse = int
+    else:
+        parse = field.to_python
+    return lambda value: None if value == NULL_MARKER else parse(value)
+
+
+def copy_export(name, f, queryset=None, use_copy=None, conn=connection):
+    """
+    Write the ``name`` table (or ``queryset`` of its model) to the text file ``f``.
+
+    Returns the number of rows written. ``use_copy`` defaults to COPY on
+    PostgreSQL and the ORM stream elsewhere.
+    """
+    table = COPY_TABLES[name]
+    rows = table.export_queryset(queryset)
+    use_copy = uses_copy(conn) if use_copy is None else use_copy
+
+    csv.writer(f).writerow(table.headers)
+    if use_copy:
+        sql, params = rows.query.sql_with_params()
+        with conn.cursor() as cursor:
+            # COPY takes no bind parameters, so the filter values are inlined by the driver
+            query = cursor.mogrify(sql, params).decode()
+            cursor.copy_expert(
+                f"COPY ({query}) TO STDOUT WITH (FORMAT csv, NULL '{NULL_MARKER}')", f
+            )
+            return cursor.rowcount
+
+    writer = csv.writer(f)
+    count = 0
+    for row in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        writer.writerow([_to_csv(value) for value in row])
+        count += 1
+    return count
+
+
+def _read_header(table, f):
+    header = next(csv.reader([f.readline()]), [])
+    if header != table.headers:
+        raise ValueError(f"Unexpected columns {header}, expected {table.headers}")
+
+
+def _import_copy(table, f, conn):
+    qn = conn.ops.quote_name
+    staging = f"{table.db_table}_copy_staging"
+    headers = table.headers
+    with conn.cursor() as cursor:
+        # Same column types as the export query, created empty and dropped at commit
+        select_sql, params = table.export_queryset().query.sql_with_params()
+        cursor.execute(
+            f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS {select_sql} WITH NO DATA", params
+        )
+        columns = ', '.join(qn(h) for h in headers)
+        cursor.copy_expert(
+            f"COPY {staging} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '{NULL_MARKER}')", f
+        )
+        cursor.execute(f"SELECT COUNT(*) FROM {staging}")
+        staged = cursor.fetchone()[0]
+
+        if table.model is SourceTweet:
+            cursor.execute(
+                f"SELECT DISTINCT ON (execution_id) execution_id, source_url FROM {staging}"
+            )
+            register_executions(dict(cursor.fetchall()))
+
+        targets = ', '.join(qn(column.target.column) for column in table.columns)
+        if table.foreign_key is not None:
+            related = table.foreign_key.related_model._meta
+            key = qn(table.natural_key)
+            sources = ', '.join(
+                f"r.{qn(related.pk.column)}" if h == table.natural_key else f"s.{qn(h)}"
+                for h in headers
+            )
+            from_sql = f"{staging} s JOIN {related.db_table} r ON r.{key} = s.{key}"
+        else:
+            sources = ', '.join(f"s.{qn(h)}" for h in headers)
+            from_sql = f"{staging} s"
+        cursor.execute(
+            f"INSERT INTO {table.db_table} ({targets}) SELECT {sources} FROM {from_sql} "
+            f"ON CONFLICT ({', '.join(qn(c) for c in table.conflict_columns)}) DO NOTHING"
+        )
+        return staged, cursor.rowcount
+
+
+def _import_orm(table, f, conn):
+    qn = conn.ops.quote_name
+    targets = ', '.join(qn(column.target.column) for column in table.columns)
+    sql = (
+        f"INSERT INTO {table.db_table} ({targets}) "
+        f"VALUES ({', '.join(['%s'] * len(table.columns))}) ON CONFLICT DO NOTHING"
+    )
+    parsers = [_parser(column.field) for column in table.columns]
+    # Per-value get_db_prep_save only where the driver needs an adapted value (dates, JSON)
+    preps = [
+        None if isinstance(column.target, PLAIN_FIELDS) else column.target.get_db_prep_save
+        for column in table.columns
+    ]
+    key_index = table.headers.index(table.natural_key) if table.foreign_key is not None else None
+    before = table.model.objects.count()
+    staged = 0
+    reader = csv.reader(f)
+    with conn.cursor() as cursor:
+        while True:
+            chunk = list(islice(reader, IMPORT_BATCH_SIZE))
+            if not chunk:
+                break
+            staged += len(chunk)
+            rows = [[parse(value) for parse, value in zip(parsers, raw)] for raw in chunk]
+            if key_index is not None:
+                keys = {row[key_index] for row in rows}
+                pks = dict(table.foreign_key.related_model.objects.filter(
+                    **{f'{table.natural_key}__in': keys}
+                ).values_list(table.natural_key, 'pk'))
+                rows = [row for row in rows if row[key_index] in pks]
+                for row in rows:
+                    row[key_index] = pks[row[key_index]]
+            if table.model is SourceTweet:
+                execution_index = table.headers.index('execution_id')
+                source_index = table.headers.index('source_url')
+                register_executions({row[execution_index]: row[source_index] for row in rows})
+            cursor.executemany(sql, [
+                [value if prep is None else prep(value, conn) for prep, value in zip(preps, row)]
+                for row in rows
+            ])
+    return staged, table.model.objects.count() - before
+
+
+def copy_import(name, f, use_copy=None, conn=connection):
+    """
+    Load a ``copy_export`` file into the ``name`` table, skipping rows whose natural key exists.
+
+    Returns (rows read, rows inserted). Raises ValueError when the header
+    does not match the table's columns.
+    """
+    table = COPY_TABLES[name]
+    conn = connections[conn.alias]  # The wrapper itself: the default proxy costs a lookup per value
+    use_copy = uses_copy(conn) if use_copy is None else use_copy
+    _read_header(table, f)
+    with transaction.atomic(using=conn.alias):
+        staged, inserted = _import_copy(table, f, conn) if use_copy else _import_orm(table, f, conn)
+        if inserted and table.model is SourceTweet:
+            transaction.on_commit(bump_ingestion_generation, using=conn.alias)
+        if inserted and table.model is GeneratedTweet:
+            # Rows written with SQL bypass GeneratedTweet.save(), which keeps the counters
+            reconcile_status_counts()
+    logger.info(f"Imported {inserted} of {staged} {name} rows ({'COPY' if use_copy else 'ORM'})")
+    return staged, inserted
@@ -0,0 +1,149 @@
+"""
+Compressed request bodies for the n8n endpoints.
+
+Scraper payloads are highly repetitive JSON, so n8n can send them with
+``Content-Encoding: gzip``, ``deflate`` or ``zstd``. ``decompress_request``
+inflates the body into a spooled temporary file before the view runs. It
+enforces ``N8N_MAX_DECOMPRESSED_BYTES`` so a small zip bomb cannot expand
+into gigabytes. The view then sees an ordinary uncompressed request, and
+streaming ingestion keys off the real decompressed size.
+"""
+import logging
+import tempfile
+import zlib
+from functools import wraps
+
+from django.conf import settings
+from django.http import JsonResponse
+
+try:
+    import zstandard
+except ImportError:  # zstd support is optional
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+READ_SIZE = 64 * 1024
+# Decompressed bodies stay in memory up to this size, then move to disk
+SPOOL_MAX_MEMORY = 1024 * 1024
+
+
+class UnsupportedEncoding(Exception):
+    pass
+
+
+class DecompressedBodyTooLarge(Exception):
+    pass
+
+
+class CorruptBody(Exception):
+    pass
+
+
+def supported_encodings():
+    """Content-Encoding values this install can decode"""
+    encodings = ['gzip', 'deflate']
+    if zstandard is not None:
+        encodings.append('zstd')
+    return encodings
+
+
+def _iter_zlib(stream, wbits):
+    decompressor = zlib.decompressobj(wbits)
+    try:
+        while True:
+            data = stream.read(READ_SIZE)
+            if not data:
+                break
+            # max_length bounds each step's output; the rest waits in unconsumed_tail
+            while data:
+                yield decompressor.decompress(data, READ_SIZE)
+                data = decompressor.unconsumed_tail
+                if decompressor.eof:
+                    break
+        yield decompressor.flush()
+    except zlib.error as e:
+        raise CorruptBody(str(e))
+    if not decompressor.eof:
+        raise CorruptBody("Compressed body is truncated")
+
+
+def _iter_zstd(stream):
+    reader = zstandard.ZstdDecompressor().stream_reader(stream, read_size=READ_SIZE)
+    try:
+        while True:
+            data = reader.read(READ_SIZE)
+            if not data:
+                break
+            yield data
+    except zstandard.ZstdError as e:
+        raise CorruptBody(str(e))
+
+
+def decompress_stream(stream, encoding, max_bytes):
+    """Inflate ``stream`` into a spooled file, returns (file, size) positioned at 0"""
+    if encoding in ('gzip', 'x-gzip'):
+        chunks = _iter_zlib(stream, 16 + zlib.MAX_WBITS)
+    elif encoding == 'deflate':
+        # RFC 9110 "deflate" is the zlib format; +32 also accepts gzip headers
+        chunks = _iter_zlib(stream, 32 + zlib.MAX_WBITS)
+    elif encoding == 'zstd' and zstandard is not None:
+        chunks = _iter_zstd(stream)
+    else:
+        raise UnsupportedEncoding(encoding)
+
+    body = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    size = 0
+    try:
+        for chunk in chunks:
+            size += len(chunk)
+            if size > max_bytes:
+                raise DecompressedBodyTooLarge(f"Decompressed body exceeds {max_bytes} bytes")
+            body.write(chunk)
+    except Exception:
+        body.close()
+        raise
+    body.seek(0)
+    return body, size
+
+
+def decompress_request(view_func):
+    """View decorator: transparently decode Content-Encoding request bodies"""
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        encoding = request.META.get('HTTP_CONTENT_ENCODING', '').strip().lower()
+        if encoding in ('', 'identity'):
+            return view_func(request, *args, **kwargs)
+
+        try:
+            body, size = decompress_stream(request, encoding, settings.N8N_MAX_DECOMPRESSED_BYTES)
+        except UnsupportedEncoding:
+            supported = ', '.join(supported_encodings())
+            return JsonResponse({
+                "status": "error",
+                "message": f"Unsupported Content-Encoding '{encoding}', use one of {supported}",
+            }, status=415, headers={'Accept-Encoding': supported})
+        except DecompressedBodyTooLarge as e:
+            logger.warning(f"Rejected compressed request to {request.path}: {str(e)}")
+            return JsonResponse({"status": "error", "message": str(e)}, status=413)
+        except CorruptBody as e:
+            return JsonResponse(
+                {"status": "error", "message": f"Invalid {encoding} body: {str(e)}"}, status=400
+            )
+
+        compressed_size = request.META.get('CONTENT_LENGTH', '?')
+        logger.debug(
+            f"Decompressed {encoding} body for {request.path}: {compressed_size} -> {size} bytes"
+        )
+
+        # From here on the request looks exactly like an uncompressed one
+        request._stream = body
+        request._read_started = False
+        request.META['CONTENT_LENGTH'] = str(size)
+        del request.META['HTTP_CONTENT_ENCODING']
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            body.close()
+
+    return _wrapped_view
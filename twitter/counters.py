@@ -0,0 +1,90 @@
+"""
+Per-status tweet counters on CampaignBatch.
+
+The counters are moved with F-expressions whenever a GeneratedTweet is
+created, changes status or is deleted (see ``GeneratedTweet.save``), so the
+batch list and review header never aggregate. Writes that bypass the model,
+such as queryset ``update()``/``delete()`` or raw SQL, can make them drift.
+``reconcile_status_counts`` recomputes them from the tweets and repairs the
+batches that disagree.
+
+``campaign_status_stats`` is the live equivalent for one batch: every status
+bucket from a single conditional-aggregation query, for callers that need
+counts straight from the tweets table.
+"""
+import logging
+
+from django.db import transaction
+from django.db.models import Count, Q
+
+from .models import STATUS_COUNTER_FIELDS, CampaignBatch, GeneratedTweet
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FIELDS = list(STATUS_COUNTER_FIELDS.values())
+
+
+def status_count_aggregates():
+    """``Count(filter=...)`` per counter field; statuses compare case-insensitively"""
+    return {
+        field: Count('id', filter=Q(status__iexact=tweet_status))
+        for tweet_status, field in STATUS_COUNTER_FIELDS.items()
+    }
+
+
+def count_statuses(batch_pks=None):
+    """{batch pk: {counter field: count}} in one grouped query; batches with tweets by default"""
+    tweets = GeneratedTweet.objects.order_by()
+    if batch_pks is not None:
+        tweets = tweets.filter(campaign_batch__in=batch_pks)
+    rows = tweets.values('campaign_batch_id').annotate(**status_count_aggregates())
+    return {row.pop('campaign_batch_id'): row for row in rows}
+
+
+def campaign_status_stats(campaign_batch):
+    """
+    Live per-status counts of one batch in a single aggregate query.
+
+    Same keys as ``CampaignBatch.status_counts``: ``total_tweets`` plus one
+    entry per status (``draft``, ``approved``, ...).
+    """
+    counts = campaign_batch.tweets.order_by().aggregate(**status_count_aggregates())
+    stats = {'total_tweets': sum(counts.values())}
+    stats.update({field.removesuffix('_count'): counts[field] for field in COUNTER_FIELDS})
+    return stats
+
+
+def reconcile_status_counts(batch_ids=None, dry_run=False):
+    """
+    Recompute the counters of every batch (or of ``batch_ids``) and fix drift.
+
+    Returns ``[(batch_id, stored, actual)]`` for the batches whose counters
+    were wrong, each side a {counter field: count} dict. With ``dry_run`` the
+    drift is reported but not written.
+    """
+    with transaction.atomic():
+        batches = CampaignBatch.objects.select_for_update().order_by('pk')
+        if batch_ids:
+            batches = batches.filter(batch_id__in=batch_ids)
+        batches = list(batches.only('batch_id', *COUNTER_FIELDS))
+
+        drifted = []
+        changed = []
+        actual_counts = count_statuses([batch.pk for batch in batches] if batch_ids else None)
+        for batch in batches:
+            actual = actual_counts.get(batch.pk, dict.fromkeys(COUNTER_FIELDS, 0))
+            stored = {field: getattr(batch, field) for field in COUNTER_FIELDS}
+            if stored != actual:
+                drifted.append((batch.batch_id, stored, actual))
+                for field, value in actual.items():
+                    setattr(batch, field, value)
+                changed.append(batch)
+
+        if changed and not dry_run:
+            CampaignBatch.objects.bulk_update(changed, COUNTER_FIELDS, batch_size=500)
+
+    for batch_id, stored, actual in drifted:
+        logger.warning(
+            f"Counter drift on campaign batch {batch_id}: stored {stored}, actual {actual}"
+        )
+    return drifted
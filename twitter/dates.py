@@ -0,0 +1,129 @@
+"""
+Timestamp parsing for scraped tweets.
+
+n8n sends two date shapes: Twitter's ``"Thu Aug 14 14:30:31 +0000 2025"``
+(simple payloads) and ISO 8601 such as ``"2025-08-14T16:07:32.837Z"``
+(detailed payloads). Both get a fast path built on a precompiled pattern.
+Whichever fast parser succeeded last is tried first, so a batch in one
+format never pays for the other. ``dateutil`` is kept as a last resort for
+anything else, and unparseable values fall back to now(), as before.
+
+``parse_tweet_dates`` parses a whole column at once. It parses each
+distinct value only once and takes a single now() for the failures.
+"""
+import re
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from functools import lru_cache
+
+from dateutil import parser as date_parser
+from django.utils import timezone
+
+MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12,
+}
+
+# "Thu Aug 14 14:30:31 +0000 2025" - Twitter's created_at
+TWITTER_DATE_RE = re.compile(
+    r'(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun) (' + '|'.join(MONTHS) + r') (\d{1,2}) '
+    r'(\d{2}):(\d{2}):(\d{2}) ([+-]\d{4}) (\d{4})$'
+)
+# "2025-08-14T16:07:32.837Z", "2025-08-14 16:07:32+02:00", ...
+ISO_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}')
+
+
+@lru_cache(maxsize=64)
+def _utc_offset(offset):
+    """tzinfo for a "+hhmm" offset, shared between all dates using it"""
+    minutes = int(offset[1:3]) * 60 + int(offset[3:5])
+    if minutes == 0:
+        return dt_timezone.utc
+    return dt_timezone(timedelta(minutes=-minutes if offset[0] == '-' else minutes))
+
+
+def parse_twitter_date(value):
+    """Parse Twitter's created_at format, or return None"""
+    match = TWITTER_DATE_RE.match(value)
+    if match is None:
+        return None
+    month, day, hour, minute, second, offset, year = match.groups()
+    try:
+        return datetime(
+            int(year), MONTHS[month], int(day), int(hour), int(minute), int(second),
+            tzinfo=_utc_offset(offset),
+        )
+    except ValueError:
+        return None
+
+
+def parse_iso_date(value):
+    """Parse ISO 8601 (with a trailing Z accepted on every Python version), or return None"""
+    if ISO_DATE_RE.match(value) is None:
+        return None
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+FAST_PARSERS = (parse_iso_date, parse_twitter_date)
+
+# Format cache: the fast parser that matched most recently goes first
+_preferred_parser = parse_iso_date
+
+
+def parse_date_value(value):
+    """Aware datetime for ``value``, or None when no parser understands it"""
+    global _preferred_parser
+    if not value or not isinstance(value, str):
+        return None
+    parsed = _preferred_parser(value)
+    if parsed is None:
+        for parser in FAST_PARSERS:
+            if parser is not _preferred_parser:
+                parsed = parser(value)
+                if parsed is not None:
+                    _preferred_parser = parser
+                    break
+        else:
+            # Last resort for formats without a fast path
+            try:
+                parsed = date_parser.parse(value)
+            except (ValueError, OverflowError):
+                return None
+    if parsed.tzinfo is None:
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def parse_tweet_date(date_str):
+    """Parse the date formats n8n sends, falling back to now()"""
+    parsed = parse_date_value(date_str)
+    return parsed if parsed is not None else timezone.now()
+
+
+def parse_tweet_dates(values):
+    """Batch form of ``parse_tweet_date``: parse a column of dates, aligned with ``values``"""
+    parsed = {}
+    now = None
+    results = []
+    for value in values:
+        try:
+            result = parsed[value]
+        except KeyError:
+            result = parse_date_value(value)
+            if result is None:
+                if now is None:
+                    now = timezone.now()
+                result = now
+            parsed[value] = result
+        except TypeError:
+            # Unhashable junk (lists, dicts) cannot be a date
+            if now is None:
+                now = timezone.now()
+            result = now
+        results.append(result)
+    return results
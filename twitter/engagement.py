@@ -0,0 +1,201 @@
+"""
+Engagement time series for scraped tweets and published posts.
+
+Counters on SourceTweet and core Post are overwritten in place.
+``EngagementSnapshot`` keeps their history as narrow append-only rows so
+velocity and growth curves can be computed:
+
+- ``record_tweet_snapshots`` is called from ingestion and appends one row per
+  scraped tweet with a batched ``bulk_create``. Snapshots also have a
+  ``post`` column for Post metrics; nothing writes it until Post counters
+  are synced from the X API.
+- ``downsample_snapshots`` folds raw rows older than
+  ``ENGAGEMENT_RAW_RETENTION_HOURS`` into hourly rows, and hourly rows older
+  than ``ENGAGEMENT_HOURLY_RETENTION_DAYS`` into daily rows. Each bucket
+  keeps its last row, counters and ``captured_at`` both, since the counters
+  are cumulative.
+- ``engagement_series`` returns series aligned on a common bucket grid from
+  one indexed range query per chunk of subjects, ready to plot
+"""
+import logging
+import math
+from datetime import timedelta
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import EngagementSnapshot
+
+logger = logging.getLogger(__name__)
+
+METRICS = ('likes', 'retweets', 'replies', 'quotes', 'views')
+SNAPSHOT_BATCH_SIZE = 1000
+# Keeps ``__in`` filters below SQLite's bound-parameter limit
+SUBJECT_CHUNK_SIZE = 900
+
+# Upper bound on series length so one request cannot allocate unbounded lists
+MAX_SERIES_BUCKETS = 10000
+
+INTERVALS = {
+    'hour': timedelta(hours=1),
+    'day': timedelta(days=1),
+}
+
+
+def record_tweet_snapshots(tweet_fields, captured_at=None):
+    """Append one raw snapshot per normalized tweet (dicts with tweet_id and the METRICS)"""
+    captured_at = captured_at or timezone.now()
+    snapshots = [
+        EngagementSnapshot(
+            source_tweet_id=fields['tweet_id'],
+            captured_at=captured_at,
+            **{metric: fields[metric] for metric in METRICS}
+        )
+        for fields in tweet_fields
+    ]
+    EngagementSnapshot.objects.bulk_create(snapshots, batch_size=SNAPSHOT_BATCH_SIZE)
+    return len(snapshots)
+
+
+def _truncate(moment, resolution):
+    """Start of the UTC hour / day bucket holding ``moment``"""
+    moment = moment.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+    if resolution == EngagementSnapshot.RESOLUTION_DAY:
+        moment = moment.replace(hour=0)
+    return moment
+
+
+def _fold(source_resolution, target_resolution, cutoff):
+    """Replace ``source_resolution`` rows before ``cutoff`` with one row per target bucket"""
+    # Only complete buckets are folded, so a bucket is never written twice
+    cutoff = _truncate(cutoff, target_resolution)
+    old_rows = EngagementSnapshot.objects.filter(
+        resolution=source_resolution, captured_at__lt=cutoff
+    )
+
+    folded = []
+    created = 0
+    current_key = None
+    current = None
+    # Ordered by subject then time: the last row of each bucket holds its closing counters,
+    # and the folded row keeps that row's captured_at so values and timestamps agree
+    rows = old_rows.order_by('source_tweet_id', 'post_id', 'captured_at').values_list(
+        'source_tweet_id', 'post_id', 'captured_at', *METRICS
+    )
+    with transaction.atomic():
+        for row in rows.iterator(chunk_size=SNAPSHOT_BATCH_SIZE):
+            source_tweet_id, post_id, captured_at, *values = row
+            key = (source_tweet_id, post_id, _truncate(captured_at, target_resolution))
+            if key != current_key:
+                if current is not None:
+                    folded.append(current)
+                current_key = key
+            current = EngagementSnapshot(
+                source_tweet_id=source_tweet_id,
+                post_id=post_id,
+                captured_at=captured_at,
+                resolution=target_resolution,
+                **dict(zip(METRICS, values))
+            )
+            if len(folded) >= SNAPSHOT_BATCH_SIZE:
+                EngagementSnapshot.objects.bulk_create(folded)
+                created += len(folded)
+                folded = []
+        if current is not None:
+            folded.append(current)
+        EngagementSnapshot.objects.bulk_create(folded, batch_size=SNAPSHOT_BATCH_SIZE)
+        created += len(folded)
+        deleted, _ = old_rows.delete()
+    return deleted, created
+
+
+def downsample_snapshots(now=None, raw_retention=None, hourly_retention=None):
+    """
+    Fold old raw snapshots into hourly rows and old hourly rows into daily rows.
+
+    Retentions default to the ENGAGEMENT_RAW_RETENTION_HOURS and
+    ENGAGEMENT_HOURLY_RETENTION_DAYS settings. Returns a dict of the rows
+    folded and created at each step.
+    """
+    now = now or timezone.now()
+    if raw_retention is None:
+        raw_retention = timedelta(hours=settings.ENGAGEMENT_RAW_RETENTION_HOURS)
+    if hourly_retention is None:
+        hourly_retention = timedelta(days=settings.ENGAGEMENT_HOURLY_RETENTION_DAYS)
+
+    raw_folded, hourly_created = _fold(
+        EngagementSnapshot.RESOLUTION_RAW, EngagementSnapshot.RESOLUTION_HOUR, now - raw_retention
+    )
+    hourly_folded, daily_created = _fold(
+        EngagementSnapshot.RESOLUTION_HOUR,
+        EngagementSnapshot.RESOLUTION_DAY,
+        now - hourly_retention,
+    )
+    logger.info(
+        f"Downsampled engagement: {raw_folded} raw -> {hourly_created} hourly, "
+        f"{hourly_folded} hourly -> {daily_created} daily"
+    )
+    return {
+        'raw_folded': raw_folded,
+        'hourly_created': hourly_created,
+        'hourly_folded': hourly_folded,
+        'daily_created': daily_created,
+    }
+
+
+def engagement_series(start, end, interval='hour', metric='likes', tweet_ids=(), post_ids=()):
+    """
+    Series of ``metric`` for each tweet / post, aligned on one bucket grid.
+
+    Returns ``{"buckets": [...], "tweets": {tweet_id: [...]}, "posts": {post_id: [...]}}``.
+    Every list has one value per bucket: the last snapshot in the bucket,
+    carried forward over buckets without one, and None before the first.
+    Raw, hourly and daily rows are read together, so downsampled history
+    lines up with recent data.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric '{metric}', use one of {', '.join(METRICS)}")
+    if interval not in INTERVALS:
+        raise ValueError(f"Unknown interval '{interval}', use one of {', '.join(INTERVALS)}")
+    if end <= start:
+        raise ValueError("end must be after start")
+
+    step = INTERVALS[interval]
+    bucket_count = math.ceil((end - start) / step)
+    if bucket_count > MAX_SERIES_BUCKETS:
+        raise ValueError(
+            f"Range spans {bucket_count} {interval} buckets, the limit is {MAX_SERIES_BUCKETS}"
+        )
+    tweet_ids = [str(tweet_id) for tweet_id in tweet_ids]
+    post_ids = [int(post_id) for post_id in post_ids]
+    series = {
+        'tweets': {tweet_id: [None] * bucket_count for tweet_id in tweet_ids},
+        'posts': {post_id: [None] * bucket_count for post_id in post_ids},
+    }
+
+    subjects = [('source_tweet_id', 'tweets', tweet_ids), ('post_id', 'posts', post_ids)]
+    for column, group, ids in subjects:
+        for offset in range(0, len(ids), SUBJECT_CHUNK_SIZE):
+            chunk = ids[offset:offset + SUBJECT_CHUNK_SIZE]
+            rows = EngagementSnapshot.objects.filter(
+                Q(**{f"{column}__in": chunk}), captured_at__gte=start, captured_at__lt=end
+            ).order_by('captured_at').values_list(column, 'captured_at', metric)
+            values = series[group]
+            for subject, captured_at, value in rows.iterator(chunk_size=SNAPSHOT_BATCH_SIZE):
+                values[subject][int((captured_at - start) / step)] = value
+
+    # Carry the last known value over empty buckets
+    for group in ('tweets', 'posts'):
+        for values in series[group].values():
+            last = None
+            for index, value in enumerate(values):
+                if value is None:
+                    values[index] = last
+                else:
+                    last = value
+
+    series['buckets'] = [start + step * index for index in range(bucket_count)]
+    return series
@@ -0,0 +1,266 @@
+"""
+Background export jobs for exports too large to stream within the proxy timeout.
+
+The request only stores an ``ExportJob``; the view queues ``run_export_job``
+once the transaction commits. Jobs need a Celery worker, so the view refuses
+them when tasks would run eagerly (no CELERY_BROKER_URL). The worker writes
+the same gzipped CSV/NDJSON stream as ``exports`` to EXPORT_JOBS_ROOT. It
+writes under a ``.part`` name, renames the file when complete, and records
+``rows_written`` after every chunk so the page can poll progress.
+
+Finished files are served by ``ranged_file_response``. It honours single
+``Range: bytes=`` requests (guarded by ``If-Range``), so an interrupted
+download resumes where it stopped instead of starting over.
+``purge_expired_exports`` removes jobs and files once ``expires_at`` has
+passed, plus stray files no job refers to.
+"""
+import logging
+import os
+import re
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+
+from .exports import (
+    EXPORT_CHUNK_SIZE,
+    EXPORT_COLUMNS,
+    EXPORT_FORMATS,
+    GENERATED_TWEET_EXPORT_COLUMNS,
+    gzip_chunks,
+)
+from .filters import TweetFilterSpec
+from .models import ExportJob, GeneratedTweet
+from .pagination import estimate_count
+
+logger = logging.getLogger(__name__)
+
+RANGE_BLOCK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def worker_available():
+    """
+    Whether queued jobs run on a Celery worker.
+
+    Without a broker Celery runs tasks eagerly, which would write the whole
+    export inside the request that was meant to avoid the proxy timeout.
+    """
+    return not settings.CELERY_TASK_ALWAYS_EAGER
+
+
+def export_ttl():
+    return timedelta(hours=settings.EXPORT_JOB_TTL_HOURS)
+
+
+def export_path(file_name):
+    return os.path.join(settings.EXPORT_JOBS_ROOT, file_name)
+
+
+def export_queryset(job):
+    """(queryset, columns) the job exports, ordered like the page or batch it came from"""
+    if job.kind == ExportJob.KIND_CAMPAIGN_BATCH:
+        tweets = GeneratedTweet.objects.all()
+        if job.params.get('batch_id'):
+            tweets = tweets.filter(campaign_batch__batch_id=job.params['batch_id'])
+        tweets = tweets.order_by('campaign_batch_id', 'created_at', 'pk')
+        return tweets, GENERATED_TWEET_EXPORT_COLUMNS
+    return TweetFilterSpec.from_params(job.params).ordered(), EXPORT_COLUMNS
+
+
+def download_filename(job):
+    """Name the browser saves the file under, e.g. scraped_tweets_20250814_143031.csv.gz"""
+    _, _, extension = EXPORT_FORMATS[job.export_format]
+    prefix = 'scraped_tweets'
+    if job.kind == ExportJob.KIND_CAMPAIGN_BATCH:
+        batch_id = job.params.get('batch_id')
+        prefix = f"campaign_{batch_id}" if batch_id else 'campaign_batches'
+    return f"{prefix}_{job.created_at.strftime('%Y%m%d_%H%M%S')}.{extension}.gz"
+
+
+def run_export_job(job_id):
+    """Write the job's file; returns False when another worker already claimed it"""
+    # Claim the job atomically so redelivered messages never write it twice
+    claimed = ExportJob.objects.filter(
+        job_id=job_id, status=ExportJob.STATUS_PENDING
+    ).update(status=ExportJob.STATUS_PROCESSING, started_at=timezone.now())
+    if not claimed:
+        logger.info(f"Export job {job_id} already claimed, skipping")
+        return False
+
+    job = ExportJob.objects.get(job_id=job_id)
+    writer, _, extension = EXPORT_FORMATS[job.export_format]
+    file_name = f"{job.job_id}.{extension}.gz"
+    path = export_path(file_name)
+    part_path = f"{path}.part"
+    try:
+        queryset, columns = export_queryset(job)
+        if job.kind == ExportJob.KIND_SOURCE_TWEETS:
+            total_rows, _ = estimate_count(queryset)
+        else:
+            total_rows = queryset.count()
+        ExportJob.objects.filter(pk=job.pk).update(total_rows=total_rows)
+
+        written = 0
+
+        def progress(rows):
+            nonlocal written
+            written += rows
+            ExportJob.objects.filter(pk=job.pk).update(rows_written=written)
+
+        os.makedirs(settings.EXPORT_JOBS_ROOT, exist_ok=True)
+        with open(part_path, 'wb') as f:
+            for data in gzip_chunks(writer(queryset, EXPORT_CHUNK_SIZE, columns, progress)):
+                f.write(data)
+        os.replace(part_path, path)
+    except Exception as e:
+        logger.exception(f"Export job {job_id} failed")
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        job.status = ExportJob.STATUS_FAILED
+        job.error = str(e)
+        job.finished_at = timezone.now()
+        job.expires_at = job.finished_at + export_ttl()
+        job.save(update_fields=['status', 'error', 'finished_at', 'expires_at'])
+        return True
+
+    job.status = ExportJob.STATUS_COMPLETED
+    job.rows_written = written
+    job.total_rows = written  # The estimate is replaced by the exact count
+    job.file_name = file_name
+    job.file_size = os.path.getsize(path)
+    job.finished_at = timezone.now()
+    job.expires_at = job.finished_at + export_ttl()
+    job.save(update_fields=[
+        'status', 'rows_written', 'total_rows', 'file_name', 'file_size', 'finished_at',
+        'expires_at',
+    ])
+    logger.info(
+        f"Export job {job_id} wrote {written} rows ({job.file_size} bytes) "
+        f"in {(job.finished_at - job.started_at).total_seconds():.2f}s"
+    )
+    return True
+
+
+def job_status(job, download_url=None):
+    """Pollable summary of a job; ``progress`` is a percentage once the row estimate is known"""
+    progress = None
+    if job.status == ExportJob.STATUS_COMPLETED:
+        progress = 100
+    elif job.total_rows:
+        progress = min(99, int(job.rows_written * 100 / job.total_rows))
+    return {
+        'job_id': str(job.job_id),
+        'kind': job.kind,
+        'format': job.export_format,
+        'status': job.status,
+        'rows_written': job.rows_written,
+        'total_rows': job.total_rows,
+        'progress': progress,
+        'file_size': job.file_size,
+        'error': job.error or None,
+        'created_at': job.created_at.isoformat(),
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+        'expires_at': job.expires_at.isoformat(),
+        'download_url': download_url if job.status == ExportJob.STATUS_COMPLETED else None,
+    }
+
+
+def parse_range(header, size):
+    """
+    Inclusive (start, end) of a single ``bytes=`` range within ``size``.
+
+    Returns None when the whole file should be sent (no header, several
+    ranges or another unit) and raises ValueError when the range is
+    unsatisfiable.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first == '':
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None  # Syntactically invalid, so ignored (RFC 9110, 14.1.1)
+    if start >= size:
+        raise ValueError(header)
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+def _read_range(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            data = f.read(min(RANGE_BLOCK_SIZE, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+
+
+def ranged_file_response(request, path, filename, etag, content_type='application/gzip'):
+    """Download response for ``path`` that answers ``Range`` requests with 206 Partial Content"""
+    size = os.path.getsize(path)
+    range_header = request.headers.get('Range')
+    if_range = request.headers.get('If-Range')
+    if if_range is not None and if_range != etag:
+        # The client's partial copy is of another file: send this one whole
+        range_header = None
+    try:
+        byte_range = parse_range(range_header, size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f"bytes */{size}"
+    else:
+        if byte_range is None:
+            response = FileResponse(open(path, 'rb'), content_type=content_type)
+            response['Content-Length'] = str(size)
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                _read_range(path, start, end - start + 1), content_type=content_type, status=206
+            )
+            response['Content-Range'] = f"bytes {start}-{end}/{size}"
+            response['Content-Length'] = str(end - start + 1)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    return response
+
+
+def purge_expired_exports(now=None):
+    """
+    Delete expired jobs with their files, and files no job refers to.
+
+    Stray files (a worker killed mid-write, a job deleted in the admin) are
+    removed once they are older than the TTL. Returns (jobs, files) deleted.
+    """
+    now = now or timezone.now()
+    expired = ExportJob.objects.filter(expires_at__lte=now)
+    files_removed = 0
+    for file_name in expired.exclude(file_name='').values_list('file_name', flat=True):
+        try:
+            os.remove(export_path(file_name))
+            files_removed += 1
+        except FileNotFoundError:
+            pass
+    jobs_deleted, _ = expired.delete()
+
+    root = settings.EXPORT_JOBS_ROOT
+    if os.path.isdir(root):
+        live = {str(job_id) for job_id in ExportJob.objects.values_list('job_id', flat=True)}
+        cutoff = time.time() - export_ttl().total_seconds()
+        for entry in os.scandir(root):
+            if not entry.is_file() or entry.name.split('.', 1)[0] in live:
+                continue
+            if entry.stat().st_mtime <= cutoff:
+                os.remove(entry.path)
+                files_removed += 1
+    return jobs_deleted, files_removed
@@ -0,0 +1,141 @@
+"""
+Streaming export of scraped tweets as CSV or newline-delimited JSON.
+
+Rows come from ``values_list`` through ``.iterator(chunk_size=...)``, so no
+model instances are built and no result set is cached. On PostgreSQL this
+uses a server-side cursor, which fetches ``chunk_size`` rows at a time.
+SQLite fetches in the same batches from its own cursor. The CSV header is
+sent before the query runs, and rows follow in batches of ``EXPORT_CHUNK_SIZE``.
+Memory use therefore stays flat however many tweets are exported.
+
+With ``compress``, the stream is gzipped on the fly. Each chunk is compressed
+as it is produced, and the download is a ``.gz`` file.
+
+Behind a transaction-pooling PgBouncer, set ``DISABLE_SERVER_SIDE_CURSORS``
+on the database. Django then falls back to client-side fetching in batches.
+"""
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+EXPORT_CHUNK_SIZE = 2000
+
+# (CSV header, SourceTweet field)
+EXPORT_COLUMNS = (
+    ('Tweet ID', 'tweet_id'),
+    ('Content', 'content'),
+    ('URL', 'url'),
+    ('Likes', 'likes'),
+    ('Retweets', 'retweets'),
+    ('Replies', 'replies'),
+    ('Quotes', 'quotes'),
+    ('Views', 'views'),
+    ('Date', 'date'),
+    ('Execution ID', 'execution_id'),
+    ('Status', 'status'),
+)
+# (CSV header, GeneratedTweet field) for campaign batch exports
+GENERATED_TWEET_EXPORT_COLUMNS = (
+    ('Batch ID', 'campaign_batch__batch_id'),
+    ('Tweet ID', 'tweet_id'),
+    ('Type', 'type'),
+    ('Content', 'content'),
+    ('Character Count', 'character_count'),
+    ('Status', 'status'),
+    ('Ready For Deployment', 'ready_for_deployment'),
+    ('Edited', 'is_edited'),
+    ('Created At', 'created_at'),
+    ('Published At', 'published_at'),
+    ('X Post ID', 'x_com_post_id'),
+)
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _iter_rows(queryset, chunk_size, columns, progress):
+    """Lists of ``columns`` values, ``chunk_size`` rows at most; ``progress`` gets each length"""
+    rows = queryset.values_list(*(field for _, field in columns))
+    batch = []
+    for row in rows.iterator(chunk_size=chunk_size):
+        batch.append(row)
+        if len(batch) == chunk_size:
+            if progress:
+                progress(len(batch))
+            yield batch
+            batch = []
+    if batch:
+        if progress:
+            progress(len(batch))
+        yield batch
+
+
+def iter_csv(queryset, chunk_size=EXPORT_CHUNK_SIZE, columns=EXPORT_COLUMNS, progress=None):
+    """Yield the CSV header, then ``chunk_size`` rows per string"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def drain():
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    writer.writerow([header for header, _ in columns])
+    yield drain()
+
+    for batch in _iter_rows(queryset, chunk_size, columns, progress):
+        for row in batch:
+            writer.writerow([
+                value.strftime(DATE_FORMAT) if isinstance(value, datetime) else value
+                for value in row
+            ])
+        yield drain()
+
+
+def iter_ndjson(queryset, chunk_size=EXPORT_CHUNK_SIZE, columns=EXPORT_COLUMNS, progress=None):
+    """Yield one JSON object per line, keyed by field name, ``chunk_size`` lines per string"""
+    # Related fields are keyed by their own name, e.g. campaign_batch__batch_id -> batch_id
+    fields = [field.rsplit('__', 1)[-1] for _, field in columns]
+    for batch in _iter_rows(queryset, chunk_size, columns, progress):
+        lines = []
+        for row in batch:
+            record = {
+                field: value.isoformat() if isinstance(value, datetime) else value
+                for field, value in zip(fields, row)
+            }
+            lines.append(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+        yield '\n'.join(lines) + '\n'
+
+
+def gzip_chunks(chunks):
+    """Gzip a stream of strings on the fly, yielding compressed bytes as they become available"""
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+# format -> (row writer, content type, file extension)
+EXPORT_FORMATS = {
+    'csv': (iter_csv, 'text/csv', 'csv'),
+    'ndjson': (iter_ndjson, 'application/x-ndjson', 'ndjson'),
+}
+
+
+def export_response(queryset, export_format='csv', compress=False, filename_prefix='scraped_tweets',
+                    chunk_size=EXPORT_CHUNK_SIZE):
+    """``StreamingHttpResponse`` of ``queryset`` in ``export_format``, gzipped with ``compress``"""
+    writer, content_type, extension = EXPORT_FORMATS[export_format]
+    chunks = writer(queryset, chunk_size)
+    filename = f"{filename_prefix}_{timezone.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+    if compress:
+        chunks, content_type, filename = gzip_chunks(chunks), 'application/gzip', f"{filename}.gz"
+    response = StreamingHttpResponse(chunks, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
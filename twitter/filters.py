@@ -0,0 +1,126 @@
+"""
+Scraped tweets filters shared by the browser and the export.
+
+``TweetFilterSpec.from_params`` reads the filter form's query string once.
+The browser pages through ``spec.apply()``, and the export streams the same
+queryset, so an export holds exactly the tweets the page shows. Every filter
+maps to an indexed lookup:
+
+- search_content: the full-text index, ranked by relevance
+- tweet_id_search: the trigram index
+- execution_id, date range, status, engagement thresholds: the composite
+  ``(column, id)`` indexes on SourceTweet
+
+Invalid values (a malformed date, a non-numeric threshold, an unknown sort)
+are dropped rather than rejected, as the filter form always did.
+"""
+from datetime import datetime, time
+from urllib.parse import urlencode
+
+from django.utils import timezone
+
+from .models import SourceTweet
+from .pagination import KEYSET_SORTS
+from .search import search_tweets
+from .trigram import substring_condition
+
+# Query parameter -> SourceTweet field for the ">= threshold" filters
+THRESHOLD_PARAMS = {
+    'min_likes': 'likes',
+    'min_retweets': 'retweets',
+    'min_views': 'views',
+}
+PROCESSED_VALUES = {'true': True, 'false': False}
+
+
+def _parse_day(value, at):
+    """Aware datetime for a 'YYYY-MM-DD' ``value`` at time ``at``, or None"""
+    try:
+        day = datetime.strptime(value, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return None
+    return timezone.make_aware(datetime.combine(day, at))
+
+
+class TweetFilterSpec:
+    """
+    The filters and sort of one scraped tweets query.
+
+    ``params`` holds only the filters that were applied, in their submitted
+    form. It is what the page lists as active filters and what keys the
+    result cache.
+    """
+
+    def __init__(self, params, sort_by):
+        self.params = params
+        self.sort_by = sort_by
+
+    @classmethod
+    def from_params(cls, data):
+        """Spec for a QueryDict (or dict) of filter form values"""
+        params = {}
+        for name in ('search_content', 'tweet_id_search', 'execution_id', 'status_filter'):
+            value = data.get(name, '').strip()
+            if value:
+                params[name] = value
+
+        date_from = data.get('date_from', '').strip()
+        if _parse_day(date_from, time.min):
+            params['date_from'] = date_from
+        date_to = data.get('date_to', '').strip()
+        if _parse_day(date_to, time.min):
+            params['date_to'] = date_to
+
+        for name in THRESHOLD_PARAMS:
+            value = data.get(name, '').strip()
+            if value.isdigit():
+                params[name] = value
+
+        processed = data.get('processed_filter', '').strip()
+        if processed in PROCESSED_VALUES:
+            params['processed_filter'] = processed
+
+        # Searches default to relevance, which needs the search annotation
+        searching = 'search_content' in params
+        sort_by = data.get('sort_by', '-search_rank' if searching else '-date')
+        if sort_by not in KEYSET_SORTS or (sort_by == '-search_rank' and not searching):
+            sort_by = '-date'
+        return cls(params, sort_by)
+
+    def apply(self, queryset=None):
+        """``queryset`` (all SourceTweets by default) narrowed by every filter, unordered"""
+        tweets = SourceTweet.objects.all() if queryset is None else queryset
+        params = self.params
+
+        if 'search_content' in params:
+            tweets = search_tweets(tweets, params['search_content'])
+        if 'tweet_id_search' in params:
+            # Partial IDs go through the trigram index
+            tweets = tweets.filter(
+                substring_condition(SourceTweet, 'tweet_id', params['tweet_id_search'])
+            )
+        if 'execution_id' in params:
+            # Exact IDs, as sent by the dropdown from the Execution registry
+            tweets = tweets.filter(execution_id=params['execution_id'])
+        if 'date_from' in params:
+            tweets = tweets.filter(date__gte=_parse_day(params['date_from'], time.min))
+        if 'date_to' in params:
+            tweets = tweets.filter(date__lte=_parse_day(params['date_to'], time(23, 59, 59)))
+        if 'status_filter' in params:
+            tweets = tweets.filter(status=params['status_filter'])
+        for name, field in THRESHOLD_PARAMS.items():
+            if name in params:
+                tweets = tweets.filter(**{f'{field}__gte': int(params[name])})
+        if 'processed_filter' in params:
+            tweets = tweets.filter(is_processed=PROCESSED_VALUES[params['processed_filter']])
+        return tweets
+
+    def ordered(self, queryset=None):
+        """``apply()`` in the spec's sort order, ties broken by id like the keyset pages"""
+        field, descending = KEYSET_SORTS[self.sort_by]
+        sign = '-' if descending else ''
+        return self.apply(queryset).order_by(f'{sign}{field}', f'{sign}pk')
+
+    def querystring(self, **extra):
+        """The filters and sort as a query string, plus ``extra`` parameters"""
+        return urlencode({**self.params, 'sort_by': self.sort_by, **extra})
@@ -0,0 +1,139 @@
+"""
+Idempotent replay of n8n webhook responses.
+
+n8n retries a webhook when it times out, even though the first attempt
+usually finished and stored everything. Without this module every retry
+re-ingests the whole execution, and since all its tweets now exist the
+retry answers "0 new tweets". The first successful response for an
+execution is stored as an ``IdempotencyRecord`` with a hash of the payload.
+Retries get that response back from a single indexed lookup.
+
+Requests are keyed on the ``Idempotency-Key`` header when present, otherwise on
+the payload's execution ids. A response is replayed only when the payload
+hash matches too. An execution sending further chunks under the same id is
+processed normally and its latest response replaces the stored one, while a
+header key reused with another payload is rejected (see ``payload_mismatch``).
+Records expire after ``N8N_IDEMPOTENCY_TTL`` seconds and expired rows are
+evicted whenever a new record is stored.
+"""
+import hashlib
+import json
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .ingestion import as_payload_list, ingestion_write_lock
+from .models import IdempotencyRecord
+
+logger = logging.getLogger(__name__)
+
+KEY_MAX_LENGTH = 255
+
+
+def _bounded(key):
+    """Keep keys within the column size, hashing the rare oversized ones"""
+    if len(key) <= KEY_MAX_LENGTH:
+        return key
+    return f"sha256:{hashlib.sha256(key.encode('utf-8')).hexdigest()}"
+
+
+def _execution_id(element):
+    if not isinstance(element, dict):
+        return None
+    if element.get('execution_id'):
+        return str(element['execution_id'])
+    if element.get('msg'):
+        return f"exec_{element['msg']}"
+    return None
+
+
+def idempotency_key(request, data):
+    """
+    Replay key for a request, or None when it cannot be identified safely.
+
+    Payloads without an explicit id in every element are never cached,
+    because defaults such as ``exec_unknown`` would collide across runs.
+    Campaign batches carry no execution id, so receive-tweets replays only
+    with the header.
+    """
+    if not settings.N8N_IDEMPOTENCY_TTL:
+        return None
+    header = request.META.get('HTTP_IDEMPOTENCY_KEY', '').strip()
+    if header:
+        return _bounded(f"header:{header}")
+    execution_ids = [_execution_id(element) for element in as_payload_list(data)]
+    if not execution_ids or None in execution_ids:
+        return None
+    return _bounded(f"execution:{'|'.join(execution_ids)}")
+
+
+def payload_hash(data):
+    """sha256 of the payload as canonical JSON, so key order and whitespace do not matter"""
+    canonical = json.dumps(
+        data, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def payload_mismatch(key):
+    """
+    Whether a stored record for ``key`` with another payload hash rejects the request.
+
+    An explicit ``Idempotency-Key`` names one request, so reusing it with a
+    different payload is a client error. Execution keys are derived, and
+    one execution may legitimately post several payloads.
+    """
+    return key.startswith('header:')
+
+
+def get_replay(endpoint, key):
+    """Unexpired stored response for ``key``, or None"""
+    return IdempotencyRecord.objects.filter(
+        endpoint=endpoint, key=key, expires_at__gt=timezone.now()
+    ).only('body_hash', 'response_data', 'response_status').first()
+
+
+def purge_expired_records():
+    """Evict expired records, returns the number deleted"""
+    deleted, _ = IdempotencyRecord.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
+
+
+def store_response(endpoint, key, body_hash, response_data, response_status):
+    """
+    Store a response for replay, returns the record the caller should answer with.
+
+    When two retries of the same payload race, the first stored response
+    wins and the caller should return that one, so every attempt sees the
+    same answer. A record for another payload is replaced, so the latest
+    call under the key is the one replayed.
+    """
+    expires_at = timezone.now() + timedelta(seconds=settings.N8N_IDEMPOTENCY_TTL)
+    with ingestion_write_lock():
+        purge_expired_records()
+        try:
+            with transaction.atomic():
+                return IdempotencyRecord.objects.create(
+                    endpoint=endpoint,
+                    key=key,
+                    body_hash=body_hash,
+                    response_data=response_data,
+                    response_status=response_status,
+                    expires_at=expires_at,
+                )
+        except IntegrityError:
+            record = IdempotencyRecord.objects.get(endpoint=endpoint, key=key)
+            if record.body_hash == body_hash:
+                logger.info(f"Concurrent replay record for {endpoint} {key}, returning it")
+                return record
+            record.body_hash = body_hash
+            record.response_data = response_data
+            record.response_status = response_status
+            record.expires_at = expires_at
+            record.save(update_fields=[
+                'body_hash', 'response_data', 'response_status', 'expires_at',
+            ])
+            return record
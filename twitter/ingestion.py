@@ -0,0 +1,684 @@
+"""
+Ingestion services behind the n8n endpoints.
+
+The whole payload is normalized up front (see ``normalizers``) and written
+with a single ``INSERT ... ON CONFLICT DO NOTHING RETURNING`` per chunk, so
+the database reports which tweet IDs were new and overlapping n8n executions
+cannot trip the unique constraint. Backends without RETURNING fall back to one chunked
+``tweet_id__in`` lookup followed by ``bulk_create``.
+
+``process_duplicate_check`` and ``process_receive_tweets`` hold the full
+request workflows so the synchronous views and the background job worker
+return identical response bodies.
+"""
+import logging
+import secrets
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import status
+
+from .counters import count_statuses
+from .engagement import record_tweet_snapshots
+from .models import CampaignBatch, Execution, GeneratedTweet, IngestionJob, SourceTweet
+from .normalizers import normalize_records
+from .result_cache import bump_ingestion_generation
+
+logger = logging.getLogger(__name__)
+
+# Keeps ``tweet_id__in`` lookups below SQLite's bound-parameter limit
+LOOKUP_CHUNK_SIZE = 900
+BULK_CREATE_BATCH_SIZE = 500
+
+# CampaignBatch fields refreshed when n8n re-sends an existing batch
+CAMPAIGN_HEADER_FIELDS = [
+    'analysis_summary', 'total_tweets', 'ready_for_deployment', 'brand_alignment_score',
+]
+
+# Counters refreshed on re-scraped tweets in refresh mode
+ENGAGEMENT_FIELDS = ('likes', 'retweets', 'replies', 'quotes', 'views')
+
+# SQLite only. It allows a single writer anyway; serializing in-process writers
+# avoids SQLITE_LOCKED in shared-cache mode (the in-memory test database), where
+# the busy timeout does not apply. PostgreSQL writers in other processes are
+# kept deadlock-free by writing rows in key order instead (see ``by_tweet_id``).
+_sqlite_write_lock = threading.RLock()
+
+
+def extract_scrape_payload(data):
+    """Return (tweets, execution_id, source_url, batch_metadata) for a scrape payload"""
+    # Handle nested data format (like SAMPLE_DETAILED_IN.JSON)
+    if 'data' in data and 'tweets' in data['data']:
+        # Detailed format: data.data.tweets
+        tweets = data['data']['tweets']
+        execution_id = data.get('execution_id', f"exec_{data.get('msg', 'unknown')}")
+        source_url = data.get('source_url', 'api_detailed')
+    else:
+        # Simple format: data.tweets
+        tweets = data.get('tweets', [])
+        execution_id = data.get('execution_id')
+        source_url = data.get('source_url', 'unknown')
+    return tweets, execution_id, source_url, data.get('batch_metadata', {})
+
+
+def chunked(items, size):
+    """Yield successive slices of at most ``size`` items"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def fetch_existing_tweet_ids(tweet_ids, chunk_size=LOOKUP_CHUNK_SIZE):
+    """Return the subset of ``tweet_ids`` already stored, one query per chunk"""
+    existing = set()
+    for chunk in chunked(list(tweet_ids), chunk_size):
+        existing.update(
+            SourceTweet.objects.filter(tweet_id__in=chunk).values_list('tweet_id', flat=True)
+        )
+    return existing
+
+
+def by_tweet_id(obj):
+    """
+    Sort key for rows written by ingestion.
+
+    Concurrent transactions that insert or update overlapping tweet_ids in
+    different orders can each wait on a row the other already holds, which
+    PostgreSQL aborts as a deadlock. Writing every batch in tweet_id order
+    makes them queue behind each other instead.
+    """
+    return obj.tweet_id
+
+
+@contextmanager
+def ingestion_write_lock():
+    """Serialize ingestion writes within the process on SQLite, no-op elsewhere"""
+    if connection.vendor == 'sqlite':
+        with _sqlite_write_lock:
+            yield
+    else:
+        yield
+
+
+def supports_insert_returning():
+    """True when the backend can report which rows an INSERT ... ON CONFLICT actually wrote"""
+    if connection.vendor == 'postgresql':
+        return True
+    # RETURNING needs SQLite 3.35+, which Django exposes as this feature flag
+    return connection.vendor == 'sqlite' and connection.features.can_return_rows_from_bulk_insert
+
+
+def insert_returning(model, objs, conflict_fields):
+    """
+    Insert ``objs`` with ``ON CONFLICT (conflict_fields) DO NOTHING RETURNING``.
+
+    Returns the ``conflict_fields`` values of the rows actually inserted, as
+    a set of tuples, so rows skipped as duplicates are never mistaken for new
+    ones. Needs ``supports_insert_returning()``. Callers pass ``objs`` in a
+    fixed key order, so overlapping concurrent writers never deadlock.
+    """
+    opts = model._meta
+    fields = [
+        field for field in opts.concrete_fields if not field.primary_key and not field.generated
+    ]
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(field.column) for field in fields)
+    row_placeholder = '(' + ', '.join(['%s'] * len(fields)) + ')'
+    key_columns = ', '.join(quote(opts.get_field(name).column) for name in conflict_fields)
+
+    batch_size = min(BULK_CREATE_BATCH_SIZE, connection.ops.bulk_batch_size(fields, objs))
+    inserted = set()
+    with connection.cursor() as cursor:
+        for batch in chunked(objs, batch_size):
+            params = []
+            for obj in batch:
+                for field in fields:
+                    params.append(field.get_db_prep_save(field.pre_save(obj, True), connection))
+            sql = (
+                f"INSERT INTO {quote(opts.db_table)} ({columns}) "
+                f"VALUES {', '.join([row_placeholder] * len(batch))} "
+                f"ON CONFLICT ({key_columns}) DO NOTHING RETURNING {key_columns}"
+            )
+            cursor.execute(sql, params)
+            inserted.update(tuple(row) for row in cursor.fetchall())
+    return inserted
+
+
+def insert_source_tweets_returning(objs):
+    """
+    Insert SourceTweet instances, skipping tweet_ids that already exist.
+
+    Uses ``INSERT ... ON CONFLICT (tweet_id) DO NOTHING RETURNING tweet_id``
+    (PostgreSQL, SQLite 3.35+) so the database itself reports which IDs were
+    new. Concurrent writers racing on the same IDs never raise IntegrityError,
+    and rows go in in tweet_id order so they never deadlock either.
+    The conflict target is explicit rather than SQLite's ``INSERT OR IGNORE``,
+    which would also swallow NOT NULL violations and report them as duplicates.
+    """
+    if not objs:
+        return set()
+    inserted = insert_returning(SourceTweet, sorted(objs, key=by_tweet_id), ['tweet_id'])
+    return {tweet_id for (tweet_id,) in inserted}
+
+
+def _refresh_engagement_from_values(latest_fields):
+    """PostgreSQL: one ``UPDATE ... FROM (VALUES ...)`` per chunk for changed rows, in key order"""
+    opts = SourceTweet._meta
+    quote = connection.ops.quote_name
+    id_column = quote(opts.get_field('tweet_id').column)
+    columns = [quote(opts.get_field(name).column) for name in ENGAGEMENT_FIELDS]
+    set_clause = ', '.join(f"{column} = v.{column}" for column in columns)
+    stored = ', '.join(f"t.{column}" for column in columns)
+    scraped = ', '.join(f"v.{column}" for column in columns)
+    # Explicit casts keep the VALUES column types right with server-side binding too
+    row_placeholder = '(%s' + ', %s::integer' * len(columns) + ')'
+
+    changed = set()
+    with connection.cursor() as cursor:
+        for chunk in chunked(sorted(latest_fields.items()), BULK_CREATE_BATCH_SIZE):
+            params = []
+            for tweet_id, fields in chunk:
+                params.append(tweet_id)
+                params.extend(fields[name] for name in ENGAGEMENT_FIELDS)
+            cursor.execute(
+                f"UPDATE {quote(opts.db_table)} AS t SET {set_clause} "
+                f"FROM (VALUES {', '.join([row_placeholder] * len(chunk))}) "
+                f"AS v({id_column}, {', '.join(columns)}) "
+                f"WHERE t.{id_column} = v.{id_column} AND ({stored}) IS DISTINCT FROM ({scraped}) "
+                f"RETURNING t.{id_column}",
+                params
+            )
+            changed.update(row[0] for row in cursor.fetchall())
+    return changed
+
+
+def refresh_engagement_counts(latest_fields):
+    """
+    Update stored counters from a re-scrape, skipping rows whose counters did not change.
+
+    ``latest_fields`` maps tweet_id to normalized fields. PostgreSQL does it
+    in one UPDATE ... FROM VALUES per chunk. Other backends read the
+    current counters in one chunked lookup and write the changed rows with
+    ``bulk_update``. Returns the tweet_ids that were updated.
+    """
+    if not latest_fields:
+        return set()
+    if connection.vendor == 'postgresql':
+        return _refresh_engagement_from_values(latest_fields)
+
+    changed = []
+    for chunk in chunked(sorted(latest_fields), LOOKUP_CHUNK_SIZE):
+        rows = SourceTweet.objects.filter(tweet_id__in=chunk).only('tweet_id', *ENGAGEMENT_FIELDS)
+        for row in rows:
+            fields = latest_fields[row.tweet_id]
+            if any(getattr(row, name) != fields[name] for name in ENGAGEMENT_FIELDS):
+                for name in ENGAGEMENT_FIELDS:
+                    setattr(row, name, fields[name])
+                changed.append(row)
+    changed.sort(key=by_tweet_id)
+    SourceTweet.objects.bulk_update(changed, ENGAGEMENT_FIELDS, batch_size=BULK_CREATE_BATCH_SIZE)
+    return {row.tweet_id for row in changed}
+
+
+def register_executions(sources):
+    """Create the missing Execution rows of {execution_id: source_url}, before their tweets go in"""
+    # In key order, like the tweets, so overlapping calls never deadlock
+    executions = [
+        Execution(execution_id=execution_id, source_url=sources[execution_id])
+        for execution_id in sorted(key for key in sources if key is not None)
+    ]
+    Execution.objects.bulk_create(
+        executions, batch_size=BULK_CREATE_BATCH_SIZE, ignore_conflicts=True
+    )
+
+
+def record_execution_calls(calls, duration_ms):
+    """
+    Add one n8n call to the totals of its executions.
+
+    ``calls`` holds (execution_id, received, new, duplicates, refreshed) per
+    scrape in the call; an execution sent twice in one call counts one call.
+    """
+    totals = {}
+    for execution_id, *counts in calls:
+        if execution_id is not None:
+            previous = totals.get(execution_id, [0, 0, 0, 0])
+            totals[execution_id] = [a + b for a, b in zip(previous, counts)]
+    now = timezone.now()
+    for execution_id, (received, new, duplicates, refreshed) in sorted(totals.items()):
+        Execution.objects.filter(execution_id=execution_id).update(
+            received_count=F('received_count') + received,
+            new_count=F('new_count') + new,
+            duplicate_count=F('duplicate_count') + duplicates,
+            refreshed_count=F('refreshed_count') + refreshed,
+            call_count=F('call_count') + 1,
+            duration_ms=F('duration_ms') + duration_ms,
+            last_call_at=now,
+        )
+
+
+def ingest_scrape_batches(batches, refresh_engagement=False, record_calls=True):
+    """
+    Store the non-duplicate tweets of several scrapes in one transaction.
+
+    ``batches`` is a list of (tweets, execution_id, source_url). All of them
+    share one duplicate lookup / one upsert; a tweet repeated across batches is
+    new for the first one and a duplicate for the rest, as if they had been
+    posted one after another. Returns one (new_tweets, duplicates_found,
+    refreshed) per batch where ``new_tweets`` holds the original records in
+    payload order, exactly as n8n sent them.
+
+    With ``refresh_engagement`` the counters of duplicates are brought up to
+    date from their latest occurrence in the payload; ``refreshed`` counts the
+    rows that actually changed (always 0 otherwise).
+
+    Every execution gets its Execution row; with ``record_calls`` the batches
+    are also added to its totals as one n8n call. Callers that ingest one
+    call in several pieces (streaming) record the call themselves.
+    """
+    started = time.perf_counter()
+    # Normalize once and drop repeats inside the payload, which count as duplicates
+    candidates = []
+    seen = set()
+    duplicates = [0] * len(batches)
+    # tweet_id -> (batch index, fields) of its last occurrence, for refresh mode and snapshots
+    latest = {}
+    repeated = set()
+    for index, (tweets, execution_id, source_url) in enumerate(batches):
+        for tweet_data, fields in zip(tweets, normalize_records(tweets)):
+            if fields is None:
+                continue
+            latest[fields['tweet_id']] = (index, fields)
+            if fields['tweet_id'] in seen:
+                duplicates[index] += 1
+                repeated.add(fields['tweet_id'])
+                continue
+            seen.add(fields['tweet_id'])
+            candidates.append((index, tweet_data, SourceTweet(
+                execution_id=execution_id,
+                source_url=source_url,
+                **fields
+            )))
+
+    refreshed = [0] * len(batches)
+    with ingestion_write_lock(), transaction.atomic():
+        register_executions({execution_id: source_url for _, execution_id, source_url in batches})
+        if supports_insert_returning():
+            new_ids = insert_source_tweets_returning([obj for _, _, obj in candidates])
+        else:
+            existing = fetch_existing_tweet_ids(seen)
+            new_ids = seen - existing
+            new_objs = [obj for _, _, obj in candidates if obj.tweet_id in new_ids]
+            SourceTweet.objects.bulk_create(
+                sorted(new_objs, key=by_tweet_id),
+                batch_size=BULK_CREATE_BATCH_SIZE,
+                ignore_conflicts=True
+            )
+
+        if refresh_engagement:
+            # Rows inserted just now already hold their latest counters unless repeated later on
+            stale = {
+                tweet_id: fields for tweet_id, (_, fields) in latest.items()
+                if tweet_id not in new_ids or tweet_id in repeated
+            }
+            for tweet_id in refresh_engagement_counts(stale):
+                refreshed[latest[tweet_id][0]] += 1
+
+        if settings.N8N_ENGAGEMENT_SNAPSHOTS:
+            # Every scrape is a data point, duplicates included
+            record_tweet_snapshots(fields for _, fields in latest.values())
+
+        new_tweets = [[] for _ in batches]
+        for index, tweet_data, obj in candidates:
+            if obj.tweet_id in new_ids:
+                new_tweets[index].append(tweet_data)
+            else:
+                duplicates[index] += 1
+                logger.debug(f"Duplicate found: {obj.tweet_id}")
+
+        if record_calls:
+            record_execution_calls(
+                [
+                    (
+                        execution_id, len(tweets), len(new_tweets[index]), duplicates[index],
+                        refreshed[index],
+                    )
+                    for index, (tweets, execution_id, _) in enumerate(batches)
+                ],
+                duration_ms=round((time.perf_counter() - started) * 1000),
+            )
+
+        if new_ids or any(refreshed):
+            # Cached browser pages and stats become unreachable once the tweets are visible
+            transaction.on_commit(bump_ingestion_generation)
+
+    return list(zip(new_tweets, duplicates, refreshed))
+
+
+def ingest_source_tweets(tweets, execution_id, source_url, refresh_engagement=False):
+    """Store the non-duplicate tweets of one scrape, returns (new_tweets, duplicates_found)"""
+    new_tweets, duplicates_found, _ = ingest_scrape_batches(
+        [(tweets, execution_id, source_url)], refresh_engagement=refresh_engagement
+    )[0]
+    return new_tweets, duplicates_found
+
+
+def build_duplicate_check_response(
+    execution_id, source_url, new_tweets, duplicates_found, processed_count,
+    saved_count=None, refreshed_count=None,
+):
+    """
+    Response body in the exact format n8n expects (matching out.json).
+
+    ``refreshed_count`` is only reported (as ``summary.engagement_refreshed``)
+    in refresh mode, so the default response stays byte-for-byte the same.
+    """
+    if saved_count is None:
+        saved_count = len(new_tweets)
+    if duplicates_found == 0:
+        message = f"✅ Success: All {saved_count} tweets are new and have been saved to database"
+    else:
+        message = f"✅ Success: {saved_count} new tweets saved, {duplicates_found} duplicates found"
+    response = {
+        "data": {
+            "duplicate_ids": [],  # Could be populated with actual duplicate IDs if needed
+            "execution_id": execution_id,
+            "new_tweets": new_tweets,
+            "source_url": source_url
+        },
+        "debug_info": {
+            "error_count": 0,
+            "processed_count": processed_count,
+            "saved_count": saved_count
+        },
+        "message": message,
+        "status": "success",
+        "summary": {
+            "duplicates_found": duplicates_found,
+            "execution_id_duplicates": 0,  # Could track execution ID duplicates separately
+            "new_tweets_found": saved_count,
+            "saved_to_database": saved_count,
+            "total_processed": processed_count,
+            "tweet_id_duplicates": duplicates_found
+        }
+    }
+    if refreshed_count is not None:
+        response["summary"]["engagement_refreshed"] = refreshed_count
+    return response
+
+
+def as_payload_list(data):
+    """n8n posts either one object or a JSON array of them; always return a list"""
+    return data if isinstance(data, list) else [data]
+
+
+def process_duplicate_check(data, refresh_engagement=None):
+    """
+    Run the check-duplicate-tweet workflow for a parsed payload.
+
+    A single object (or a one-element array, as n8n sends today) gets the
+    legacy response. A multi-element array is processed as one batch - one
+    transaction, one duplicate lookup - and answered with a per-execution
+    ``results`` list. ``refresh_engagement`` (default:
+    ``N8N_REFRESH_ENGAGEMENT``) also updates the counters of duplicates.
+    Shared by the synchronous endpoint and the background job worker;
+    returns (response_data, http_status).
+    """
+    if refresh_engagement is None:
+        refresh_engagement = settings.N8N_REFRESH_ENGAGEMENT
+    try:
+        payloads = as_payload_list(data)
+        extracted = [extract_scrape_payload(payload) for payload in payloads]
+
+        total_tweets = sum(len(tweets) for tweets, _, _, _ in extracted)
+        logger.info(
+            f"Checking duplicates for {len(extracted)} execution(s) "
+            f"{[execution_id for _, execution_id, _, _ in extracted]}, {total_tweets} tweets"
+        )
+
+        outcomes = ingest_scrape_batches([
+            (tweets, execution_id, source_url) for tweets, execution_id, source_url, _ in extracted
+        ], refresh_engagement=refresh_engagement)
+
+        results = [
+            build_duplicate_check_response(
+                execution_id, source_url, new_tweets, duplicates_found, len(tweets),
+                refreshed_count=refreshed if refresh_engagement else None
+            )
+            for (tweets, execution_id, source_url, _), (new_tweets, duplicates_found, refreshed)
+            in zip(extracted, outcomes)
+        ]
+
+        saved_count = sum(len(new_tweets) for new_tweets, _, _ in outcomes)
+        duplicates_found = sum(duplicates for _, duplicates, _ in outcomes)
+        refreshed_count = sum(refreshed for _, _, refreshed in outcomes)
+        logger.info(
+            f"Duplicate check complete: {saved_count} new, {duplicates_found} duplicates"
+            + (f", {refreshed_count} refreshed" if refresh_engagement else "")
+        )
+
+        if len(results) == 1:
+            return results[0], status.HTTP_200_OK
+
+        summary = {
+            "duplicates_found": duplicates_found,
+            "executions_processed": len(results),
+            "new_tweets_found": saved_count,
+            "saved_to_database": saved_count,
+            "total_processed": total_tweets
+        }
+        if refresh_engagement:
+            summary["engagement_refreshed"] = refreshed_count
+        return {
+            "message": (
+                f"✅ Success: {len(results)} executions processed, "
+                f"{saved_count} new tweets saved, {duplicates_found} duplicates found"
+            ),
+            "results": results,
+            "status": "success",
+            "summary": summary
+        }, status.HTTP_200_OK
+
+    except Exception as e:
+        logger.error(f"Error in check-duplicate-tweet: {str(e)}")
+        return {
+            "status": "error",
+            "message": f"Error processing tweets: {str(e)}",
+            "data": None
+        }, status.HTTP_500_INTERNAL_SERVER_ERROR
+
+
+def upsert_campaign_batches(payloads):
+    """
+    Create or update the CampaignBatch of every payload with one upsert.
+
+    New batches get every header field. Existing ones have their analysis
+    header (summary, counts, score) refreshed from the latest payload; their
+    title, description, review status and secure token are left alone.
+    Returns the batches in payload order; a batch_id repeated in the payload
+    maps to the same instance.
+    """
+    headers = {}
+    for payload in payloads:
+        analysis_summary = payload.get('analysis_summary', {})
+        # bulk_create skips save(), so the token is generated here
+        headers[payload.get('campaign_batch')] = CampaignBatch(
+            batch_id=payload.get('campaign_batch'),
+            secure_token=secrets.token_urlsafe(32),
+            analysis_summary=analysis_summary,
+            total_tweets=payload.get('tweet_count', 0),
+            ready_for_deployment=payload.get('ready_for_deployment', 0),
+            source_type=payload.get('source_type', 'multi_agent_automation'),
+            title=payload.get('title', 'Generated Content'),
+            description=payload.get('description', ''),
+            brand_alignment_score=analysis_summary.get('brand_alignment_score'),
+        )
+
+    batches = list(headers.values())
+    CampaignBatch.objects.bulk_create(
+        batches,
+        update_conflicts=True,
+        unique_fields=['batch_id'],
+        update_fields=CAMPAIGN_HEADER_FIELDS,
+    )
+    if any(batch.pk is None for batch in batches):
+        # Backends that cannot return ids from an upsert
+        ids = dict(CampaignBatch.objects.filter(batch_id__in=headers).values_list('batch_id', 'pk'))
+        for batch in batches:
+            batch.pk = ids[batch.batch_id]
+    return [headers[payload.get('campaign_batch')] for payload in payloads]
+
+
+def build_generated_tweet(campaign_batch, tweet_data):
+    """Unsaved GeneratedTweet for one tweet of a receive-tweets payload"""
+    return GeneratedTweet(
+        campaign_batch=campaign_batch,
+        tweet_id=tweet_data.get('id'),
+        type=tweet_data.get('type', 'generated'),
+        content=tweet_data.get('content'),
+        character_count=tweet_data.get('character_count', len(tweet_data.get('content', ''))),
+        engagement_hook=tweet_data.get('engagement_hook', ''),
+        coophive_elements=tweet_data.get('coophive_elements', []),
+        discord_voice_patterns=tweet_data.get('discord_voice_patterns', []),
+        theme_connection=tweet_data.get('theme_connection', ''),
+        ready_for_deployment=tweet_data.get('ready_for_deployment', True),
+        status=tweet_data.get('status', 'Brand Aligned'),
+        is_edited=tweet_data.get('is_edited', False)
+    )
+
+
+def by_batch_and_tweet_id(tweet):
+    """Sort key for generated tweets, in the (campaign_batch, tweet_id) order of their constraint"""
+    return tweet.campaign_batch_id, tweet.tweet_id
+
+
+def store_generated_tweets(tweets):
+    """
+    Insert new GeneratedTweets and move their batches' status counters.
+
+    Returns the tweets actually inserted. A concurrent retry of the same
+    batch may have stored some of them first; the (campaign_batch, tweet_id)
+    constraint skips those, and only the rows the database reports as
+    inserted are counted. bulk_create skips GeneratedTweet.save(), which
+    keeps the counters otherwise. Backends without RETURNING cannot tell
+    which rows were skipped, so the batches are recounted instead.
+    """
+    if not tweets:
+        return []
+    tweets = sorted(tweets, key=by_batch_and_tweet_id)
+    if not supports_insert_returning():
+        GeneratedTweet.objects.bulk_create(
+            tweets, batch_size=BULK_CREATE_BATCH_SIZE, ignore_conflicts=True
+        )
+        batch_pks = {tweet.campaign_batch_id for tweet in tweets}
+        for batch_pk, counts in sorted(count_statuses(batch_pks).items()):
+            CampaignBatch.objects.filter(pk=batch_pk).update(**counts)
+        return tweets
+
+    keys = insert_returning(GeneratedTweet, tweets, ['campaign_batch', 'tweet_id'])
+    inserted = [tweet for tweet in tweets if by_batch_and_tweet_id(tweet) in keys]
+    new_statuses = {}
+    for tweet in inserted:
+        batch_statuses = new_statuses.setdefault(tweet.campaign_batch_id, Counter())
+        batch_statuses[tweet.status] += 1
+    for batch_pk, statuses in sorted(new_statuses.items()):
+        CampaignBatch.adjust_status_counts(batch_pk, statuses)
+    return inserted
+
+
+def process_receive_tweets(data):
+    """
+    Store generated campaign batches from the n8n AI workflow.
+
+    Every element of an array payload is stored in one transaction: one
+    upsert of the batch headers, one lookup of already-stored tweet IDs and
+    one insert of the new tweets (see ``store_generated_tweets``). A single
+    object (or one-element array) gets the legacy response, a multi-element
+    array gets a per-batch ``results`` list. Shared by the synchronous endpoint and the
+    background job worker; returns (response_data, http_status).
+    """
+    payloads = []
+    try:
+        payloads = as_payload_list(data)
+
+        batch_ids = [p.get('campaign_batch') for p in payloads]
+        logger.info(f"Receiving generated tweets for batch(es) {batch_ids}")
+
+        with ingestion_write_lock(), transaction.atomic():
+            campaign_batches = upsert_campaign_batches(payloads)
+
+            # One lookup for the tweets already stored in any of these batches
+            existing = set(GeneratedTweet.objects.filter(
+                campaign_batch__in=set(campaign_batches)
+            ).values_list('campaign_batch_id', 'tweet_id'))
+
+            new_tweets = []
+            payload_of = {}
+            for index, (payload, campaign_batch) in enumerate(zip(payloads, campaign_batches)):
+                for tweet_data in payload.get('tweets', []):
+                    key = (campaign_batch.pk, tweet_data.get('id'))
+                    # Skip tweets already stored, or repeated earlier in the payload
+                    if key in existing:
+                        continue
+                    existing.add(key)
+                    payload_of[key] = index
+                    new_tweets.append(build_generated_tweet(campaign_batch, tweet_data))
+
+            inserted = Counter(
+                payload_of[(tweet.campaign_batch_id, tweet.tweet_id)]
+                for tweet in store_generated_tweets(new_tweets)
+            )
+            stored_counts = [inserted[index] for index in range(len(payloads))]
+
+        results = []
+        for campaign_batch, tweets_stored in zip(campaign_batches, stored_counts):
+            # Response in exact format expected by n8n (matching out.json)
+            results.append({
+                "campaign_batch": campaign_batch.batch_id,
+                "message": f"Received {tweets_stored} tweets (saved to database)",
+                "status": "success"
+            })
+            logger.info(
+                f"Successfully stored campaign batch {campaign_batch.batch_id}: "
+                f"{tweets_stored} tweets"
+            )
+
+        if len(results) == 1:
+            return results[0], status.HTTP_200_OK
+
+        return {
+            "message": f"Received {len(results)} campaign batches (saved to database)",
+            "results": results,
+            "status": "success"
+        }, status.HTTP_200_OK
+
+    except Exception as e:
+        logger.error(f"Error in receive-tweets: {str(e)}")
+        first = payloads[0] if payloads and isinstance(payloads[0], dict) else {}
+        return {
+            "campaign_batch": first.get('campaign_batch', 'unknown'),
+            "message": f"Error storing tweets: {str(e)}",
+            "status": "error"
+        }, status.HTTP_500_INTERNAL_SERVER_ERROR
+
+
+def purge_finished_ingestion_jobs(now=None):
+    """
+    Delete async ingestion jobs finished more than INGESTION_JOB_TTL_HOURS ago.
+
+    Pending and processing jobs are kept whatever their age. Returns the
+    number of jobs deleted.
+    """
+    now = now or timezone.now()
+    cutoff = now - timedelta(hours=settings.INGESTION_JOB_TTL_HOURS)
+    deleted, _ = IngestionJob.objects.filter(
+        status__in=[IngestionJob.STATUS_COMPLETED, IngestionJob.STATUS_FAILED],
+        finished_at__lte=cutoff,
+    ).delete()
+    return deleted
@@ -0,0 +1,65 @@
+"""
+Management command to dump or load tweets and campaign batches in bulk.
+
+Uses PostgreSQL COPY when available and the ORM streaming path otherwise
+(see twitter.bulk_copy). Files are CSV; a ``.gz`` path is gzipped and ``-``
+means stdout/stdin:
+
+    python manage.py bulk_copy export source_tweets tweets.csv.gz
+    python manage.py bulk_copy import campaign_batches batches.csv
+    python manage.py bulk_copy import generated_tweets generated.csv --orm
+
+Load campaign batches before their generated tweets.
+"""
+import gzip
+import sys
+import time
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+
+from twitter.bulk_copy import COPY_TABLES, copy_export, copy_import, uses_copy
+
+
+def open_file(path, mode):
+    """Text file for ``path``: gzip for .gz, stdin/stdout for '-'"""
+    if path == '-':
+        return nullcontext(sys.stdout if mode == 'w' else sys.stdin)
+    if path.endswith('.gz'):
+        return gzip.open(path, f'{mode}t', encoding='utf-8', newline='')
+    return open(path, mode, encoding='utf-8', newline='')
+
+
+class Command(BaseCommand):
+    help = 'Export or import SourceTweet, GeneratedTweet or CampaignBatch rows with COPY (ORM on SQLite)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=['export', 'import'])
+        parser.add_argument('table', choices=sorted(COPY_TABLES))
+        parser.add_argument('path', help="CSV file, gzipped when it ends in .gz, '-' for stdout/stdin")
+        parser.add_argument(
+            '--orm',
+            action='store_true',
+            help='Use the ORM path even on PostgreSQL',
+        )
+
+    def handle(self, *args, **options):
+        use_copy = uses_copy() and not options['orm']
+        start = time.perf_counter()
+        try:
+            if options['action'] == 'export':
+                with open_file(options['path'], 'w') as f:
+                    count = copy_export(options['table'], f, use_copy=use_copy)
+                summary = f"Exported {count} {options['table']} rows"
+            else:
+                with open_file(options['path'], 'r') as f:
+                    staged, inserted = copy_import(options['table'], f, use_copy=use_copy)
+                summary = f"Imported {inserted} of {staged} {options['table']} rows ({staged - inserted} skipped)"
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        # Keep stdout clean for the data when exporting to '-'
+        out = self.stderr if options['path'] == '-' else self.stdout
+        out.write(self.style.SUCCESS(
+            f"{summary} via {'COPY' if use_copy else 'ORM'} in {time.perf_counter() - start:.1f}s"
+        ))
@@ -0,0 +1,49 @@
+"""
+Management command to downsample engagement snapshots.
+
+Folds raw snapshots older than ENGAGEMENT_RAW_RETENTION_HOURS into hourly
+rows, and hourly rows older than ENGAGEMENT_HOURLY_RETENTION_DAYS into daily
+rows. Run it periodically, e.g. hourly from cron:
+
+    python manage.py downsample_engagement
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from twitter.engagement import downsample_snapshots
+
+
+class Command(BaseCommand):
+    help = 'Fold old engagement snapshots into hourly and daily buckets'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--raw-hours',
+            type=int,
+            help='Keep raw snapshots for this many hours (default: ENGAGEMENT_RAW_RETENTION_HOURS)',
+        )
+        parser.add_argument(
+            '--hourly-days',
+            type=int,
+            help=(
+                'Keep hourly snapshots for this many days '
+                '(default: ENGAGEMENT_HOURLY_RETENTION_DAYS)'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        raw_retention = hourly_retention = None
+        if options['raw_hours'] is not None:
+            raw_retention = timedelta(hours=options['raw_hours'])
+        if options['hourly_days'] is not None:
+            hourly_retention = timedelta(days=options['hourly_days'])
+
+        result = downsample_snapshots(
+            raw_retention=raw_retention, hourly_retention=hourly_retention
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Folded {result['raw_folded']} raw snapshots into "
+            f"{result['hourly_created']} hourly rows and {result['hourly_folded']} hourly "
+            f"snapshots into {result['daily_created']} daily rows"
+        ))
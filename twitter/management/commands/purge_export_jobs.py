@@ -0,0 +1,20 @@
+"""
+Management command to remove expired export jobs and their files.
+
+Deletes jobs whose ``expires_at`` has passed (EXPORT_JOB_TTL_HOURS after
+they finished) with their files in EXPORT_JOBS_ROOT, plus stray files older
+than the TTL that no job refers to. Run it periodically, e.g. hourly from cron:
+
+    python manage.py purge_export_jobs
+"""
+from django.core.management.base import BaseCommand
+
+from twitter.export_jobs import purge_expired_exports
+
+
+class Command(BaseCommand):
+    help = 'Delete expired export jobs and their files'
+
+    def handle(self, *args, **options):
+        jobs, files = purge_expired_exports()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {jobs} expired export jobs and {files} files"))
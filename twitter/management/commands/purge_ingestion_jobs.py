@@ -0,0 +1,20 @@
+"""
+Management command to remove finished async ingestion jobs.
+
+Deletes completed and failed jobs that finished more than
+INGESTION_JOB_TTL_HOURS ago; their payloads were already cleared when they
+finished. Run it periodically, e.g. hourly from cron:
+
+    python manage.py purge_ingestion_jobs
+"""
+from django.core.management.base import BaseCommand
+
+from twitter.ingestion import purge_finished_ingestion_jobs
+
+
+class Command(BaseCommand):
+    help = 'Delete finished ingestion jobs past INGESTION_JOB_TTL_HOURS'
+
+    def handle(self, *args, **options):
+        jobs = purge_finished_ingestion_jobs()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {jobs} finished ingestion jobs"))
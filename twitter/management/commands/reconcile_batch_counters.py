@@ -0,0 +1,42 @@
+"""
+Management command to repair the per-status tweet counters on CampaignBatch.
+
+The counters follow every GeneratedTweet save/delete, but bulk queryset
+updates, raw SQL or manual database edits bypass them. This recomputes them
+from the tweets and fixes the batches that drifted:
+
+    python manage.py reconcile_batch_counters [--batch batch_2025-08-12_15-07] [--dry-run]
+"""
+from django.core.management.base import BaseCommand
+
+from twitter.counters import reconcile_status_counts
+
+
+class Command(BaseCommand):
+    help = 'Recompute CampaignBatch per-status tweet counters and fix drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch',
+            action='append',
+            dest='batch_ids',
+            help='Only reconcile this campaign batch_id (repeatable)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report drifted batches without fixing them',
+        )
+
+    def handle(self, *args, **options):
+        drifted = reconcile_status_counts(batch_ids=options['batch_ids'], dry_run=options['dry_run'])
+
+        for batch_id, stored, actual in drifted:
+            changes = ', '.join(
+                f"{field} {stored[field]} -> {actual[field]}"
+                for field in actual if stored[field] != actual[field]
+            )
+            self.stdout.write(f"{batch_id}: {changes}")
+
+        verb = 'would be fixed' if options['dry_run'] else 'fixed'
+        self.stdout.write(self.style.SUCCESS(f"{len(drifted)} campaign batch(es) {verb}"))
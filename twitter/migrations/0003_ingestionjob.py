@@ -0,0 +1,34 @@
+# Generated by Django 5.2.5 on 2026-10-17 00:46
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('twitter', '0002_campaignbatch_sourcetweet_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngestionJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_id', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('kind', models.CharField(choices=[('check_duplicate', 'Check Duplicate Tweets'), ('receive_tweets', 'Receive Generated Tweets')], max_length=30)),
+                ('payload', models.JSONField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('response_data', models.JSONField(blank=True, null=True)),
+                ('response_status', models.IntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Ingestion Job',
+                'verbose_name_plural': 'Ingestion Jobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-17 00:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('twitter', '0003_ingestionjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('endpoint', models.CharField(choices=[('check_duplicate', 'Check Duplicate Tweets'), ('receive_tweets', 'Receive Generated Tweets')], max_length=30)),
+                ('key', models.CharField(max_length=255)),
+                ('response_data', models.JSONField()),
+                ('response_status', models.IntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Idempotency Record',
+                'verbose_name_plural': 'Idempotency Records',
+                'ordering': ['-created_at'],
+                'constraints': [models.UniqueConstraint(fields=('endpoint', 'key'), name='unique_idempotency_key_per_endpoint')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('twitter', '0004_idempotencyrecord'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingestionjob',
+            name='options',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
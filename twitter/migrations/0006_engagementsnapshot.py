@@ -0,0 +1,37 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('twitter', '0005_ingestionjob_options'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EngagementSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('captured_at', models.DateTimeField()),
+                ('resolution', models.PositiveSmallIntegerField(choices=[(0, 'Raw'), (1, 'Hourly'), (2, 'Daily')], default=0)),
+                ('likes', models.IntegerField(default=0)),
+                ('retweets', models.IntegerField(default=0)),
+                ('replies', models.IntegerField(default=0)),
+                ('quotes', models.IntegerField(default=0)),
+                ('views', models.IntegerField(default=0)),
+                ('post', models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='engagement_snapshots', to='core.post')),
+                ('source_tweet', models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='engagement_snapshots', to='twitter.sourcetweet', to_field='tweet_id')),
+            ],
+            options={
+                'verbose_name': 'Engagement Snapshot',
+                'verbose_name_plural': 'Engagement Snapshots',
+                'ordering': ['captured_at'],
+                'indexes': [models.Index(fields=['source_tweet', 'captured_at'], name='snapshot_tweet_time_idx'), models.Index(fields=['post', 'captured_at'], name='snapshot_post_time_idx'), models.Index(fields=['resolution', 'captured_at'], name='snapshot_resolution_time_idx')],
+                'constraints': [models.CheckConstraint(condition=models.Q(models.Q(('post__isnull', True), ('source_tweet__isnull', False)), models.Q(('post__isnull', False), ('source_tweet__isnull', True)), _connector='OR'), name='snapshot_has_one_subject')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:16
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def delete_duplicate_generated_tweets(apps, schema_editor):
+    """Keep the oldest row of each (campaign_batch, tweet_id) so the constraint can be added"""
+    GeneratedTweet = apps.get_model('twitter', 'GeneratedTweet')
+    duplicates = (
+        GeneratedTweet.objects.values('campaign_batch', 'tweet_id')
+        .annotate(rows=Count('id'), keep=Min('id'))
+        .filter(rows__gt=1)
+    )
+    for duplicate in duplicates:
+        GeneratedTweet.objects.filter(
+            campaign_batch=duplicate['campaign_batch'], tweet_id=duplicate['tweet_id']
+        ).exclude(id=duplicate['keep']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('twitter', '0006_engagementsnapshot'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_generated_tweets, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='generatedtweet',
+            constraint=models.UniqueConstraint(fields=('campaign_batch', 'tweet_id'), name='unique_generated_tweet_per_batch'),
+        ),
+    ]
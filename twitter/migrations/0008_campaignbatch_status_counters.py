@@ -0,0 +1,69 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:19
+
+from django.db import migrations, models
+from django.db.models import Count
+
+STATUS_COUNTER_FIELDS = {
+    'brand aligned': 'brand_aligned_count',
+    'draft': 'draft_count',
+    'approved': 'approved_count',
+    'posted': 'posted_count',
+    'rejected': 'rejected_count',
+    'deleted': 'deleted_count',
+}
+
+
+def populate_status_counters(apps, schema_editor):
+    """Fill the new counters from the tweets already stored"""
+    CampaignBatch = apps.get_model('twitter', 'CampaignBatch')
+    GeneratedTweet = apps.get_model('twitter', 'GeneratedTweet')
+    counts = {}
+    rows = GeneratedTweet.objects.order_by().values_list('campaign_batch_id', 'status').annotate(tweets=Count('id'))
+    for batch_pk, status, tweets in rows:
+        field = STATUS_COUNTER_FIELDS.get((status or '').lower())
+        if field:
+            batch_counts = counts.setdefault(batch_pk, {})
+            batch_counts[field] = batch_counts.get(field, 0) + tweets
+    for batch_pk, batch_counts in counts.items():
+        CampaignBatch.objects.filter(pk=batch_pk).update(**batch_counts)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('twitter', '0007_generatedtweet_unique_per_batch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='campaignbatch',
+            name='approved_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='campaignbatch',
+            name='brand_aligned_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='campaignbatch',
+            name='deleted_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='campaignbatch',
+            name='draft_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='campaignbatch',
+            name='posted_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='campaignbatch',
+            name='rejected_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(populate_status_counters, migrations.RunPython.noop),
+    ]
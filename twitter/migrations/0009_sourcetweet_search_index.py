@@ -0,0 +1,76 @@
+import logging
+
+from django.db import migrations
+
+logger = logging.getLogger(__name__)
+
+# Frozen copy of the twitter.search DDL this migration shipped with: later
+# changes to that module must not change what replaying 0009 creates
+POSTGRES_INDEX_SQL = [
+    "ALTER TABLE twitter_sourcetweet ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('english', coalesce(content, ''))) STORED",
+    "CREATE INDEX IF NOT EXISTS sourcetweet_search_gin ON twitter_sourcetweet USING GIN (search_vector)",
+]
+POSTGRES_DROP_SQL = [
+    "DROP INDEX IF EXISTS sourcetweet_search_gin",
+    "ALTER TABLE twitter_sourcetweet DROP COLUMN IF EXISTS search_vector",
+]
+SQLITE_INDEX_SQL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS twitter_sourcetweet_fts USING fts5("
+    "content, content='twitter_sourcetweet', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS twitter_sourcetweet_fts_ai AFTER INSERT ON twitter_sourcetweet BEGIN "
+    "INSERT INTO twitter_sourcetweet_fts(rowid, content) VALUES (new.id, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS twitter_sourcetweet_fts_ad AFTER DELETE ON twitter_sourcetweet BEGIN "
+    "INSERT INTO twitter_sourcetweet_fts(twitter_sourcetweet_fts, rowid, content) "
+    "VALUES ('delete', old.id, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS twitter_sourcetweet_fts_au AFTER UPDATE OF content ON twitter_sourcetweet BEGIN "
+    "INSERT INTO twitter_sourcetweet_fts(twitter_sourcetweet_fts, rowid, content) "
+    "VALUES ('delete', old.id, old.content); "
+    "INSERT INTO twitter_sourcetweet_fts(rowid, content) VALUES (new.id, new.content); END",
+    # Index the rows stored before the table existed
+    "INSERT INTO twitter_sourcetweet_fts(twitter_sourcetweet_fts) VALUES ('rebuild')",
+]
+SQLITE_DROP_SQL = [
+    "DROP TRIGGER IF EXISTS twitter_sourcetweet_fts_ai",
+    "DROP TRIGGER IF EXISTS twitter_sourcetweet_fts_ad",
+    "DROP TRIGGER IF EXISTS twitter_sourcetweet_fts_au",
+    "DROP TABLE IF EXISTS twitter_sourcetweet_fts",
+]
+
+
+def _execute(schema_editor, statements):
+    with schema_editor.connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def create_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        _execute(schema_editor, POSTGRES_INDEX_SQL)
+    elif vendor == 'sqlite':
+        try:
+            _execute(schema_editor, SQLITE_INDEX_SQL)
+        except Exception as e:
+            # Python builds without FTS5 keep working on the icontains fallback
+            logger.warning(f"SQLite FTS5 unavailable, tweet search falls back to icontains: {e}")
+
+
+def drop_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        _execute(schema_editor, POSTGRES_DROP_SQL)
+    elif vendor == 'sqlite':
+        _execute(schema_editor, SQLITE_DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('twitter', '0008_campaignbatch_status_counters'),
+    ]
+
+    operations = [
+        # tsvector column + GIN index on PostgreSQL, FTS5 shadow table on SQLite
+        migrations.RunPython(create_index, drop_index),
+    ]
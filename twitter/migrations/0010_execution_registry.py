@@ -0,0 +1,107 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:30
+
+import logging
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+logger = logging.getLogger(__name__)
+
+# Frozen copy of the SQLite search index DDL (see 0009), independent of twitter.search
+SQLITE_SEARCH_INDEX_SQL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS twitter_sourcetweet_fts USING fts5("
+    "content, content='twitter_sourcetweet', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS twitter_sourcetweet_fts_ai AFTER INSERT ON twitter_sourcetweet BEGIN "
+    "INSERT INTO twitter_sourcetweet_fts(rowid, content) VALUES (new.id, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS twitter_sourcetweet_fts_ad AFTER DELETE ON twitter_sourcetweet BEGIN "
+    "INSERT INTO twitter_sourcetweet_fts(twitter_sourcetweet_fts, rowid, content) "
+    "VALUES ('delete', old.id, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS twitter_sourcetweet_fts_au AFTER UPDATE OF content ON twitter_sourcetweet BEGIN "
+    "INSERT INTO twitter_sourcetweet_fts(twitter_sourcetweet_fts, rowid, content) "
+    "VALUES ('delete', old.id, old.content); "
+    "INSERT INTO twitter_sourcetweet_fts(rowid, content) VALUES (new.id, new.content); END",
+    "INSERT INTO twitter_sourcetweet_fts(twitter_sourcetweet_fts) VALUES ('rebuild')",
+]
+
+
+def register_executions(apps, schema_editor):
+    """One Execution per execution_id already on SourceTweet, so the foreign key can be added"""
+    Execution = apps.get_model('twitter', 'Execution')
+    SourceTweet = apps.get_model('twitter', 'SourceTweet')
+    rows = SourceTweet.objects.order_by().values('execution_id').annotate(
+        tweets=Count('id'), source_url=Max('source_url'), last_call_at=Max('processed_at')
+    )
+    Execution.objects.bulk_create([
+        Execution(
+            execution_id=row['execution_id'],
+            source_url=row['source_url'],
+            received_count=row['tweets'],
+            new_count=row['tweets'],
+            last_call_at=row['last_call_at'],
+        )
+        for row in rows
+    ], batch_size=500)
+
+
+def restore_search_index(apps, schema_editor):
+    """SQLite rebuilds twitter_sourcetweet to add the constraint, which drops the FTS triggers"""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        with schema_editor.connection.cursor() as cursor:
+            for sql in SQLITE_SEARCH_INDEX_SQL:
+                cursor.execute(sql)
+    except Exception as e:
+        logger.warning(f"SQLite FTS5 unavailable, tweet search falls back to icontains: {e}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('twitter', '0009_sourcetweet_search_index'),
+    ]
+
+    operations = [
+        # Reversing the AlterField below rebuilds the table too
+        migrations.RunPython(migrations.RunPython.noop, restore_search_index),
+        migrations.CreateModel(
+            name='Execution',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('execution_id', models.CharField(max_length=255, unique=True)),
+                ('source_url', models.CharField(max_length=255)),
+                ('received_count', models.IntegerField(default=0)),
+                ('new_count', models.IntegerField(default=0)),
+                ('duplicate_count', models.IntegerField(default=0)),
+                ('refreshed_count', models.IntegerField(default=0)),
+                ('call_count', models.IntegerField(default=0)),
+                ('duration_ms', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_call_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Execution',
+                'verbose_name_plural': 'Executions',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.RunPython(register_executions, migrations.RunPython.noop),
+        # Pin the column name first so the rename below leaves the column (and its data) alone
+        migrations.AlterField(
+            model_name='sourcetweet',
+            name='execution_id',
+            field=models.CharField(db_column='execution_id', max_length=255),
+        ),
+        migrations.RenameField(
+            model_name='sourcetweet',
+            old_name='execution_id',
+            new_name='execution',
+        ),
+        migrations.AlterField(
+            model_name='sourcetweet',
+            name='execution',
+            field=models.ForeignKey(db_column='execution_id', on_delete=django.db.models.deletion.PROTECT, related_name='tweets', to='twitter.execution', to_field='execution_id'),
+        ),
+        migrations.RunPython(restore_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:34
+
+import logging
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+logger = logging.getLogger(__name__)
+
+# Frozen copy of the SQLite search index DDL (see 0009), independent of twitter.search
+SQLITE_SEARCH_INDEX_SQL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS twitter_sourcetweet_fts USING fts5("
+    "content, content='twitter_sourcetweet', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS twitter_sourcetweet_fts_ai AFTER INSERT ON twitter_sourcetweet BEGIN "
+    "INSERT INTO twitter_sourcetweet_fts(rowid, content) VALUES (new.id, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS twitter_sourcetweet_fts_ad AFTER DELETE ON twitter_sourcetweet BEGIN "
+    "INSERT INTO twitter_sourcetweet_fts(twitter_sourcetweet_fts, rowid, content) "
+    "VALUES ('delete', old.id, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS twitter_sourcetweet_fts_au AFTER UPDATE OF content ON twitter_sourcetweet BEGIN "
+    "INSERT INTO twitter_sourcetweet_fts(twitter_sourcetweet_fts, rowid, content) "
+    "VALUES ('delete', old.id, old.content); "
+    "INSERT INTO twitter_sourcetweet_fts(rowid, content) VALUES (new.id, new.content); END",
+    "INSERT INTO twitter_sourcetweet_fts(twitter_sourcetweet_fts) VALUES ('rebuild')",
+]
+
+
+def restore_search_index(apps, schema_editor):
+    """SQLite rebuilds twitter_sourcetweet for the generated column, which drops the FTS triggers"""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        with schema_editor.connection.cursor() as cursor:
+            for sql in SQLITE_SEARCH_INDEX_SQL:
+                cursor.execute(sql)
+    except Exception as e:
+        logger.warning(f"SQLite FTS5 unavailable, tweet search falls back to icontains: {e}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('twitter', '0010_execution_registry'),
+    ]
+
+    operations = [
+        # Reversing the AddField below rebuilds the table too
+        migrations.RunPython(migrations.RunPython.noop, restore_search_index),
+        migrations.AddField(
+            model_name='sourcetweet',
+            name='total_engagement',
+            field=models.GeneratedField(db_persist=True, expression=models.F('likes') + models.F('retweets') + models.F('replies') + models.F('quotes'), output_field=models.IntegerField()),
+        ),
+        migrations.AlterField(
+            model_name='sourcetweet',
+            name='execution',
+            field=models.ForeignKey(db_column='execution_id', db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='tweets', to='twitter.execution', to_field='execution_id'),
+        ),
+        migrations.AddIndex(
+            model_name='sourcetweet',
+            index=models.Index(fields=['date', 'id'], name='sourcetweet_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sourcetweet',
+            index=models.Index(fields=['likes', 'id'], name='sourcetweet_likes_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sourcetweet',
+            index=models.Index(fields=['retweets', 'id'], name='sourcetweet_retweets_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sourcetweet',
+            index=models.Index(fields=['views', 'id'], name='sourcetweet_views_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sourcetweet',
+            index=models.Index(fields=['total_engagement', 'id'], name='sourcetweet_engagement_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sourcetweet',
+            index=models.Index(fields=['execution', 'date', 'id'], name='sourcetweet_exec_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sourcetweet',
+            index=models.Index(fields=['status', 'date', 'id'], name='sourcetweet_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sourcetweet',
+            index=models.Index(condition=models.Q(('is_processed', False)), fields=['date', 'id'], name='sourcetweet_unprocessed_idx'),
+        ),
+        migrations.RunPython(restore_search_index, migrations.RunPython.noop),
+    ]
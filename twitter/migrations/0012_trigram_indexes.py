@@ -0,0 +1,95 @@
+import logging
+
+from django.db import migrations
+
+logger = logging.getLogger(__name__)
+
+# Frozen copy of the twitter.trigram DDL this migration shipped with: later
+# changes to that module must not change what replaying 0012 creates
+POSTGRES_INDEX_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS twitter_sourcetweet_tweet_id_trgm ON twitter_sourcetweet "
+    "USING GIN ((UPPER(tweet_id::text)) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS twitter_execution_execution_id_trgm ON twitter_execution "
+    "USING GIN ((UPPER(execution_id::text)) gin_trgm_ops)",
+]
+POSTGRES_DROP_SQL = [
+    "DROP INDEX IF EXISTS twitter_sourcetweet_tweet_id_trgm",
+    "DROP INDEX IF EXISTS twitter_execution_execution_id_trgm",
+]
+SQLITE_INDEX_SQL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS twitter_sourcetweet_tweet_id_trgm USING fts5("
+    "tweet_id, content='twitter_sourcetweet', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS twitter_sourcetweet_tweet_id_trgm_ai AFTER INSERT ON twitter_sourcetweet BEGIN "
+    "INSERT INTO twitter_sourcetweet_tweet_id_trgm(rowid, tweet_id) VALUES (new.id, new.tweet_id); END",
+    "CREATE TRIGGER IF NOT EXISTS twitter_sourcetweet_tweet_id_trgm_ad AFTER DELETE ON twitter_sourcetweet BEGIN "
+    "INSERT INTO twitter_sourcetweet_tweet_id_trgm(twitter_sourcetweet_tweet_id_trgm, rowid, tweet_id) "
+    "VALUES ('delete', old.id, old.tweet_id); END",
+    "CREATE TRIGGER IF NOT EXISTS twitter_sourcetweet_tweet_id_trgm_au "
+    "AFTER UPDATE OF tweet_id ON twitter_sourcetweet BEGIN "
+    "INSERT INTO twitter_sourcetweet_tweet_id_trgm(twitter_sourcetweet_tweet_id_trgm, rowid, tweet_id) "
+    "VALUES ('delete', old.id, old.tweet_id); "
+    "INSERT INTO twitter_sourcetweet_tweet_id_trgm(rowid, tweet_id) VALUES (new.id, new.tweet_id); END",
+    "INSERT INTO twitter_sourcetweet_tweet_id_trgm(twitter_sourcetweet_tweet_id_trgm) VALUES ('rebuild')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS twitter_execution_execution_id_trgm USING fts5("
+    "execution_id, content='twitter_execution', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS twitter_execution_execution_id_trgm_ai AFTER INSERT ON twitter_execution BEGIN "
+    "INSERT INTO twitter_execution_execution_id_trgm(rowid, execution_id) VALUES (new.id, new.execution_id); END",
+    "CREATE TRIGGER IF NOT EXISTS twitter_execution_execution_id_trgm_ad AFTER DELETE ON twitter_execution BEGIN "
+    "INSERT INTO twitter_execution_execution_id_trgm(twitter_execution_execution_id_trgm, rowid, execution_id) "
+    "VALUES ('delete', old.id, old.execution_id); END",
+    "CREATE TRIGGER IF NOT EXISTS twitter_execution_execution_id_trgm_au "
+    "AFTER UPDATE OF execution_id ON twitter_execution BEGIN "
+    "INSERT INTO twitter_execution_execution_id_trgm(twitter_execution_execution_id_trgm, rowid, execution_id) "
+    "VALUES ('delete', old.id, old.execution_id); "
+    "INSERT INTO twitter_execution_execution_id_trgm(rowid, execution_id) VALUES (new.id, new.execution_id); END",
+    "INSERT INTO twitter_execution_execution_id_trgm(twitter_execution_execution_id_trgm) VALUES ('rebuild')",
+]
+SQLITE_DROP_SQL = [
+    "DROP TRIGGER IF EXISTS twitter_sourcetweet_tweet_id_trgm_ai",
+    "DROP TRIGGER IF EXISTS twitter_sourcetweet_tweet_id_trgm_ad",
+    "DROP TRIGGER IF EXISTS twitter_sourcetweet_tweet_id_trgm_au",
+    "DROP TABLE IF EXISTS twitter_sourcetweet_tweet_id_trgm",
+    "DROP TRIGGER IF EXISTS twitter_execution_execution_id_trgm_ai",
+    "DROP TRIGGER IF EXISTS twitter_execution_execution_id_trgm_ad",
+    "DROP TRIGGER IF EXISTS twitter_execution_execution_id_trgm_au",
+    "DROP TABLE IF EXISTS twitter_execution_execution_id_trgm",
+]
+
+
+def _execute(schema_editor, statements):
+    with schema_editor.connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def create_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        _execute(schema_editor, POSTGRES_INDEX_SQL)
+    elif vendor == 'sqlite':
+        try:
+            _execute(schema_editor, SQLITE_INDEX_SQL)
+        except Exception as e:
+            # SQLite before 3.34 has no trigram tokenizer; lookups stay on icontains
+            logger.warning(f"SQLite trigram tokenizer unavailable, ID lookups fall back to icontains: {e}")
+
+
+def drop_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        _execute(schema_editor, POSTGRES_DROP_SQL)
+    elif vendor == 'sqlite':
+        _execute(schema_editor, SQLITE_DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('twitter', '0011_sourcetweet_engagement_indexes'),
+    ]
+
+    operations = [
+        # pg_trgm GIN indexes on PostgreSQL, FTS5 trigram tables on SQLite
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
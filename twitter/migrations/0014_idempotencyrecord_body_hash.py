@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-17 02:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('twitter', '0013_export_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='idempotencyrecord',
+            name='body_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-17 02:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('twitter', '0014_idempotencyrecord_body_hash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ingestionjob',
+            name='payload',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -1,8 +1,36 @@
-from django.db import models
+from django.contrib.auth.models import User
+from django.db import models, transaction
 from django.utils import timezone
 from datetime import timedelta
 from core.models import Post
 import secrets
+import uuid
+
+class Execution(models.Model):
+    """
+    One n8n scrape execution and the totals of the calls that delivered it.
+
+    Written by the duplicate-check ingestion, so execution dropdowns and
+    per-execution stats read this table instead of scanning SourceTweet.
+    """
+    execution_id = models.CharField(max_length=255, unique=True)
+    source_url = models.CharField(max_length=255)
+    received_count = models.IntegerField(default=0)  # Tweets in the payloads, duplicates included
+    new_count = models.IntegerField(default=0)
+    duplicate_count = models.IntegerField(default=0)
+    refreshed_count = models.IntegerField(default=0)  # Duplicates whose engagement counters changed
+    call_count = models.IntegerField(default=0)  # n8n calls that carried this execution
+    duration_ms = models.IntegerField(default=0)  # Ingestion time summed over those calls
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_call_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Execution'
+        verbose_name_plural = 'Executions'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.execution_id} ({self.new_count} new / {self.received_count} received)"
 
 class SourceTweet(models.Model):
     """Source tweets from monitored accounts - for duplicate checking"""
@@ -14,10 +42,20 @@ class SourceTweet(models.Model):
     replies = models.IntegerField(default=0)
     quotes = models.IntegerField(default=0)
     views = models.IntegerField(default=0)
+    # Stored by the database so the engagement sort can use an index
+    total_engagement = models.GeneratedField(
+        expression=models.F('likes') + models.F('retweets') + models.F('replies') + models.F('quotes'),
+        output_field=models.IntegerField(),
+        db_persist=True,
+    )
     date = models.DateTimeField()
     status = models.CharField(max_length=50, default="success")
     tweet_url = models.URLField()  # Full twitter.com URL
-    execution_id = models.CharField(max_length=255)
+    # Keyed on the n8n execution_id, which stays the column value, so ingestion needs no pk lookups
+    execution = models.ForeignKey(
+        Execution, to_field='execution_id', db_column='execution_id', on_delete=models.PROTECT,
+        related_name='tweets', db_index=False  # Covered by sourcetweet_exec_date_idx
+    )
     source_url = models.CharField(max_length=255)
     processed_at = models.DateTimeField(auto_now_add=True)
     is_processed = models.BooleanField(default=False)  # Used for AI generation
@@ -26,10 +64,44 @@ class SourceTweet(models.Model):
         verbose_name = 'Source Tweet'
         verbose_name_plural = 'Source Tweets'
         ordering = ['-date']
+        # One (column, id) index per keyset sort of the scraped tweets browser; the
+        # trailing id is the tie-break, so a page is a single index range scan.
+        # Ascending indexes serve the descending sorts by scanning backwards.
+        indexes = [
+            models.Index(fields=['date', 'id'], name='sourcetweet_date_idx'),
+            models.Index(fields=['likes', 'id'], name='sourcetweet_likes_idx'),
+            models.Index(fields=['retweets', 'id'], name='sourcetweet_retweets_idx'),
+            models.Index(fields=['views', 'id'], name='sourcetweet_views_idx'),
+            models.Index(fields=['total_engagement', 'id'], name='sourcetweet_engagement_idx'),
+            # Execution and status filters with the default date sort
+            models.Index(fields=['execution', 'date', 'id'], name='sourcetweet_exec_date_idx'),
+            models.Index(fields=['status', 'date', 'id'], name='sourcetweet_status_date_idx'),
+            # The generation queue only ever reads unprocessed tweets
+            models.Index(
+                fields=['date', 'id'], condition=models.Q(is_processed=False), name='sourcetweet_unprocessed_idx'
+            ),
+        ]
 
     def __str__(self):
         return f"Tweet {self.tweet_id}: {self.content[:50]}..."
 
+# GeneratedTweet status -> CampaignBatch counter. Matched case-insensitively:
+# the review endpoints have always saved lowercase statuses.
+STATUS_COUNTER_FIELDS = {
+    'brand aligned': 'brand_aligned_count',
+    'draft': 'draft_count',
+    'approved': 'approved_count',
+    'posted': 'posted_count',
+    'rejected': 'rejected_count',
+    'deleted': 'deleted_count',
+}
+
+
+def status_counter_field(status):
+    """CampaignBatch counter column for a GeneratedTweet status, None for unknown statuses"""
+    return STATUS_COUNTER_FIELDS.get((status or '').lower())
+
+
 class CampaignBatch(models.Model):
     """Campaign batches from n8n AI generation workflow"""
     batch_id = models.CharField(max_length=100, unique=True)  # "batch_2025-08-12_15-07"
@@ -44,6 +116,15 @@ class CampaignBatch(models.Model):
     status = models.CharField(max_length=20, default="Draft")  # Draft, Reviewed, Published
     brand_alignment_score = models.FloatField(null=True, blank=True)
 
+    # Stored tweets per status, kept in step by GeneratedTweet.save()/delete() and
+    # ingestion; `manage.py reconcile_batch_counters` repairs drift
+    brand_aligned_count = models.IntegerField(default=0)
+    draft_count = models.IntegerField(default=0)
+    approved_count = models.IntegerField(default=0)
+    posted_count = models.IntegerField(default=0)
+    rejected_count = models.IntegerField(default=0)
+    deleted_count = models.IntegerField(default=0)
+
     class Meta:
         verbose_name = 'Campaign Batch'
         verbose_name_plural = 'Campaign Batches'
@@ -57,6 +138,42 @@ class CampaignBatch(models.Model):
             self.secure_token = secrets.token_urlsafe(32)
         super().save(*args, **kwargs)
 
+    @property
+    def stored_tweets(self):
+        """
+        Tweets actually stored for this batch (``total_tweets`` is the count n8n announced).
+
+        Summed from the per-status counters, so tweets whose status is not in
+        STATUS_COUNTER_FIELDS are left out; the review endpoints and
+        GeneratedTweet.STATUS_CHOICES only produce counted statuses.
+        """
+        return sum(getattr(self, field) for field in STATUS_COUNTER_FIELDS.values())
+
+    @property
+    def status_counts(self):
+        """Per-status counts for the review header, read from the counters"""
+        return {
+            'total_tweets': self.stored_tweets,
+            'brand_aligned': self.brand_aligned_count,
+            'draft': self.draft_count,
+            'approved': self.approved_count,
+            'posted': self.posted_count,
+            'rejected': self.rejected_count,
+            'deleted': self.deleted_count,
+        }
+
+    @classmethod
+    def adjust_status_counts(cls, batch_pk, deltas):
+        """Apply {status: delta} to one batch's counters in a single UPDATE with F-expressions"""
+        changes = {}
+        for tweet_status, delta in deltas.items():
+            field = status_counter_field(tweet_status)
+            if field:
+                changes[field] = changes.get(field, 0) + delta
+        changes = {field: models.F(field) + delta for field, delta in changes.items() if delta}
+        if changes:
+            cls.objects.filter(pk=batch_pk).update(**changes)
+
 class GeneratedTweet(models.Model):
     """Individual generated tweets within a campaign batch"""
     STATUS_CHOICES = [
@@ -88,10 +205,226 @@ class GeneratedTweet(models.Model):
         verbose_name = 'Generated Tweet'
         verbose_name_plural = 'Generated Tweets'
         ordering = ['created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['campaign_batch', 'tweet_id'], name='unique_generated_tweet_per_batch'),
+        ]
 
     def __str__(self):
         return f"{self.tweet_id}: {self.content[:50]}..."
 
+    def _lock_stored_status(self):
+        """
+        Status currently stored for this tweet, locking its row until the transaction ends.
+
+        Counters move from this rather than from the status the instance was
+        loaded with: two requests holding the same tweet would otherwise both
+        decrement the status it had before either of them saved. None when
+        the row is gone.
+        """
+        return GeneratedTweet.objects.select_for_update().filter(pk=self.pk).values_list(
+            'status', flat=True
+        ).first()
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        with transaction.atomic():
+            if self._state.adding:
+                super().save(*args, **kwargs)
+                CampaignBatch.adjust_status_counts(self.campaign_batch_id, {self.status: 1})
+            elif update_fields is not None and 'status' not in update_fields:
+                super().save(*args, **kwargs)
+            else:
+                stored = self._lock_stored_status()
+                super().save(*args, **kwargs)
+                if stored is None:
+                    # save() re-inserted a row deleted meanwhile
+                    CampaignBatch.adjust_status_counts(self.campaign_batch_id, {self.status: 1})
+                elif stored != self.status:
+                    CampaignBatch.adjust_status_counts(
+                        self.campaign_batch_id, {stored: -1, self.status: 1}
+                    )
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            stored = self._lock_stored_status()
+            result = super().delete(*args, **kwargs)
+            if stored is not None:
+                CampaignBatch.adjust_status_counts(self.campaign_batch_id, {stored: -1})
+        return result
+
+class IngestionJob(models.Model):
+    """
+    Raw n8n payloads queued for background processing (async webhook mode).
+
+    The payload is cleared once the job completes or fails; the response
+    stays pollable until ``manage.py purge_ingestion_jobs`` deletes the job.
+    """
+    KIND_CHECK_DUPLICATE = 'check_duplicate'
+    KIND_RECEIVE_TWEETS = 'receive_tweets'
+    KIND_CHOICES = [
+        (KIND_CHECK_DUPLICATE, 'Check Duplicate Tweets'),
+        (KIND_RECEIVE_TWEETS, 'Receive Generated Tweets'),
+    ]
+    STATUS_PENDING = 'pending'
+    STATUS_PROCESSING = 'processing'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_PROCESSING, 'Processing'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    job_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    payload = models.JSONField(null=True, blank=True)  # Request body as sent, cleared once processed
+    options = models.JSONField(default=dict, blank=True)  # Keyword arguments for the processor, e.g. refresh_engagement
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    response_data = models.JSONField(null=True, blank=True)  # Same body the sync endpoint returns
+    response_status = models.IntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Ingestion Job'
+        verbose_name_plural = 'Ingestion Jobs'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.kind} {self.job_id} ({self.status})"
+
+class IdempotencyRecord(models.Model):
+    """Stored n8n response replayed verbatim when a webhook is retried"""
+    endpoint = models.CharField(max_length=30, choices=IngestionJob.KIND_CHOICES)
+    key = models.CharField(max_length=255)  # "header:<Idempotency-Key>" or "execution:<execution_id>"
+    body_hash = models.CharField(max_length=64, blank=True)  # sha256 of the canonical JSON payload
+    response_data = models.JSONField()
+    response_status = models.IntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        verbose_name = 'Idempotency Record'
+        verbose_name_plural = 'Idempotency Records'
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['endpoint', 'key'], name='unique_idempotency_key_per_endpoint'),
+        ]
+
+    def __str__(self):
+        return f"{self.endpoint} {self.key}"
+
+class ExportJob(models.Model):
+    """
+    A gzipped export written to EXPORT_JOBS_ROOT by a background worker.
+
+    ``params`` are the scraped tweets filter form values (see
+    ``TweetFilterSpec``) or ``{'batch_id': ...}`` for a campaign batch. The
+    file and the row are removed by ``purge_export_jobs`` once
+    ``expires_at`` has passed.
+    """
+    KIND_SOURCE_TWEETS = 'source_tweets'
+    KIND_CAMPAIGN_BATCH = 'campaign_batch'
+    KIND_CHOICES = [
+        (KIND_SOURCE_TWEETS, 'Scraped Tweets'),
+        (KIND_CAMPAIGN_BATCH, 'Campaign Batch'),
+    ]
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('ndjson', 'NDJSON'),
+    ]
+    STATUS_PENDING = 'pending'
+    STATUS_PROCESSING = 'processing'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_PROCESSING, 'Processing'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    job_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    export_format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default='csv')
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    total_rows = models.IntegerField(null=True, blank=True)  # Estimate taken when the job starts
+    rows_written = models.IntegerField(default=0)
+    file_name = models.CharField(max_length=255, blank=True)  # Relative to EXPORT_JOBS_ROOT
+    file_size = models.BigIntegerField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        verbose_name = 'Export Job'
+        verbose_name_plural = 'Export Jobs'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.kind} export {self.job_id} ({self.status})"
+
+class EngagementSnapshot(models.Model):
+    """
+    Append-only engagement counters of a SourceTweet or core Post at one point in time.
+
+    Ingestion appends raw rows; ``downsample_engagement`` later folds old raw
+    rows into hourly and then daily rows holding the last value of each bucket.
+    """
+    RESOLUTION_RAW = 0
+    RESOLUTION_HOUR = 1
+    RESOLUTION_DAY = 2
+    RESOLUTION_CHOICES = [
+        (RESOLUTION_RAW, 'Raw'),
+        (RESOLUTION_HOUR, 'Hourly'),
+        (RESOLUTION_DAY, 'Daily'),
+    ]
+
+    # Keyed on tweet_id so ingestion can append without looking up primary keys
+    source_tweet = models.ForeignKey(
+        SourceTweet, to_field='tweet_id', null=True, blank=True, on_delete=models.CASCADE,
+        related_name='engagement_snapshots', db_index=False
+    )
+    post = models.ForeignKey(
+        Post, null=True, blank=True, on_delete=models.CASCADE, related_name='engagement_snapshots', db_index=False
+    )
+    captured_at = models.DateTimeField()  # Bucket start for hourly/daily rows
+    resolution = models.PositiveSmallIntegerField(choices=RESOLUTION_CHOICES, default=RESOLUTION_RAW)
+    likes = models.IntegerField(default=0)
+    retweets = models.IntegerField(default=0)
+    replies = models.IntegerField(default=0)
+    quotes = models.IntegerField(default=0)
+    views = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Engagement Snapshot'
+        verbose_name_plural = 'Engagement Snapshots'
+        ordering = ['captured_at']
+        indexes = [
+            models.Index(fields=['source_tweet', 'captured_at'], name='snapshot_tweet_time_idx'),
+            models.Index(fields=['post', 'captured_at'], name='snapshot_post_time_idx'),
+            models.Index(fields=['resolution', 'captured_at'], name='snapshot_resolution_time_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=(
+                    models.Q(source_tweet__isnull=False, post__isnull=True)
+                    | models.Q(source_tweet__isnull=True, post__isnull=False)
+                ),
+                name='snapshot_has_one_subject',
+            ),
+        ]
+
+    def __str__(self):
+        subject = f"tweet {self.source_tweet_id}" if self.source_tweet_id else f"post {self.post_id}"
+        return f"{subject} @ {self.captured_at:%Y-%m-%d %H:%M} ({self.get_resolution_display()})"
+
 class TwitterPost(Post):
     """Twitter (X.com) specific post model"""
     # Twitter-specific fields
@@ -0,0 +1,202 @@
+"""
+Scraper payload normalizers.
+
+Every scraper format n8n can send is described once as a ``TweetSchema``:
+how to recognise one of its records and which key feeds each SourceTweet
+field. Each schema resolves its field mapping once into a single
+extractor function. A batch is sniffed once, and every record then goes
+straight through that extractor, with no per-record format checks or key
+lookups against the mapping tables.
+
+Adding a scraper format means registering one more schema::
+
+    register_schema(TweetSchema(
+        name='apify',
+        id_key='tweetId',
+        text_fields={'content': 'fullText', 'url': 'url', 'tweet_url': 'url'},
+        count_fields={'likes': 'favorites', ...},
+        date_key='postedAt',
+    ))
+"""
+import logging
+
+from .dates import parse_tweet_date, parse_tweet_dates
+
+logger = logging.getLogger(__name__)
+
+COUNT_FIELDS = ('likes', 'retweets', 'replies', 'quotes', 'views')
+
+
+class TweetSchema:
+    """
+    One scraper record format.
+
+    ``id_key`` both identifies the format (a record belongs to the first
+    registered schema whose ``id_key`` it contains) and supplies tweet_id.
+    ``text_fields`` / ``count_fields`` map SourceTweet fields to record
+    keys. Counts default to 0 and are coerced with ``int()``; text defaults
+    to ''. Without a ``status_key`` every record is stored as 'success'.
+    ``extract`` leaves ``date`` as the raw value; the normalize_* functions
+    parse it.
+    """
+
+    def __init__(self, name, id_key, text_fields, count_fields, date_key, status_key=None):
+        missing = set(COUNT_FIELDS) - set(count_fields)
+        if missing:
+            raise ValueError(f"Schema '{name}' does not map count fields {sorted(missing)}")
+        self.name = name
+        self.id_key = id_key
+        self.text_fields = dict(text_fields)
+        self.count_fields = dict(count_fields)
+        self.date_key = date_key
+        self.status_key = status_key
+        self.extract = self._compile()
+
+    def matches(self, record):
+        return self.id_key in record
+
+    def _compile(self):
+        """
+        Build the record -> SourceTweet fields function for this schema.
+
+        The mapping is resolved once into (field, key) tuples bound to the
+        closure, so each record costs one ``get`` per field and no lookups
+        against the mapping dicts.
+        """
+        id_key = self.id_key
+        text_items = tuple(self.text_fields.items())
+        count_items = tuple(self.count_fields.items())
+        date_key = self.date_key
+        status_key = self.status_key
+
+        def extract(record):
+            get = record.get
+            tweet_id = get(id_key)
+            if not tweet_id:
+                return None
+            fields = {'tweet_id': str(tweet_id)}
+            for field, key in text_items:
+                fields[field] = get(key, '')
+            for field, key in count_items:
+                fields[field] = int(get(key, 0))
+            # Raw value; dates are parsed per column by normalize_records
+            fields['date'] = get(date_key, '')
+            fields['status'] = get(status_key, 'success') if status_key else 'success'
+            return fields
+
+        return extract
+
+    def __repr__(self):
+        return f"<TweetSchema {self.name}>"
+
+
+SCHEMA_REGISTRY = []
+
+
+def register_schema(schema):
+    """Add a schema to the registry; earlier registrations win when a record matches several"""
+    if any(existing.name == schema.name for existing in SCHEMA_REGISTRY):
+        raise ValueError(f"Schema '{schema.name}' is already registered")
+    SCHEMA_REGISTRY.append(schema)
+    return schema
+
+
+def get_schema(name):
+    for schema in SCHEMA_REGISTRY:
+        if schema.name == name:
+            return schema
+    raise KeyError(name)
+
+
+def detect_schema(record):
+    """First registered schema matching ``record``, or None"""
+    if not isinstance(record, dict):
+        return None
+    for schema in SCHEMA_REGISTRY:
+        if schema.matches(record):
+            return schema
+    return None
+
+
+# Simple format (SAMPLE_SIMPLE_IN.JSON) - checked first, as before
+register_schema(TweetSchema(
+    name='simple',
+    id_key='Tweet ID',
+    text_fields={'content': 'Content', 'url': 'URL', 'tweet_url': 'Tweet'},
+    count_fields={
+        'likes': 'Likes', 'retweets': 'Retweets', 'replies': 'Replies',
+        'quotes': 'Quotes', 'views': 'Views',
+    },
+    date_key='Date',
+    status_key='Status',
+))
+
+# Detailed format (SAMPLE_DETAILED_IN.JSON)
+register_schema(TweetSchema(
+    name='detailed',
+    id_key='id',
+    text_fields={'content': 'text', 'url': 'url', 'tweet_url': 'twitterUrl'},
+    count_fields={
+        'likes': 'likeCount', 'retweets': 'retweetCount', 'replies': 'replyCount',
+        'quotes': 'quoteCount', 'views': 'viewCount',
+    },
+    date_key='createdAt',
+))
+
+
+def _extract(record):
+    """SourceTweet fields with the raw date, detecting the schema for this record alone"""
+    schema = detect_schema(record)
+    if schema is None:
+        return None
+    return schema.extract(record)
+
+
+def normalize_tweet(tweet_data):
+    """Map a single record onto SourceTweet fields, or None when it has no usable ID"""
+    fields = _extract(tweet_data)
+    if fields is not None:
+        fields['date'] = parse_tweet_date(fields['date'])
+    return fields
+
+
+def normalize_records(records):
+    """
+    Normalize a batch, returning SourceTweet field dicts aligned with ``records``.
+
+    The schema is detected from the first record and reused for the rest.
+    A record that does not match it (a mixed batch) is detected on its own,
+    so mixed payloads still normalize exactly as they would one by one.
+    Records without a usable ID map to None. Dates are parsed as one column
+    with ``parse_tweet_dates``.
+    """
+    if not records:
+        return []
+    schema = None
+    for record in records:
+        schema = detect_schema(record)
+        if schema is not None:
+            break
+    if schema is None:
+        return [None] * len(records)
+
+    # A record also matching a higher-priority schema belongs to that one
+    earlier_keys = tuple(s.id_key for s in SCHEMA_REGISTRY[:SCHEMA_REGISTRY.index(schema)])
+    owns = _ownership_check(schema.id_key, earlier_keys)
+    extract = schema.extract
+    normalized = [extract(record) if owns(record) else _extract(record) for record in records]
+
+    present = [fields for fields in normalized if fields is not None]
+    for fields, date in zip(present, parse_tweet_dates([fields['date'] for fields in present])):
+        fields['date'] = date
+    return normalized
+
+
+def _ownership_check(id_key, earlier_keys):
+    """``record belongs to the schema keyed on id_key`` test"""
+    def owns(record):
+        return (
+            isinstance(record, dict) and id_key in record and record.keys().isdisjoint(earlier_keys)
+        )
+
+    return owns
@@ -0,0 +1,188 @@
+"""
+Keyset (cursor) pagination for the scraped tweets browser.
+
+``Paginator`` pages with OFFSET, so page N reads and discards N-1 pages,
+and it needs an exact ``COUNT(*)``. Here every page is a ``WHERE (key, id)
+< (last key, last id) ORDER BY key, id LIMIT n`` seek on the active sort
+column, so deep pages cost the same as the first one.
+
+Cursors are signed, opaque tokens that carry the sort, the boundary row and
+the page's position (used only to number rows). A cursor issued for another
+sort, or a tampered one, falls back to the first page.
+
+``estimate_count`` replaces the exact total with the planner's row estimate
+on PostgreSQL when the result set is large.
+"""
+import json
+from datetime import datetime
+
+from django.core import signing
+from django.db import connection
+from django.db.models import Q
+
+CURSOR_SALT = 'twitter.pagination.cursor'
+
+# Below this many estimated rows an exact count is cheap enough
+EXACT_COUNT_THRESHOLD = 10000
+
+# sort_by value -> (column or annotation, descending)
+KEYSET_SORTS = {
+    '-date': ('date', True),
+    'date': ('date', False),
+    '-likes': ('likes', True),
+    '-retweets': ('retweets', True),
+    '-views': ('views', True),
+    '-total_engagement': ('total_engagement', True),
+    '-search_rank': ('search_rank', True),
+}
+
+
+class KeysetPage:
+    """One page of rows plus the cursors to its neighbours; iterates like a Paginator page"""
+
+    def __init__(
+        self, object_list, start_index, has_next, has_previous, next_cursor, previous_cursor
+    ):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self._start = start_index
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def start_index(self):
+        """1-based position of the first row, 0 for an empty page"""
+        return self._start + 1 if self.object_list else 0
+
+    def end_index(self):
+        return self._start + len(self.object_list)
+
+
+def _dump_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _load_value(field, value):
+    return datetime.fromisoformat(value) if field == 'date' else value
+
+
+def encode_cursor(sort_by, row, offset, direction):
+    """Opaque token for the page after (``next``) or before (``prev``) ``row``"""
+    field, _ = KEYSET_SORTS[sort_by]
+    return signing.dumps({
+        's': sort_by,
+        'v': _dump_value(getattr(row, field)),
+        'id': row.pk,
+        'o': offset,
+        'd': direction,
+    }, salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(token, sort_by):
+    """Cursor payload, or None when missing, tampered with or issued for another sort"""
+    if not token:
+        return None
+    try:
+        cursor = signing.loads(token, salt=CURSOR_SALT)
+    except signing.BadSignature:
+        return None
+    if not isinstance(cursor, dict):
+        return None
+    if cursor.get('s') != sort_by or cursor.get('d') not in ('next', 'prev'):
+        return None
+    try:
+        cursor['v'] = _load_value(KEYSET_SORTS[sort_by][0], cursor['v'])
+    except (TypeError, ValueError):
+        return None
+    return cursor
+
+
+def _beyond(field, descending, value, pk):
+    """Rows strictly after (value, pk) in the (field, pk) ordering"""
+    op = 'lt' if descending else 'gt'
+    return Q(**{f'{field}__{op}': value}) | Q(**{field: value, f'pk__{op}': pk})
+
+
+def paginate_keyset(queryset, sort_by, cursor_token=None, per_page=50):
+    """
+    One page of ``queryset`` ordered by ``sort_by`` (a KEYSET_SORTS key), then pk.
+
+    Fetches ``per_page + 1`` rows to learn whether another page follows;
+    nothing is counted. The search_rank sort key is an annotation and must
+    already be on ``queryset``.
+    """
+    field, descending = KEYSET_SORTS[sort_by]
+    sign = '-' if descending else ''
+    forward = queryset.order_by(f'{sign}{field}', f'{sign}pk')
+    cursor = decode_cursor(cursor_token, sort_by)
+
+    if cursor is not None and cursor['d'] == 'prev':
+        # Walk backwards from the first row of the current page, then restore the order
+        back_sign = '' if descending else '-'
+        backward = queryset.order_by(f'{back_sign}{field}', f'{back_sign}pk')
+        before = _beyond(field, not descending, cursor['v'], cursor['id'])
+        rows = list(backward.filter(before)[:per_page + 1])
+        if len(rows) > per_page:
+            rows = rows[:per_page][::-1]
+            offset, has_previous, has_next = max(cursor['o'], 0), True, True
+        else:
+            # Reached the start: serve a full first page instead of a short one
+            cursor = None
+
+    if cursor is None:
+        rows = list(forward[:per_page + 1])
+        offset, has_previous = 0, False
+        has_next = len(rows) > per_page
+        rows = rows[:per_page]
+    elif cursor['d'] == 'next':
+        after = _beyond(field, descending, cursor['v'], cursor['id'])
+        rows = list(forward.filter(after)[:per_page + 1])
+        offset, has_previous = cursor['o'], True
+        has_next = len(rows) > per_page
+        rows = rows[:per_page]
+
+    next_cursor = previous_cursor = None
+    if has_next and rows:
+        next_cursor = encode_cursor(sort_by, rows[-1], offset + len(rows), 'next')
+    if has_previous and rows:
+        previous_cursor = encode_cursor(sort_by, rows[0], max(offset - per_page, 0), 'prev')
+
+    return KeysetPage(
+        rows,
+        start_index=offset,
+        has_next=has_next,
+        has_previous=has_previous,
+        next_cursor=next_cursor,
+        previous_cursor=previous_cursor,
+    )
+
+
+def estimate_count(queryset, approximate=True):
+    """
+    (row count, is_approximate) for ``queryset``.
+
+    On PostgreSQL, with ``approximate``, the planner's estimate from
+    ``EXPLAIN`` is used when it exceeds EXACT_COUNT_THRESHOLD; smaller
+    results and other databases are counted exactly.
+    """
+    if approximate and connection.vendor == 'postgresql':
+        sql, params = queryset.order_by().values('pk').query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = int(plan[0]['Plan']['Plan Rows'])
+        if estimate > EXACT_COUNT_THRESHOLD:
+            return estimate, True
+    return queryset.count(), False
@@ -0,0 +1,126 @@
+"""
+Result cache for the scraped tweets browser.
+
+Pages and stats are cached under a key built from the canonical form of the
+applied filters, so ``?min_likes=05&search_content=a  b`` and
+``?search_content=a b&min_likes=5`` share an entry. Every key also embeds
+the current *ingestion generation*: ingestion and deletes bump it once their
+transaction commits, which makes all earlier entries unreachable at once
+(they age out through the TTL). Cached pages are therefore correct until new
+tweets land; edits made elsewhere, e.g. in the admin, show up within
+SCRAPED_TWEETS_CACHE_SECONDS.
+
+The ``scraped_tweets`` cache alias is per-process memory unless
+SCRAPED_TWEETS_CACHE_URL points at Redis, which shares entries, the
+generation and the hit/miss counters across web nodes. A per-process
+generation is only bumped by ingestion in the same process, not by other
+gunicorn workers, the Celery worker or ``bulk_copy``. So without Redis the
+TTL defaults to a few seconds and the cache only absorbs bursts of reloads.
+"""
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+CACHE_ALIAS = 'scraped_tweets'
+GENERATION_KEY = 'twitter:scraped-tweets:generation'
+HITS_KEY = 'twitter:scraped-tweets:hits'
+MISSES_KEY = 'twitter:scraped-tweets:misses'
+
+# Values that are numbers in the filter form, '05' and '5' mean the same
+NUMERIC_PARAMS = ('min_likes', 'min_retweets', 'min_views')
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def _incr(key, delta=1):
+    cache = get_cache()
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        # Missing (first use or evicted): start the counter, then retry once
+        cache.add(key, 0, timeout=None)
+        return cache.incr(key, delta)
+
+
+def ingestion_generation():
+    """Current generation; a lost counter restarts at the clock so old entries never come back"""
+    cache = get_cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, time.time_ns() // 1000, timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def bump_ingestion_generation():
+    """Invalidate every cached page and stat, call once the writing transaction has committed"""
+    ingestion_generation()
+    return _incr(GENERATION_KEY)
+
+
+def canonical_filters(params):
+    """``params`` with blank values dropped, whitespace collapsed and numbers normalized, sorted by name"""
+    canonical = {}
+    for name, value in params.items():
+        value = ' '.join(str(value).split())
+        if not value:
+            continue
+        if name in NUMERIC_PARAMS and value.isdigit():
+            value = str(int(value))
+        canonical[name] = value
+    return dict(sorted(canonical.items()))
+
+
+def result_cache_key(namespace, params, generation=None):
+    generation = ingestion_generation() if generation is None else generation
+    digest = hashlib.sha256(
+        json.dumps(canonical_filters(params), separators=(',', ':')).encode('utf-8')
+    ).hexdigest()
+    return f'twitter:scraped-tweets:{namespace}:{generation}:{digest}'
+
+
+def cached_result(namespace, params, compute):
+    """
+    ``compute()`` cached under the canonical ``params`` and the current generation.
+
+    The generation is read before computing, so a result that races with an
+    ingestion is stored under the old generation and never served.
+    """
+    timeout = settings.SCRAPED_TWEETS_CACHE_SECONDS
+    if timeout <= 0:
+        return compute()
+
+    cache = get_cache()
+    key = result_cache_key(namespace, params)
+    result = cache.get(key)
+    if result is not None:
+        _incr(HITS_KEY)
+        return result
+
+    _incr(MISSES_KEY)
+    result = compute()
+    cache.set(key, result, timeout)
+    return result
+
+
+def cache_metrics():
+    """Hit/miss counters since the cache started, plus the current generation"""
+    cache = get_cache()
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    lookups = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / lookups, 4) if lookups else None,
+        'generation': ingestion_generation(),
+    }
+
+
+def reset_cache_metrics():
+    get_cache().delete_many([HITS_KEY, MISSES_KEY])
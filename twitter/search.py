@@ -0,0 +1,242 @@
+"""
+Full-text search over SourceTweet content.
+
+The index lives outside the model so the ingestion INSERTs never have to
+write it:
+
+- PostgreSQL: a generated ``search_vector tsvector`` column with a GIN index
+- SQLite: an FTS5 external-content table kept in sync by triggers
+- anything else, or SQLite builds without FTS5: ``icontains`` per term,
+  unranked
+
+Queries accept plain terms (all must match), ``"quoted phrases"`` and
+``prefix*`` terms. ``search_condition`` and ``search_rank`` return
+expressions, so the scraped tweets page, the export and the admin search
+filter and rank through the same index. Migration 0009 creates the index
+from its own frozen copy of this DDL, so a change here needs a new
+migration. Migrations that make SQLite rebuild twitter_sourcetweet drop the
+triggers and must recreate them the same way (see 0010 and 0011).
+``create_search_index`` is safe to call again.
+
+``search_backend`` is resolved once per connection. ``create_search_index``
+and ``drop_search_index`` forget it; a process that was running while
+another one migrated the index in or out must be restarted to notice.
+"""
+import logging
+import re
+from weakref import WeakKeyDictionary
+
+from django.db import connection, connections
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+logger = logging.getLogger(__name__)
+
+SEARCH_CONFIG = 'english'
+FTS_TABLE = 'twitter_sourcetweet_fts'
+TWEET_TABLE = 'twitter_sourcetweet'
+
+POSTGRES_INDEX_SQL = [
+    f"ALTER TABLE {TWEET_TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    f"GENERATED ALWAYS AS (to_tsvector('{SEARCH_CONFIG}', coalesce(content, ''))) STORED",
+    f"CREATE INDEX IF NOT EXISTS sourcetweet_search_gin ON {TWEET_TABLE} USING GIN (search_vector)",
+]
+POSTGRES_DROP_SQL = [
+    "DROP INDEX IF EXISTS sourcetweet_search_gin",
+    f"ALTER TABLE {TWEET_TABLE} DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_INDEX_SQL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"content, content='{TWEET_TABLE}', content_rowid='id', tokenize='porter unicode61')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {TWEET_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.id, new.content); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {TWEET_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content) "
+    f"VALUES ('delete', old.id, old.content); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF content ON {TWEET_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content) VALUES ('delete', old.id, old.content); "
+    f"INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.id, new.content); END",
+    # Index the rows stored before the table existed
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+SQLITE_DROP_SQL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+# Database wrapper -> search_backend() result
+_BACKENDS = WeakKeyDictionary()
+
+TOKEN_RE = re.compile(r'"([^"]*)"|(\S+)')
+WORD_RE = re.compile(r'\w+')
+
+
+def _execute(conn, statements):
+    with conn.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def create_search_index(conn=connection):
+    """Create the backend's search index for SourceTweet content if it is missing"""
+    forget_search_backend(conn)
+    if conn.vendor == 'postgresql':
+        _execute(conn, POSTGRES_INDEX_SQL)
+    elif conn.vendor == 'sqlite':
+        try:
+            _execute(conn, SQLITE_INDEX_SQL)
+        except Exception as e:
+            # Python builds without FTS5 keep working on the icontains fallback
+            logger.warning(f"SQLite FTS5 unavailable, tweet search falls back to icontains: {e}")
+
+
+def drop_search_index(conn=connection):
+    forget_search_backend(conn)
+    if conn.vendor == 'postgresql':
+        _execute(conn, POSTGRES_DROP_SQL)
+    elif conn.vendor == 'sqlite':
+        _execute(conn, SQLITE_DROP_SQL)
+
+
+def parse_search_query(text):
+    """
+    Split a search box value into (kind, words) parts.
+
+    ``kind`` is 'phrase' for quoted text or hyphenated words, 'prefix' for a
+    term ending in ``*`` and 'term' otherwise. Only word characters are kept,
+    so the parts can be rendered into tsquery / FTS5 syntax safely.
+    """
+    parts = []
+    for phrase, token in TOKEN_RE.findall(text or ''):
+        words = WORD_RE.findall(phrase or token)
+        if not words:
+            continue
+        if token and token.endswith('*'):
+            parts.append(('prefix', words))
+        elif phrase or len(words) > 1:
+            parts.append(('phrase', words))
+        else:
+            parts.append(('term', words))
+    return parts
+
+
+def to_tsquery(parts):
+    """PostgreSQL ``to_tsquery`` text: terms ANDed, phrases with <->, prefixes with :*"""
+    rendered = []
+    for kind, words in parts:
+        lexemes = [f"'{word}'" for word in words]
+        if kind == 'prefix':
+            lexemes[-1] += ':*'
+        rendered.append(' <-> '.join(lexemes) if len(lexemes) > 1 else lexemes[0])
+    return ' & '.join(rendered)
+
+
+def to_fts5_query(parts):
+    """SQLite FTS5 MATCH text: every part a quoted string, prefixes starred, implicit AND"""
+    rendered = []
+    for kind, words in parts:
+        query = '"' + ' '.join(words) + '"'
+        rendered.append(query + '*' if kind == 'prefix' else query)
+    return ' '.join(rendered)
+
+
+def search_backend(conn=connection):
+    """'postgresql', 'fts5' or 'icontains' for the database, looked up once per connection"""
+    if conn.vendor == 'postgresql':
+        return 'postgresql'
+    if conn.vendor != 'sqlite':
+        return 'icontains'
+    wrapper = connections[conn.alias]  # The proxy itself is shared by every thread
+    backend = _BACKENDS.get(wrapper)
+    if backend is None:
+        with wrapper.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE]
+            )
+            backend = 'fts5' if cursor.fetchone() else 'icontains'
+        _BACKENDS[wrapper] = backend
+    return backend
+
+
+def forget_search_backend(conn=connection):
+    """Drop the cached ``search_backend`` of ``conn`` once its index was created or dropped"""
+    _BACKENDS.pop(connections[conn.alias], None)
+
+
+def tsquery_has_lexemes(query, conn=connection):
+    """
+    Whether ``to_tsquery`` keeps anything of ``query`` (PostgreSQL).
+
+    A query made only of stop words ("the", "it") becomes an empty tsquery,
+    which matches no row at all.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute(f"SELECT numnode(to_tsquery('{SEARCH_CONFIG}', %s)) > 0", [query])
+        return cursor.fetchone()[0]
+
+
+def _uses_index(parts, backend):
+    if not parts or backend == 'icontains':
+        return False
+    return backend != 'postgresql' or tsquery_has_lexemes(to_tsquery(parts))
+
+
+def search_condition(text, backend=None):
+    """
+    Filter condition matching SourceTweet rows whose content matches ``text``.
+
+    Usable in ``filter()`` and combinable with other ``Q`` objects. Input
+    without any word characters, or only stop words on PostgreSQL, falls
+    back to a plain ``icontains``.
+    """
+    parts = parse_search_query(text)
+    backend = backend or search_backend()
+    if not _uses_index(parts, backend):
+        words = [' '.join(words) for _, words in parts] or [text.strip()]
+        condition = Q()
+        for word in words:
+            condition &= Q(content__icontains=word)
+        return condition
+    # pk__in keeps the condition valid when Django aliases the table inside a subquery
+    if backend == 'postgresql':
+        return Q(pk__in=RawSQL(
+            f"SELECT id FROM {TWEET_TABLE} "
+            f"WHERE search_vector @@ to_tsquery('{SEARCH_CONFIG}', %s)",
+            [to_tsquery(parts)],
+        ))
+    return Q(pk__in=RawSQL(
+        f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+        [to_fts5_query(parts)],
+    ))
+
+
+def search_rank(text, backend=None):
+    """Relevance of each matching row to ``text``, higher is better (0 on the fallback)"""
+    parts = parse_search_query(text)
+    backend = backend or search_backend()
+    if not _uses_index(parts, backend):
+        return Value(0.0, output_field=FloatField())
+    if backend == 'postgresql':
+        return RawSQL(
+            f"ts_rank_cd({TWEET_TABLE}.search_vector, to_tsquery('{SEARCH_CONFIG}', %s))",
+            [to_tsquery(parts)],
+            output_field=FloatField(),
+        )
+    # bm25() is lower for better matches
+    return RawSQL(
+        f"(SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE} "
+        f"WHERE {FTS_TABLE} MATCH %s AND {FTS_TABLE}.rowid = {TWEET_TABLE}.id)",
+        [to_fts5_query(parts)],
+        output_field=FloatField(),
+    )
+
+
+def search_tweets(queryset, text):
+    """``queryset`` narrowed to tweets matching ``text``, annotated with ``search_rank``"""
+    backend = search_backend()
+    return queryset.filter(search_condition(text, backend)).annotate(
+        search_rank=search_rank(text, backend)
+    )
@@ -0,0 +1,51 @@
+"""
+Statistics for the scraped tweets browser.
+
+Everything that depends on the active filters (row count, engagement sums,
+distinct executions) comes from one aggregate query over the filtered
+queryset. The filter-independent numbers, the table total and the execution
+dropdown, are served from the result cache (see ``result_cache``) and only
+recomputed after ingestion or deletes, so a page load normally runs no
+query for them at all.
+"""
+from django.conf import settings
+from django.db.models import Count, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .models import Execution, SourceTweet
+from .pagination import estimate_count
+from .result_cache import cached_result
+
+
+def filtered_tweet_stats(queryset):
+    """
+    Row count, likes/retweets/views sums and distinct executions of
+    ``queryset`` in a single aggregate query; sums are 0 on an empty result.
+    """
+    return queryset.order_by().aggregate(
+        filtered_tweets_count=Count('id'),
+        total_likes=Coalesce(Sum('likes'), Value(0)),
+        total_retweets=Coalesce(Sum('retweets'), Value(0)),
+        total_views=Coalesce(Sum('views'), Value(0)),
+        total_executions=Count('execution_id', distinct=True),
+    )
+
+
+def compute_global_tweet_stats():
+    """Table total (planner estimate on large PostgreSQL tables) and the execution IDs from the registry"""
+    total_tweets, total_is_approximate = estimate_count(
+        SourceTweet.objects.all(), approximate=settings.SCRAPED_TWEETS_APPROXIMATE_COUNT
+    )
+    execution_ids = list(
+        Execution.objects.order_by('execution_id').values_list('execution_id', flat=True)
+    )
+    return {
+        'total_tweets': total_tweets,
+        'total_is_approximate': total_is_approximate,
+        'execution_ids': execution_ids,
+    }
+
+
+def global_tweet_stats():
+    """Cached ``compute_global_tweet_stats``"""
+    return cached_result('global', {}, compute_global_tweet_stats)
@@ -0,0 +1,297 @@
+"""
+Streaming ingestion for very large n8n scrape payloads.
+
+``CheckDuplicateTweetAPIView`` normally lets DRF parse the whole body into
+``request.data`` and then echoes ``new_tweets`` from a second in-memory copy.
+Here the body is read incrementally with ijson. Tweets are written in
+fixed-size chunks through the regular upsert path, and the new tweets to echo
+are spooled to a temporary file. The response is then streamed back, so peak
+memory depends on ``STREAM_CHUNK_SIZE`` and not on the size of the scrape.
+"""
+import itertools
+import json
+import logging
+import tempfile
+import time
+import uuid
+
+import ijson
+from django.conf import settings
+from django.db import transaction
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework import status
+
+from .ingestion import (
+    build_duplicate_check_response,
+    ingest_scrape_batches,
+    ingestion_write_lock,
+    record_execution_calls,
+    register_executions,
+)
+from .models import Execution, SourceTweet
+
+logger = logging.getLogger(__name__)
+
+STREAM_CHUNK_SIZE = 1000
+# Spooled echo buffers stay in memory up to this size, then move to disk
+SPOOL_MAX_MEMORY = 1024 * 1024
+RESPONSE_WRITE_SIZE = 64 * 1024
+
+HEADER_KEYS = ('execution_id', 'source_url', 'msg')
+
+
+def wants_streaming(request):
+    """Stream JSON bodies on ?stream=true or when they exceed N8N_STREAMING_THRESHOLD bytes"""
+    if not request.content_type.startswith('application/json'):
+        return False
+    if request.query_params.get('stream', '').lower() in ('1', 'true', 'yes'):
+        return True
+    try:
+        content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        return False
+    return content_length >= settings.N8N_STREAMING_THRESHOLD
+
+
+def _join(prefix, key):
+    return f"{prefix}.{key}" if prefix else key
+
+
+def iter_scrape_events(stream):
+    """
+    Walk a scrape payload (one object or an array of them) without building it.
+
+    Yields ``('start', index)`` when an execution object opens,
+    ``('tweet', index, record, header, detailed)`` for every element of its
+    ``tweets`` or ``data.tweets`` array and ``('end', index, header, detailed)``
+    when it closes. ``header`` holds the top-level execution_id / source_url /
+    msg scalars seen so far in that object.
+    """
+    events = ijson.parse(stream, use_float=True)
+    first = next(events, None)
+    if first is None or first[1] not in ('start_map', 'start_array'):
+        raise ValueError("Expected a JSON object or an array of objects")
+
+    # Root decides the layout: one object, or an array of objects
+    if first[1] == 'start_array':
+        element_prefix = 'item'
+    else:
+        element_prefix = ''
+        events = itertools.chain([first], events)
+    header_prefixes = {_join(element_prefix, key): key for key in HEADER_KEYS}
+    simple_prefix = _join(element_prefix, 'tweets.item')
+    detailed_prefix = _join(element_prefix, 'data.tweets.item')
+
+    index = -1
+    header = {}
+    detailed = False
+    for prefix, event, value in events:
+        if prefix == element_prefix and event == 'start_map':
+            index += 1
+            header = {}
+            detailed = False
+            yield ('start', index)
+        elif prefix == element_prefix and event == 'end_map':
+            yield ('end', index, header, detailed)
+        elif prefix in header_prefixes and event not in ('start_map', 'start_array', 'map_key'):
+            header[header_prefixes[prefix]] = value
+        elif event == 'start_map' and prefix in (simple_prefix, detailed_prefix):
+            detailed = detailed or prefix == detailed_prefix
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+            depth = 1
+            while depth:
+                prefix, event, value = next(events)
+                if event in ('start_map', 'start_array'):
+                    depth += 1
+                elif event in ('end_map', 'end_array'):
+                    depth -= 1
+                builder.event(event, value)
+            yield ('tweet', index, builder.value, header, detailed)
+
+
+def _resolve_header(header, detailed):
+    """Same defaults as ingestion.extract_scrape_payload"""
+    if detailed:
+        return (
+            header.get('execution_id', f"exec_{header.get('msg', 'unknown')}"),
+            header.get('source_url', 'api_detailed'),
+        )
+    return header.get('execution_id'), header.get('source_url', 'unknown')
+
+
+class _ExecutionState:
+    """Per-execution counters and the spooled echo of its new tweets"""
+
+    def __init__(self, refresh_engagement=False):
+        self.refresh_engagement = refresh_engagement
+        self.pending = []
+        self.processed = 0
+        self.saved = 0
+        self.duplicates = 0
+        self.refreshed = 0
+        self.echo = tempfile.SpooledTemporaryFile(
+            max_size=SPOOL_MAX_MEMORY, mode='w+', encoding='utf-8'
+        )
+        # Rows flushed before execution_id/source_url were seen are tagged and patched at the end
+        self.placeholder = f"streaming-{uuid.uuid4().hex}"
+        self.used_placeholder = False
+        self.execution_id = None
+        self.source_url = None
+
+    def flush(self, header, detailed):
+        if not self.pending:
+            return
+        # Header keys normally precede the tweets array in n8n payloads
+        if 'execution_id' in header and 'source_url' in header:
+            execution_id, source_url = _resolve_header(header, detailed)
+        else:
+            execution_id, source_url = self.placeholder, self.placeholder
+            self.used_placeholder = True
+        [(new_tweets, duplicates, refreshed)] = ingest_scrape_batches(
+            [(self.pending, execution_id, source_url)], refresh_engagement=self.refresh_engagement,
+            record_calls=False
+        )
+        for tweet in new_tweets:
+            self.echo.write(json.dumps(tweet, ensure_ascii=False, separators=(',', ':')))
+            self.echo.write('\n')
+        self.saved += len(new_tweets)
+        self.duplicates += duplicates
+        self.refreshed += refreshed
+        self.pending = []
+
+    def finish(self, header, detailed):
+        self.flush(header, detailed)
+        self.execution_id, self.source_url = _resolve_header(header, detailed)
+        register_executions({self.execution_id: self.source_url})
+        if self.used_placeholder:
+            SourceTweet.objects.filter(execution_id=self.placeholder).update(
+                execution_id=self.execution_id, source_url=self.source_url
+            )
+            Execution.objects.filter(execution_id=self.placeholder).delete()
+
+
+def ingest_scrape_stream(stream, chunk_size=None, refresh_engagement=False):
+    """Ingest a streamed scrape payload in one transaction; one _ExecutionState per execution"""
+    chunk_size = chunk_size or STREAM_CHUNK_SIZE
+    started = time.perf_counter()
+    executions = []
+    try:
+        with ingestion_write_lock(), transaction.atomic():
+            for event in iter_scrape_events(stream):
+                if event[0] == 'start':
+                    executions.append(_ExecutionState(refresh_engagement))
+                elif event[0] == 'tweet':
+                    _, index, record, header, detailed = event
+                    state = executions[index]
+                    state.pending.append(record)
+                    state.processed += 1
+                    if len(state.pending) >= chunk_size:
+                        state.flush(header, detailed)
+                else:
+                    _, index, header, detailed = event
+                    executions[index].finish(header, detailed)
+            # The chunks were ingested without recording; the whole stream is one n8n call
+            record_execution_calls(
+                [
+                    (
+                        state.execution_id, state.processed, state.saved, state.duplicates,
+                        state.refreshed,
+                    )
+                    for state in executions
+                ],
+                duration_ms=round((time.perf_counter() - started) * 1000),
+            )
+    except Exception:
+        # No response will read the spools; spilled ones would leave their temp files behind
+        for state in executions:
+            state.echo.close()
+        raise
+    return executions
+
+
+def _build_streamed_body(executions):
+    """Response dict with a marker in place of each new_tweets list"""
+    markers = []
+    results = []
+    for state in executions:
+        marker = f"__new_tweets_{uuid.uuid4().hex}__"
+        markers.append(marker)
+        results.append(build_duplicate_check_response(
+            state.execution_id, state.source_url, marker, state.duplicates, state.processed,
+            saved_count=state.saved,
+            refreshed_count=state.refreshed if state.refresh_engagement else None,
+        ))
+    if len(results) == 1:
+        return results[0], markers
+
+    saved_count = sum(state.saved for state in executions)
+    duplicates_found = sum(state.duplicates for state in executions)
+    summary = {
+        "duplicates_found": duplicates_found,
+        "executions_processed": len(results),
+        "new_tweets_found": saved_count,
+        "saved_to_database": saved_count,
+        "total_processed": sum(state.processed for state in executions)
+    }
+    if executions and executions[0].refresh_engagement:
+        summary["engagement_refreshed"] = sum(state.refreshed for state in executions)
+    return {
+        "message": (
+            f"✅ Success: {len(results)} executions processed, "
+            f"{saved_count} new tweets saved, {duplicates_found} duplicates found"
+        ),
+        "results": results,
+        "status": "success",
+        "summary": summary
+    }, markers
+
+
+def iter_response_chunks(executions):
+    """Serialize the response, splicing each spooled new_tweets array in place of its marker"""
+    body, markers = _build_streamed_body(executions)
+    text = json.dumps(body, ensure_ascii=False, separators=(',', ':'))
+    try:
+        for marker, state in zip(markers, executions):
+            before, text = text.split(f'"{marker}"', 1)
+            yield before
+            state.echo.seek(0)
+            buffer = ['[']
+            size = 1
+            first = True
+            for line in state.echo:
+                if not first:
+                    buffer.append(',')
+                buffer.append(line.rstrip('\n'))
+                size += len(line)
+                first = False
+                if size >= RESPONSE_WRITE_SIZE:
+                    yield ''.join(buffer)
+                    buffer, size = [], 0
+            buffer.append(']')
+            yield ''.join(buffer)
+        yield text
+    finally:
+        for state in executions:
+            state.echo.close()
+
+
+def stream_duplicate_check(stream, refresh_engagement=None):
+    """Streaming counterpart of ingestion.process_duplicate_check"""
+    if refresh_engagement is None:
+        refresh_engagement = settings.N8N_REFRESH_ENGAGEMENT
+    try:
+        executions = ingest_scrape_stream(stream, refresh_engagement=refresh_engagement)
+    except Exception as e:
+        logger.error(f"Error in streaming check-duplicate-tweet: {str(e)}")
+        return JsonResponse({
+            "status": "error",
+            "message": f"Error processing tweets: {str(e)}",
+            "data": None
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR, json_dumps_params={'ensure_ascii': False})
+
+    logger.info(
+        f"Streaming duplicate check complete: {sum(s.saved for s in executions)} new, "
+        f"{sum(s.duplicates for s in executions)} duplicates across {len(executions)} execution(s)"
+    )
+    return StreamingHttpResponse(iter_response_chunks(executions), content_type='application/json')
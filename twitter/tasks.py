@@ -0,0 +1,72 @@
+"""
+Background tasks for the Twitter app
+"""
+import logging
+
+from celery import shared_task
+from django.utils import timezone
+
+from .engagement import downsample_snapshots
+from .export_jobs import purge_expired_exports, run_export_job
+from .ingestion import (
+    process_duplicate_check,
+    process_receive_tweets,
+    purge_finished_ingestion_jobs,
+)
+from .models import IngestionJob
+
+logger = logging.getLogger(__name__)
+
+JOB_PROCESSORS = {
+    IngestionJob.KIND_CHECK_DUPLICATE: process_duplicate_check,
+    IngestionJob.KIND_RECEIVE_TWEETS: process_receive_tweets,
+}
+
+
+@shared_task
+def process_ingestion_job(job_id):
+    """Process a queued n8n payload and store the response the sync endpoint would return"""
+    # Claim the job atomically so redelivered messages never process it twice
+    claimed = IngestionJob.objects.filter(
+        job_id=job_id, status=IngestionJob.STATUS_PENDING
+    ).update(status=IngestionJob.STATUS_PROCESSING, started_at=timezone.now())
+    if not claimed:
+        logger.info(f"Ingestion job {job_id} already claimed, skipping")
+        return
+
+    job = IngestionJob.objects.get(job_id=job_id)
+    response_data, response_status = JOB_PROCESSORS[job.kind](job.payload, **job.options)
+
+    job.response_data = response_data
+    job.response_status = response_status
+    job.status = IngestionJob.STATUS_COMPLETED if response_status < 400 else IngestionJob.STATUS_FAILED
+    job.finished_at = timezone.now()
+    # The tweets are stored (or rejected) by now; only the response is still needed
+    job.payload = None
+    job.save(update_fields=['payload', 'response_data', 'response_status', 'status', 'finished_at'])
+    logger.info(f"Ingestion job {job_id} {job.status} in {(job.finished_at - job.started_at).total_seconds():.2f}s")
+
+
+@shared_task
+def downsample_engagement_snapshots():
+    """Periodic (celery beat) counterpart of ``manage.py downsample_engagement``"""
+    return downsample_snapshots()
+
+
+@shared_task
+def process_export_job(job_id):
+    """Write a queued export to EXPORT_JOBS_ROOT, see twitter.export_jobs"""
+    run_export_job(job_id)
+
+
+@shared_task
+def purge_export_jobs():
+    """Periodic (celery beat) counterpart of ``manage.py purge_export_jobs``"""
+    jobs, files = purge_expired_exports()
+    return {'jobs': jobs, 'files': files}
+
+
+@shared_task
+def purge_ingestion_jobs():
+    """Periodic (celery beat) counterpart of ``manage.py purge_ingestion_jobs``"""
+    return {'jobs': purge_finished_ingestion_jobs()}
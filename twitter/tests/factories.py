@@ -0,0 +1,58 @@
+from django.utils import timezone
+
+from twitter.models import Execution, SourceTweet
+
+
+def simple_tweet(tweet_id, **overrides):
+    """Build a tweet record in the n8n simple format."""
+    tweet = {
+        "Tweet ID": str(tweet_id),
+        "URL": f"https://x.com/coophive/status/{tweet_id}",
+        "Content": f"Tweet number {tweet_id}",
+        "Likes": 1,
+        "Retweets": 2,
+        "Replies": 3,
+        "Quotes": 4,
+        "Views": 500,
+        "Date": "Thu Aug 14 14:30:31 +0000 2025",
+        "Status": "success",
+        "Tweet": f"https://twitter.com/coophive/status/{tweet_id}",
+    }
+    tweet.update(overrides)
+    return tweet
+
+
+def detailed_tweet(tweet_id, **overrides):
+    """Build a tweet record in the n8n detailed format."""
+    tweet = {
+        "id": str(tweet_id),
+        "text": f"Detailed tweet {tweet_id}",
+        "likeCount": 5,
+        "retweetCount": 6,
+        "replyCount": 7,
+        "quoteCount": 8,
+        "viewCount": 900,
+        "url": f"https://x.com/coophive/status/{tweet_id}",
+        "twitterUrl": f"https://twitter.com/coophive/status/{tweet_id}",
+        "createdAt": "2025-08-14T16:07:32.837Z",
+    }
+    tweet.update(overrides)
+    return tweet
+
+
+def make_source_tweet(tweet_id, **overrides):
+    """Create a stored SourceTweet row."""
+    fields = {
+        'tweet_id': str(tweet_id),
+        'url': f"https://x.com/coophive/status/{tweet_id}",
+        'content': f"Stored tweet {tweet_id}",
+        'date': timezone.now(),
+        'tweet_url': f"https://twitter.com/coophive/status/{tweet_id}",
+        'execution_id': 'exec_existing',
+        'source_url': 'https://n8n.coophive.network',
+    }
+    fields.update(overrides)
+    Execution.objects.get_or_create(
+        execution_id=fields['execution_id'], defaults={'source_url': fields['source_url']}
+    )
+    return SourceTweet.objects.create(**fields)
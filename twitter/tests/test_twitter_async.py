@@ -0,0 +1,106 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from twitter.ingestion import purge_finished_ingestion_jobs
+from twitter.models import GeneratedTweet, IngestionJob, SourceTweet
+from twitter.tests.factories import simple_tweet
+
+
+class AsyncIngestionTests(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.check_url = reverse('twitter:api_check_duplicate')
+        self.receive_url = reverse('twitter:api_receive_tweets')
+
+    def test_async_check_duplicate_returns_job_and_same_summary(self):
+        """Test ?async=true answers 202 and the job result matches the sync response."""
+        payload = {"execution_id": "exec_async", "tweets": [simple_tweet(1), simple_tweet(2)]}
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f"{self.check_url}?async=true", payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job_id = response.data['job_id']
+        self.assertTrue(response['Location'].endswith(f"/twitter/api/ingestion-jobs/{job_id}/"))
+        self.assertEqual(SourceTweet.objects.count(), 2)
+
+        job_response = self.client.get(reverse('twitter:api_ingestion_job_status', args=[job_id]))
+        self.assertEqual(job_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(job_response.data['data']['new_tweets'], payload['tweets'])
+        self.assertEqual(job_response.data['summary']['saved_to_database'], 2)
+
+        job = IngestionJob.objects.get(job_id=job_id)
+        self.assertEqual(job.status, IngestionJob.STATUS_COMPLETED)
+        self.assertIsNone(job.payload)
+
+    def test_prefer_header_queues_receive_tweets(self):
+        """Test Prefer: respond-async queues a generated campaign batch."""
+        payload = [{
+            "campaign_batch": "batch_async",
+            "analysis_summary": {"brand_alignment_score": 9},
+            "tweets": [{"id": "batch_async-tweet-1", "content": "Hello agents"}],
+        }]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                self.receive_url, payload, format='json', HTTP_PREFER='respond-async'
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job_response = self.client.get(response['Location'])
+        self.assertEqual(job_response.data, {
+            "campaign_batch": "batch_async",
+            "message": "Received 1 tweets (saved to database)",
+            "status": "success",
+        })
+        self.assertEqual(GeneratedTweet.objects.count(), 1)
+
+    def test_pending_job_reports_accepted(self):
+        """Test polling a job that has not run yet."""
+        job = IngestionJob.objects.create(kind=IngestionJob.KIND_CHECK_DUPLICATE, payload={"tweets": []})
+
+        response = self.client.get(reverse('twitter:api_ingestion_job_status', args=[job.job_id]))
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], IngestionJob.STATUS_PENDING)
+
+
+class PurgeIngestionJobsTests(TestCase):
+    def job(self, status, finished_hours_ago=None):
+        """Create a job that finished ``finished_hours_ago`` hours ago."""
+        finished_at = None
+        if finished_hours_ago is not None:
+            finished_at = timezone.now() - timedelta(hours=finished_hours_ago)
+        return IngestionJob.objects.create(
+            kind=IngestionJob.KIND_CHECK_DUPLICATE, status=status, finished_at=finished_at
+        )
+
+    def test_only_finished_jobs_past_the_ttl_are_deleted(self):
+        """Test completed and failed jobs go after the TTL while unfinished ones stay."""
+        self.job(IngestionJob.STATUS_COMPLETED, finished_hours_ago=25)
+        self.job(IngestionJob.STATUS_FAILED, finished_hours_ago=30)
+        recent = self.job(IngestionJob.STATUS_COMPLETED, finished_hours_ago=1)
+        pending = self.job(IngestionJob.STATUS_PENDING)
+        pending.created_at = timezone.now() - timedelta(days=10)
+        pending.save(update_fields=['created_at'])
+
+        self.assertEqual(purge_finished_ingestion_jobs(), 2)
+        self.assertEqual(set(IngestionJob.objects.all()), {recent, pending})
+
+    def test_management_command(self):
+        """Test the command reports what it deleted."""
+        self.job(IngestionJob.STATUS_COMPLETED, finished_hours_ago=48)
+        out = StringIO()
+
+        call_command('purge_ingestion_jobs', stdout=out)
+
+        self.assertIn("Deleted 1 finished ingestion jobs", out.getvalue())
+        self.assertFalse(IngestionJob.objects.exists())
@@ -0,0 +1,137 @@
+import io
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from twitter.bulk_copy import COPY_TABLES, copy_export, copy_import
+from twitter.models import CampaignBatch, Execution, GeneratedTweet, SourceTweet
+from twitter.result_cache import ingestion_generation
+from twitter.tests.factories import make_source_tweet
+
+
+def dump(name, queryset=None):
+    f = io.StringIO(newline='')
+    count = copy_export(name, f, queryset)
+    f.seek(0)
+    return f, count
+
+
+class BulkCopyTests(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        make_source_tweet(
+            1, content='Multi\nline, "quoted"', likes=7,
+            date=datetime(2025, 8, 14, 14, 30, tzinfo=dt_timezone.utc),
+            execution_id='exec_backfill', is_processed=True,
+        )
+        make_source_tweet(2, content='\\N is not NULL', execution_id='exec_backfill')
+        self.batch = CampaignBatch.objects.create(
+            batch_id="batch_1", analysis_summary={"themes": ["compute"]}, total_tweets=1,
+            ready_for_deployment=1, title="Batch", description="",
+        )
+        GeneratedTweet.objects.create(
+            campaign_batch=self.batch, tweet_id="t1", type="generated", content="Hi",
+            character_count=2, engagement_hook="", coophive_elements=["agents"],
+            discord_voice_patterns=[], theme_connection="", ready_for_deployment=True,
+            status="Approved",
+        )
+
+    def test_source_tweets_round_trip(self):
+        """Test a dump reloads into an empty table unchanged and registers executions."""
+        before = list(SourceTweet.objects.order_by('tweet_id').values())
+        f, count = dump('source_tweets')
+        SourceTweet.objects.all().delete()
+        Execution.objects.all().delete()
+        generation = ingestion_generation()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            staged, inserted = copy_import('source_tweets', f)
+
+        self.assertEqual((count, staged, inserted), (2, 2, 2))
+        after = list(SourceTweet.objects.order_by('tweet_id').values())
+
+        def strip(rows):
+            return [{k: v for k, v in row.items() if k != 'id'} for row in rows]
+
+        self.assertEqual(strip(after), strip(before))
+        self.assertEqual(after[0]['total_engagement'], 7)
+        self.assertTrue(Execution.objects.filter(execution_id='exec_backfill').exists())
+        self.assertGreater(ingestion_generation(), generation)
+
+    def test_existing_rows_are_skipped(self):
+        """Test reloading rows already present inserts nothing."""
+        f, _ = dump('source_tweets', SourceTweet.objects.filter(tweet_id='1'))
+
+        self.assertEqual(copy_import('source_tweets', f), (1, 0))
+
+    def test_generated_tweets_by_batch_id(self):
+        """Test generated tweets load by batch_id, skip unknown batches and keep counters right."""
+        batches, _ = dump('campaign_batches')
+        tweets, _ = dump('generated_tweets')
+        self.assertIn('batch_id', tweets.getvalue().splitlines()[0].split(','))
+        GeneratedTweet.objects.all().delete()
+        CampaignBatch.objects.all().delete()
+
+        self.assertEqual(copy_import('generated_tweets', io.StringIO(tweets.getvalue())), (1, 0))
+        self.assertEqual(copy_import('campaign_batches', batches), (1, 1))
+        self.assertEqual(copy_import('generated_tweets', tweets), (1, 1))
+
+        batch = CampaignBatch.objects.get(batch_id='batch_1')
+        tweet = GeneratedTweet.objects.get()
+        self.assertEqual(
+            (tweet.campaign_batch, tweet.coophive_elements, tweet.published_at),
+            (batch, ["agents"], None)
+        )
+        self.assertEqual(batch.analysis_summary, {"themes": ["compute"]})
+        self.assertEqual((batch.approved_count, batch.brand_aligned_count), (1, 0))
+
+    def test_header_must_match(self):
+        """Test a file for another table is rejected before anything is written."""
+        f, _ = dump('campaign_batches')
+
+        with self.assertRaises(ValueError):
+            copy_import('source_tweets', f)
+
+    def test_columns_skip_generated_and_primary_key(self):
+        """Test the dump carries no id or stored engagement column."""
+        headers = COPY_TABLES['source_tweets'].headers
+
+        self.assertNotIn('id', headers)
+        self.assertNotIn('total_engagement', headers)
+        self.assertIn('execution_id', headers)
+
+
+class BulkCopyCommandTests(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        for i in range(3):
+            make_source_tweet(i)
+
+    def test_gzip_round_trip(self):
+        """Test exporting to and importing from a .gz file."""
+        path = os.path.join(self.tmpdir, 'tweets.csv.gz')
+        out = StringIO()
+
+        call_command('bulk_copy', 'export', 'source_tweets', path, stdout=out)
+        SourceTweet.objects.all().delete()
+        call_command('bulk_copy', 'import', 'source_tweets', path, stdout=out)
+
+        self.assertIn("Exported 3 source_tweets rows via ORM", out.getvalue())
+        self.assertIn("Imported 3 of 3 source_tweets rows (0 skipped) via ORM", out.getvalue())
+        self.assertEqual(SourceTweet.objects.count(), 3)
+
+    def test_wrong_file(self):
+        """Test a mismatched file is a command error."""
+        path = os.path.join(self.tmpdir, 'tweets.csv')
+        call_command('bulk_copy', 'export', 'source_tweets', path, stdout=StringIO())
+
+        with self.assertRaises(CommandError):
+            call_command('bulk_copy', 'import', 'campaign_batches', path, stdout=StringIO())
@@ -0,0 +1,103 @@
+import gzip
+import json
+import unittest
+import zlib
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from twitter import compression
+from twitter.models import GeneratedTweet, SourceTweet
+from twitter.tests.factories import simple_tweet
+
+
+class CompressedRequestTests(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.url = reverse('twitter:api_check_duplicate')
+        self.payload = {"execution_id": "exec_z", "tweets": [simple_tweet(i) for i in range(1, 21)]}
+        self.body = json.dumps(self.payload).encode('utf-8')
+
+    def _post(self, body, encoding, url=None, **extra):
+        return self.client.post(
+            url or self.url, data=body, content_type='application/json', HTTP_CONTENT_ENCODING=encoding, **extra
+        )
+
+    def test_gzip_body_is_ingested(self):
+        """Test a gzip body is inflated and processed like a plain one."""
+        response = self._post(gzip.compress(self.body), 'gzip')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['data']['new_tweets'], self.payload['tweets'])
+        self.assertEqual(SourceTweet.objects.count(), 20)
+
+    def test_deflate_body_is_ingested(self):
+        """Test a zlib-wrapped deflate body is accepted."""
+        response = self._post(zlib.compress(self.body), 'deflate')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(SourceTweet.objects.count(), 20)
+
+    @unittest.skipIf(compression.zstandard is None, "zstandard is not installed")
+    def test_zstd_body_is_ingested(self):
+        """Test a zstd body is accepted when zstandard is available."""
+        body = compression.zstandard.ZstdCompressor().compress(self.body)
+
+        response = self._post(body, 'zstd')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(SourceTweet.objects.count(), 20)
+
+    def test_receive_tweets_accepts_gzip(self):
+        """Test receive-tweets decodes compressed campaign batches too."""
+        batch = {"campaign_batch": "batch_z", "tweets": [{"id": "z-1", "content": "Hello"}]}
+
+        response = self._post(
+            gzip.compress(json.dumps(batch).encode('utf-8')), 'gzip', url=reverse('twitter:api_receive_tweets')
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(GeneratedTweet.objects.count(), 1)
+
+    @override_settings(N8N_MAX_DECOMPRESSED_BYTES=1024)
+    def test_decompression_bomb_is_rejected(self):
+        """Test bodies inflating past N8N_MAX_DECOMPRESSED_BYTES get 413 and store nothing."""
+        response = self._post(gzip.compress(self.body), 'gzip')
+
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        self.assertEqual(SourceTweet.objects.count(), 0)
+
+    def test_unknown_encoding_is_rejected(self):
+        """Test an unsupported Content-Encoding gets 415."""
+        response = self._post(self.body, 'br')
+
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+        self.assertIn('gzip', response['Accept-Encoding'])
+
+    def test_corrupt_body_is_rejected(self):
+        """Test invalid or truncated compressed data gets 400."""
+        truncated = gzip.compress(self.body)[:-20]
+
+        self.assertEqual(self._post(b'not gzip at all', 'gzip').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self._post(truncated, 'gzip').status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(N8N_STREAMING_THRESHOLD=1024)
+    def test_streaming_threshold_uses_decompressed_size(self):
+        """Test a small gzip body that inflates past the threshold takes the streaming path."""
+        response = self._post(gzip.compress(self.body), 'gzip')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        body = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(body['summary']['saved_to_database'], 20)
+
+    def test_response_is_gzipped_when_accepted(self):
+        """Test JSON responses are gzip-encoded for clients sending Accept-Encoding."""
+        response = self._post(gzip.compress(self.body), 'gzip', HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        body = json.loads(gzip.decompress(response.content))
+        self.assertEqual(body['summary']['new_tweets_found'], 20)
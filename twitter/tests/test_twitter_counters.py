@@ -0,0 +1,224 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from twitter.counters import campaign_status_stats, reconcile_status_counts
+from twitter.ingestion import build_generated_tweet, store_generated_tweets
+from twitter.models import CampaignBatch, GeneratedTweet
+
+
+def counters(batch_id="batch_1"):
+    """Non-zero counters of a batch, fresh from the database."""
+    batch = CampaignBatch.objects.get(batch_id=batch_id)
+    return {key: value for key, value in batch.status_counts.items() if value}
+
+
+class StatusCounterTests(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.client.post(reverse('twitter:api_receive_tweets'), {
+            "campaign_batch": "batch_1",
+            "analysis_summary": {},
+            "tweet_count": 10,
+            "tweets": [
+                {"id": "t1", "content": "One"},
+                {"id": "t2", "content": "Two"},
+                {"id": "t3", "content": "Three", "status": "Draft"},
+            ],
+        }, format='json')
+        self.tweets = {tweet.tweet_id: tweet for tweet in GeneratedTweet.objects.all()}
+
+    def test_ingestion_counts_new_tweets(self):
+        """Test bulk-created tweets are counted per status, not from n8n's tweet_count."""
+        self.assertEqual(counters(), {'total_tweets': 3, 'brand_aligned': 2, 'draft': 1})
+
+    def test_status_transitions_move_counters(self):
+        """Test approve, reject, post and delete keep the counters in step."""
+        for name, tweet_id in (
+            ('api_approve_generated_tweet', 't1'),
+            ('api_reject_generated_tweet', 't2'),
+            ('api_post_tweet_to_x', 't3'),
+        ):
+            response = self.client.post(reverse(f'twitter:{name}', args=[self.tweets[tweet_id].pk]))
+            self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(counters(), {'total_tweets': 3, 'approved': 1, 'rejected': 1, 'posted': 1})
+
+        self.client.delete(reverse('twitter:api_delete_generated_tweet', args=[self.tweets['t2'].pk]))
+
+        self.assertEqual(counters(), {'total_tweets': 2, 'approved': 1, 'posted': 1})
+
+    def test_saving_without_status_change_keeps_counters(self):
+        """Test content edits leave the counters alone."""
+        tweet = GeneratedTweet.objects.get(tweet_id="t1")
+        tweet.content = "Edited"
+        tweet.save()
+
+        self.assertEqual(counters(), {'total_tweets': 3, 'brand_aligned': 2, 'draft': 1})
+
+    def test_stale_instances_move_counters_from_stored_status(self):
+        """Test two saves of the same loaded tweet decrement its stored status only once."""
+        first = GeneratedTweet.objects.get(tweet_id="t1")
+        second = GeneratedTweet.objects.get(tweet_id="t1")
+
+        first.status = "Approved"
+        first.save()
+        second.status = "Rejected"
+        second.save()
+
+        self.assertEqual(
+            counters(), {'total_tweets': 3, 'brand_aligned': 1, 'draft': 1, 'rejected': 1}
+        )
+
+        first.delete()
+
+        self.assertEqual(counters(), {'total_tweets': 2, 'brand_aligned': 1, 'draft': 1})
+
+    def test_deleting_twice_decrements_once(self):
+        """Test deleting a tweet another request already deleted leaves the counters alone."""
+        stale = GeneratedTweet.objects.get(tweet_id="t3")
+        GeneratedTweet.objects.get(tweet_id="t3").delete()
+
+        stale.delete()
+
+        self.assertEqual(counters(), {'total_tweets': 2, 'brand_aligned': 2})
+
+    def test_pages_need_no_aggregate_queries(self):
+        """Test the batch list and review header read the counters instead of counting."""
+        for url in (reverse('twitter:generate_tweets'), reverse('twitter:campaign_review', args=["batch_1"])):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse([q['sql'] for q in ctx.captured_queries if 'COUNT(' in q['sql'].upper()])
+
+        self.assertEqual(response.context['stats']['total_tweets'], 3)
+        self.assertEqual(response.context['stats']['draft'], 1)
+
+
+class StoreGeneratedTweetsTests(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.batch = CampaignBatch.objects.create(
+            batch_id="batch_1", analysis_summary={}, total_tweets=2, ready_for_deployment=2,
+            title="Batch", description="",
+        )
+        GeneratedTweet.objects.create(
+            campaign_batch=self.batch, tweet_id="t1", type="generated", content="Hi",
+            character_count=2, engagement_hook="", coophive_elements=[],
+            discord_voice_patterns=[], theme_connection="", ready_for_deployment=True,
+        )
+
+    def tweets(self):
+        """Unsaved tweets, the first already stored by a concurrent retry."""
+        return [
+            build_generated_tweet(self.batch, {"id": "t1", "content": "Hi"}),
+            build_generated_tweet(self.batch, {"id": "t2", "content": "Hi", "status": "Draft"}),
+        ]
+
+    def test_only_inserted_rows_are_counted(self):
+        """Test rows skipped by the (campaign_batch, tweet_id) constraint move no counters."""
+        inserted = store_generated_tweets(self.tweets())
+
+        self.assertEqual([tweet.tweet_id for tweet in inserted], ["t2"])
+        self.assertEqual(counters(), {'total_tweets': 2, 'brand_aligned': 1, 'draft': 1})
+
+    def test_backends_without_returning_recount(self):
+        """Test the bulk_create fallback recounts the batches it wrote to."""
+        with mock.patch('twitter.ingestion.supports_insert_returning', return_value=False):
+            store_generated_tweets(self.tweets())
+
+        self.assertEqual(counters(), {'total_tweets': 2, 'brand_aligned': 1, 'draft': 1})
+
+
+class ReconcileCountersTests(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.batch = CampaignBatch.objects.create(
+            batch_id="batch_1", analysis_summary={}, total_tweets=2, ready_for_deployment=2,
+            title="Batch", description="",
+        )
+        for tweet_id in ("t1", "t2"):
+            GeneratedTweet.objects.create(
+                campaign_batch=self.batch, tweet_id=tweet_id, type="generated", content="Hi",
+                character_count=2, engagement_hook="", coophive_elements=[], discord_voice_patterns=[],
+                theme_connection="", ready_for_deployment=True,
+            )
+        # Queryset updates bypass GeneratedTweet.save()
+        GeneratedTweet.objects.filter(tweet_id="t1").update(status="approved")
+
+    def test_reconcile_repairs_drift(self):
+        """Test drifted counters are recomputed, matching statuses case-insensitively."""
+        self.assertEqual(counters(), {'total_tweets': 2, 'brand_aligned': 2})
+
+        drifted = reconcile_status_counts()
+
+        self.assertEqual([batch_id for batch_id, _, _ in drifted], ["batch_1"])
+        self.assertEqual(counters(), {'total_tweets': 2, 'brand_aligned': 1, 'approved': 1})
+        self.assertEqual(reconcile_status_counts(), [])
+
+    def test_command_dry_run(self):
+        """Test --dry-run reports drift without writing it."""
+        out = StringIO()
+
+        call_command('reconcile_batch_counters', '--dry-run', stdout=out)
+
+        self.assertIn("approved_count 0 -> 1", out.getvalue())
+        self.assertEqual(counters(), {'total_tweets': 2, 'brand_aligned': 2})
+
+        call_command('reconcile_batch_counters', '--batch', 'batch_1', stdout=StringIO())
+
+        self.assertEqual(counters()['approved'], 1)
+
+
+class CampaignStatsTests(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.client.post(reverse('twitter:api_receive_tweets'), {
+            "campaign_batch": "batch_1",
+            "analysis_summary": {},
+            "tweets": [{"id": f"t{i}", "content": "Hi"} for i in range(5)],
+        }, format='json')
+        self.batch = CampaignBatch.objects.get(batch_id="batch_1")
+
+    def test_single_query_with_case_normalized_statuses(self):
+        """Test every bucket comes from one query and legacy lowercase statuses are counted."""
+        GeneratedTweet.objects.filter(tweet_id__in=["t0", "t1"]).update(status="approved")
+        GeneratedTweet.objects.filter(tweet_id="t2").update(status="Approved")
+        GeneratedTweet.objects.filter(tweet_id="t3").update(status="REJECTED")
+
+        with self.assertNumQueries(1):
+            stats = campaign_status_stats(self.batch)
+
+        self.assertEqual(stats, {
+            'total_tweets': 5, 'brand_aligned': 1, 'draft': 0, 'approved': 3,
+            'posted': 0, 'rejected': 1, 'deleted': 0,
+        })
+
+    def test_review_actions_write_canonical_statuses(self):
+        """Test approving stores the 'Approved' choice value, not lowercase."""
+        tweet = GeneratedTweet.objects.get(tweet_id="t0")
+
+        self.client.post(reverse('twitter:api_approve_generated_tweet', args=[tweet.pk]))
+
+        tweet.refresh_from_db()
+        self.assertEqual(tweet.status, "Approved")
+
+    def test_endpoint(self):
+        """Test the JSON endpoint returns live counts and 404s for unknown batches."""
+        GeneratedTweet.objects.filter(tweet_id="t0").update(status="Posted")
+
+        response = self.client.get(reverse('twitter:api_campaign_stats', args=["batch_1"]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['stats']['posted'], 1)
+        self.assertEqual(response.data['stats']['total_tweets'], 5)
+        self.assertEqual(self.client.get(reverse('twitter:api_campaign_stats', args=["nope"])).status_code, 404)
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.test import SimpleTestCase
+
+from twitter.dates import parse_date_value, parse_tweet_date, parse_tweet_dates
+
+
+class TweetDateParsingTests(SimpleTestCase):
+    def test_twitter_format(self):
+        """Test Twitter's created_at format, which the old 'T' check sent to fromisoformat."""
+        self.assertEqual(
+            parse_tweet_date("Thu Aug 14 14:30:31 +0000 2025"),
+            datetime(2025, 8, 14, 14, 30, 31, tzinfo=dt_timezone.utc)
+        )
+
+    def test_twitter_format_with_offset(self):
+        """Test non-UTC offsets are honoured."""
+        parsed = parse_tweet_date("Mon Mar 03 09:15:00 -0530 2025")
+
+        self.assertEqual(parsed.utcoffset(), -timedelta(hours=5, minutes=30))
+        self.assertEqual(parsed, datetime(2025, 3, 3, 14, 45, tzinfo=dt_timezone.utc))
+
+    def test_iso_formats(self):
+        """Test ISO dates with Z, offsets, no fraction and no timezone."""
+        self.assertEqual(
+            parse_tweet_date("2025-08-14T16:07:32.837Z"),
+            datetime(2025, 8, 14, 16, 7, 32, 837000, tzinfo=dt_timezone.utc)
+        )
+        self.assertEqual(
+            parse_tweet_date("2025-08-14T18:07:32+02:00"),
+            datetime(2025, 8, 14, 16, 7, 32, tzinfo=dt_timezone.utc)
+        )
+        naive = parse_tweet_date("2025-08-14 16:07:32")
+        self.assertIsNotNone(naive.tzinfo)
+
+    def test_other_formats_fall_back_to_dateutil(self):
+        """Test formats without a fast path are still parsed."""
+        self.assertEqual(
+            parse_date_value("14 August 2025 16:07 UTC").date(), datetime(2025, 8, 14).date()
+        )
+
+    def test_unparseable_values_fall_back_to_now(self):
+        """Test junk, empty and non-string dates become now()."""
+        before = datetime.now(dt_timezone.utc)
+        for value in ("not a date", "", None, 1755180451, "Thu Feb 30 14:30:31 +0000 2025"):
+            self.assertGreaterEqual(parse_tweet_date(value), before)
+
+    def test_switching_formats_keeps_parsing(self):
+        """Test the preferred-parser cache never changes results when formats alternate."""
+        values = ["2025-08-14T16:07:32Z", "Thu Aug 14 16:07:32 +0000 2025"] * 3
+
+        parsed = [parse_tweet_date(value) for value in values]
+
+        self.assertEqual(len(set(parsed)), 1)
+
+    def test_batch_matches_single_parsing(self):
+        """Test the column API returns the same dates as parsing one by one."""
+        values = [
+            "Thu Aug 14 14:30:31 +0000 2025",
+            "2025-08-14T16:07:32.837Z",
+            "Thu Aug 14 14:30:31 +0000 2025",
+            "garbage",
+            ["unhashable"],
+            "",
+        ]
+
+        parsed = parse_tweet_dates(values)
+
+        self.assertEqual(parsed[:3], [parse_tweet_date(value) for value in values[:3]])
+        self.assertIs(parsed[0], parsed[2])
+        # Unparseable values share a single now()
+        self.assertIs(parsed[3], parsed[4])
+        self.assertIs(parsed[3], parsed[5])
@@ -0,0 +1,168 @@
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from twitter.engagement import downsample_snapshots, engagement_series
+from twitter.ingestion import ingest_source_tweets
+from twitter.models import EngagementSnapshot
+from twitter.tests.factories import make_source_tweet, simple_tweet
+
+T0 = datetime(2025, 8, 14, 12, 0, tzinfo=dt_timezone.utc)
+
+
+def snapshot(tweet_id, minutes, likes, resolution=EngagementSnapshot.RESOLUTION_RAW):
+    """Create a snapshot ``minutes`` after T0."""
+    return EngagementSnapshot.objects.create(
+        source_tweet_id=str(tweet_id),
+        captured_at=T0 + timedelta(minutes=minutes),
+        resolution=resolution,
+        likes=likes,
+    )
+
+
+class SnapshotRecordingTests(TestCase):
+    def test_ingestion_appends_one_snapshot_per_tweet(self):
+        """Test new and duplicate tweets each get a snapshot, keeping the history."""
+        make_source_tweet(1, likes=1)
+
+        ingest_source_tweets([simple_tweet(1, Likes=5), simple_tweet(2, Likes=7)], "exec_s", "unknown")
+        ingest_source_tweets([simple_tweet(1, Likes=9)], "exec_t", "unknown")
+
+        self.assertEqual(
+            list(EngagementSnapshot.objects.filter(source_tweet_id="1").values_list('likes', flat=True)),
+            [5, 9]
+        )
+        self.assertEqual(EngagementSnapshot.objects.get(source_tweet_id="2").likes, 7)
+
+    @override_settings(N8N_ENGAGEMENT_SNAPSHOTS=False)
+    def test_snapshots_can_be_disabled(self):
+        """Test N8N_ENGAGEMENT_SNAPSHOTS=False skips the history table."""
+        ingest_source_tweets([simple_tweet(1)], "exec_s", "unknown")
+
+        self.assertFalse(EngagementSnapshot.objects.exists())
+
+    def test_snapshot_query_count_does_not_grow(self):
+        """Test snapshotting 5 or 50 tweets costs the same number of queries."""
+        def count(tweet_ids):
+            tweets = [simple_tweet(tweet_id) for tweet_id in tweet_ids]
+            with CaptureQueriesContext(connection) as ctx:
+                ingest_source_tweets(tweets, "exec_q", "unknown")
+            return len(ctx.captured_queries)
+
+        self.assertEqual(count(range(1, 6)), count(range(100, 150)))
+        self.assertEqual(EngagementSnapshot.objects.count(), 55)
+
+
+class DownsamplingTests(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        make_source_tweet(1)
+        make_source_tweet(2)
+
+    def test_raw_rows_fold_into_hourly_last_value(self):
+        """Test each hour keeps its last row and recent raw rows are untouched."""
+        snapshot(1, 5, likes=1)
+        snapshot(1, 50, likes=4)
+        snapshot(1, 70, likes=6)
+        snapshot(2, 10, likes=100)
+        recent = snapshot(1, 60 * 47, likes=50)
+
+        result = downsample_snapshots(now=T0 + timedelta(hours=50))
+
+        self.assertEqual(result['raw_folded'], 4)
+        self.assertEqual(result['hourly_created'], 3)
+        hourly = EngagementSnapshot.objects.filter(resolution=EngagementSnapshot.RESOLUTION_HOUR)
+        self.assertEqual(
+            sorted(hourly.values_list('source_tweet_id', 'captured_at', 'likes')),
+            [
+                ("1", T0 + timedelta(minutes=50), 4),
+                ("1", T0 + timedelta(minutes=70), 6),
+                ("2", T0 + timedelta(minutes=10), 100),
+            ]
+        )
+        self.assertTrue(EngagementSnapshot.objects.filter(pk=recent.pk).exists())
+
+    def test_hourly_rows_fold_into_daily(self):
+        """Test hourly rows past the hourly retention become one row per day."""
+        for hour, likes in ((1, 10), (5, 20), (30, 30)):
+            snapshot(1, 60 * hour, likes=likes, resolution=EngagementSnapshot.RESOLUTION_HOUR)
+
+        result = downsample_snapshots(now=T0 + timedelta(days=40))
+
+        self.assertEqual((result['hourly_folded'], result['daily_created']), (3, 2))
+        daily = EngagementSnapshot.objects.filter(resolution=EngagementSnapshot.RESOLUTION_DAY)
+        self.assertEqual(list(daily.values_list('likes', flat=True)), [20, 30])
+
+    def test_downsampling_is_idempotent(self):
+        """Test a second run over the same data changes nothing."""
+        snapshot(1, 5, likes=1)
+        now = T0 + timedelta(days=3)
+        downsample_snapshots(now=now)
+
+        self.assertEqual(downsample_snapshots(now=now)['hourly_created'], 0)
+        self.assertEqual(EngagementSnapshot.objects.count(), 1)
+
+    def test_management_command(self):
+        """Test the command runs with explicit retentions and both folds apply to old data."""
+        snapshot(1, 5, likes=1)
+
+        call_command('downsample_engagement', '--raw-hours', '0', stdout=StringIO())
+
+        self.assertEqual(EngagementSnapshot.objects.get().resolution, EngagementSnapshot.RESOLUTION_DAY)
+
+
+class EngagementSeriesTests(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        make_source_tweet(1)
+        make_source_tweet(2)
+        snapshot(1, 10, likes=1)
+        snapshot(1, 50, likes=3)
+        snapshot(1, 190, likes=8)
+        snapshot(2, 70, likes=40)
+
+    def test_series_are_aligned_and_forward_filled(self):
+        """Test every subject gets one value per bucket, carried over gaps."""
+        series = engagement_series(T0, T0 + timedelta(hours=4), tweet_ids=["1", "2"])
+
+        self.assertEqual(len(series['buckets']), 4)
+        self.assertEqual(series['tweets'], {"1": [3, 3, 3, 8], "2": [None, 40, 40, 40]})
+
+    def test_series_mixes_resolutions(self):
+        """Test downsampled history lines up with raw data."""
+        downsample_snapshots(now=T0 + timedelta(hours=50))
+
+        series = engagement_series(T0, T0 + timedelta(hours=4), tweet_ids=["1", "2"])
+
+        self.assertEqual(series['tweets'], {"1": [3, 3, 3, 8], "2": [None, 40, 40, 40]})
+
+    def test_invalid_arguments(self):
+        """Test unknown metrics, intervals and empty ranges are rejected."""
+        for kwargs in ({'metric': 'password'}, {'interval': 'minute'}):
+            with self.assertRaises(ValueError):
+                engagement_series(T0, T0 + timedelta(hours=1), **kwargs)
+        with self.assertRaises(ValueError):
+            engagement_series(T0, T0)
+
+    def test_endpoint(self):
+        """Test the JSON endpoint returns plot-ready series and rejects bad input."""
+        url = reverse('twitter:api_engagement_series')
+        params = {'tweet_ids': '1,2', 'start': T0.isoformat(), 'end': (T0 + timedelta(days=1)).isoformat()}
+
+        response = self.client.get(url, {**params, 'interval': 'day'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['buckets'], [T0.isoformat()])
+        self.assertEqual(response.data['tweets'], {"1": [8], "2": [40]})
+
+        response = self.client.get(url, {**params, 'metric': 'nope'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,68 @@
+import io
+import json
+
+from django.db.models import ProtectedError
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from twitter.models import Execution, SourceTweet
+from twitter.streaming import ingest_scrape_stream
+from twitter.tests.factories import make_source_tweet, simple_tweet
+
+
+class ExecutionRegistryTests(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.url = reverse('twitter:api_check_duplicate')
+        make_source_tweet(1)
+
+    def test_call_is_recorded_once(self):
+        """Test a duplicate check registers the execution with its counts and links the tweets."""
+        payload = {"execution_id": "exec_1", "source_url": "https://n8n.coophive.network",
+                   "tweets": [simple_tweet(1), simple_tweet(2), simple_tweet(3)]}
+
+        self.client.post(self.url, payload, format='json')
+
+        execution = Execution.objects.get(execution_id="exec_1")
+        self.assertEqual(
+            (execution.received_count, execution.new_count, execution.duplicate_count, execution.call_count),
+            (3, 2, 1, 1)
+        )
+        self.assertEqual(execution.source_url, "https://n8n.coophive.network")
+        self.assertIsNotNone(execution.last_call_at)
+        self.assertEqual(sorted(execution.tweets.values_list('tweet_id', flat=True)), ["2", "3"])
+        self.assertEqual(SourceTweet.objects.get(tweet_id="2").execution, execution)
+
+    def test_batched_call_accumulates_per_execution(self):
+        """Test every execution of a batch is recorded and repeats in one call count one call."""
+        payload = [
+            {"execution_id": "exec_a", "source_url": "u", "tweets": [simple_tweet(10)]},
+            {"execution_id": "exec_b", "source_url": "u", "tweets": [simple_tweet(11), simple_tweet(10)]},
+            {"execution_id": "exec_a", "source_url": "u", "tweets": [simple_tweet(12)]},
+        ]
+
+        self.client.post(self.url, payload, format='json')
+        self.client.post(self.url, payload[1], format='json')
+
+        counts = {
+            e.execution_id: (e.received_count, e.new_count, e.duplicate_count, e.call_count)
+            for e in Execution.objects.filter(execution_id__in=["exec_a", "exec_b"])
+        }
+        self.assertEqual(counts, {"exec_a": (2, 2, 0, 1), "exec_b": (4, 1, 3, 2)})
+
+    def test_streamed_call_counts_once(self):
+        """Test a stream ingested in several chunks still records one call."""
+        body = json.dumps({"tweets": [simple_tweet(i) for i in range(20, 25)], "execution_id": "exec_s"})
+
+        ingest_scrape_stream(io.BytesIO(body.encode()), chunk_size=2)
+
+        execution = Execution.objects.get(execution_id="exec_s")
+        self.assertEqual((execution.received_count, execution.new_count, execution.call_count), (5, 5, 1))
+        self.assertEqual(execution.tweets.count(), 5)
+
+    def test_executions_with_tweets_are_protected(self):
+        """Test an execution cannot be deleted out from under its tweets."""
+        with self.assertRaises(ProtectedError):
+            Execution.objects.get(execution_id="exec_existing").delete()
@@ -0,0 +1,190 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from twitter.export_jobs import parse_range, purge_expired_exports, run_export_job
+from twitter.models import CampaignBatch, ExportJob, GeneratedTweet
+from twitter.tests.factories import make_source_tweet
+
+
+class ParseRangeTests(TestCase):
+    def test_ranges(self):
+        """Test single byte ranges, suffixes, clamping and ignored headers."""
+        self.assertEqual(parse_range('bytes=0-9', 100), (0, 9))
+        self.assertEqual(parse_range('bytes=90-', 100), (90, 99))
+        self.assertEqual(parse_range('bytes=-10', 100), (90, 99))
+        self.assertEqual(parse_range('bytes=50-500', 100), (50, 99))
+        for ignored in (None, '', 'bytes=0-1,5-6', 'items=0-9', 'bytes=-', 'bytes=9-3'):
+            self.assertIsNone(parse_range(ignored, 100))
+        for unsatisfiable in ('bytes=100-', 'bytes=-0'):
+            with self.assertRaises(ValueError):
+                parse_range(unsatisfiable, 100)
+
+
+class ExportJobTests(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        settings_override = override_settings(
+            EXPORT_JOBS_ROOT=self.root, CELERY_TASK_ALWAYS_EAGER=False
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        for i in range(5):
+            make_source_tweet(i, likes=i * 10, content=f"Stored tweet {i} " + "x" * 200)
+        self.user = get_user_model().objects.create_user(username='exporter', password='pw')
+        self.client.force_login(self.user)
+
+    def queue(self, **data):
+        # The worker's side of the queue: run the job once the view's transaction commits
+        with patch('twitter.views.process_export_job.delay', side_effect=run_export_job), \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('twitter:export_jobs'), data)
+        self.assertEqual(response.status_code, 202)
+        return response
+
+    def download(self, job_id, **headers):
+        url = reverse('twitter:export_job_download', args=[job_id])
+        response = self.client.get(url, headers=headers)
+        if response.streaming:
+            return response, b''.join(response.streaming_content)
+        return response, response.content
+
+    def test_job_writes_filtered_export(self):
+        """Test a queued job applies the page filters and reports completion."""
+        response = self.queue(min_likes='20', sort_by='-likes')
+
+        status = self.client.get(response['Location']).json()
+        self.assertEqual(status['status'], 'completed')
+        self.assertEqual(
+            (status['rows_written'], status['total_rows'], status['progress']), (3, 3, 100)
+        )
+
+        download, body = self.download(status['job_id'])
+        self.assertEqual(download.status_code, 200)
+        self.assertEqual(download['Accept-Ranges'], 'bytes')
+        self.assertTrue(download['Content-Disposition'].endswith('.csv.gz"'))
+        rows = gzip.decompress(body).decode().splitlines()
+        self.assertEqual([row.split(',')[0] for row in rows[1:]], ['4', '3', '2'])
+        self.assertEqual(os.listdir(self.root), [f"{status['job_id']}.csv.gz"])
+
+    def test_range_requests_resume(self):
+        """Test a download resumed with Range reassembles the whole file."""
+        job_id = self.queue().json()['job_id']
+        _, whole = self.download(job_id)
+
+        first, head = self.download(job_id, Range='bytes=0-99')
+        etag = first['ETag']
+        rest, tail = self.download(job_id, Range='bytes=100-', If_Range=etag)
+
+        self.assertEqual((first.status_code, rest.status_code), (206, 206))
+        self.assertEqual(first['Content-Range'], f"bytes 0-99/{len(whole)}")
+        self.assertEqual(head + tail, whole)
+        stale, body = self.download(job_id, Range='bytes=100-', If_Range='"other"')
+        self.assertEqual((stale.status_code, body), (200, whole))
+        beyond, _ = self.download(job_id, Range=f'bytes={len(whole)}-')
+        self.assertEqual(
+            (beyond.status_code, beyond['Content-Range']), (416, f"bytes */{len(whole)}")
+        )
+
+    def test_campaign_batch_ndjson(self):
+        """Test generated tweets of one batch export as NDJSON."""
+        batch = CampaignBatch.objects.create(
+            batch_id="batch_1", analysis_summary={}, total_tweets=1, ready_for_deployment=1,
+            title="Batch", description="",
+        )
+        GeneratedTweet.objects.create(
+            campaign_batch=batch, tweet_id="t1", type="generated", content="Hi",
+            character_count=2, engagement_hook="", coophive_elements=[],
+            discord_voice_patterns=[], theme_connection="", ready_for_deployment=True,
+        )
+
+        response = self.queue(kind='campaign_batch', batch_id='batch_1', format='ndjson')
+        job_id = response.json()['job_id']
+
+        download, body = self.download(job_id)
+        self.assertIn('campaign_batch_1_', download['Content-Disposition'])
+        record = json.loads(gzip.decompress(body))
+        self.assertEqual(
+            (record['batch_id'], record['tweet_id'], record['published_at']),
+            ('batch_1', 't1', None),
+        )
+
+    def test_invalid_requests(self):
+        """Test unknown formats, kinds and batches are rejected."""
+        url = reverse('twitter:export_jobs')
+        self.assertEqual(self.client.post(url, {'format': 'xlsx'}).status_code, 400)
+        self.assertEqual(self.client.post(url, {'kind': 'everything'}).status_code, 400)
+        missing_batch = {'kind': 'campaign_batch', 'batch_id': 'nope'}
+        self.assertEqual(self.client.post(url, missing_batch).status_code, 404)
+        self.assertFalse(ExportJob.objects.exists())
+
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+    def test_refused_without_worker(self):
+        """Test exports are not run inside the request when tasks would run eagerly."""
+        response = self.client.post(reverse('twitter:export_jobs'))
+
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(ExportJob.objects.exists())
+
+    def test_jobs_are_private_and_downloads_wait(self):
+        """Test other users cannot see a job and unfinished jobs cannot be downloaded."""
+        job = ExportJob.objects.create(
+            kind='source_tweets',
+            created_by=self.user,
+            expires_at=timezone.now() + timedelta(hours=1),
+        )
+
+        pending, _ = self.download(job.job_id)
+        self.assertEqual(pending.status_code, 409)
+        other = get_user_model().objects.create_user(username='other', password='pw')
+        self.client.force_login(other)
+        status_url = reverse('twitter:export_job_status', args=[job.job_id])
+        self.assertEqual(self.client.get(status_url).status_code, 404)
+
+    def test_failed_job(self):
+        """Test a failing export is marked failed and leaves no partial file."""
+        with patch('twitter.export_jobs.gzip_chunks', side_effect=RuntimeError("disk full")):
+            response = self.queue()
+
+        status = self.client.get(response['Location']).json()
+        self.assertEqual(
+            (status['status'], status['error'], status['download_url']),
+            ('failed', 'disk full', None),
+        )
+        self.assertEqual(os.listdir(self.root), [])
+
+    def test_sweeper(self):
+        """Test expired jobs, their files and stale stray files are removed."""
+        kept = self.queue().json()['job_id']
+        expired = self.queue().json()['job_id']
+        ExportJob.objects.filter(job_id=expired).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        stray = os.path.join(self.root, 'killed-worker.csv.gz.part')
+        with open(stray, 'wb'):
+            pass
+        os.utime(stray, (time.time() - 2 * 24 * 3600,) * 2)
+
+        out = StringIO()
+        call_command('purge_export_jobs', stdout=out)
+
+        self.assertIn("Deleted 1 expired export jobs and 2 files", out.getvalue())
+        self.assertEqual(os.listdir(self.root), [f"{kept}.csv.gz"])
+        self.assertEqual(purge_expired_exports(), (0, 0))
+        gone, _ = self.download(expired)
+        self.assertEqual(gone.status_code, 404)
@@ -0,0 +1,147 @@
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from twitter.exports import iter_csv
+from twitter.models import SourceTweet
+from twitter.result_cache import bump_ingestion_generation
+from twitter.tests.factories import make_source_tweet
+from twitter.views import ScrapedTweetsView
+
+
+class StreamingCSVExportTests(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        for i in range(5):
+            make_source_tweet(
+                i, likes=i, content=f'Tweet {i}, with "quotes"',
+                date=datetime(2025, 8, 14, 14, 30, i, tzinfo=dt_timezone.utc),
+            )
+        user = get_user_model().objects.create_user(username='exporter', password='pw')
+        self.client.force_login(user)
+
+    def test_export_streams_csv(self):
+        """Test the export is a streamed CSV with the original columns and formatting."""
+        response = self.client.get(reverse('twitter:export_tweets'))
+
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertTrue(
+            response['Content-Disposition'].startswith('attachment; filename="scraped_tweets_')
+        )
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(rows[0], [
+            'Tweet ID', 'Content', 'URL', 'Likes', 'Retweets', 'Replies', 'Quotes', 'Views', 'Date',
+            'Execution ID', 'Status',
+        ])
+        self.assertEqual(rows[1], [
+            '4', 'Tweet 4, with "quotes"', 'https://x.com/coophive/status/4',
+            '4', '0', '0', '0', '0', '2025-08-14 14:30:04', 'exec_existing', 'success',
+        ])
+        self.assertEqual([row[0] for row in rows[1:]], ['4', '3', '2', '1', '0'])
+
+    def test_export_filters_by_execution(self):
+        """Test the execution filter still applies."""
+        make_source_tweet(9, execution_id='exec_other')
+
+        response = self.client.get(reverse('twitter:export_tweets'), {'execution_id': 'exec_other'})
+
+        rows = b''.join(response.streaming_content).decode().strip().splitlines()
+        self.assertEqual(len(rows), 2)
+        self.assertTrue(rows[1].startswith('9,'))
+
+    def test_header_before_query_then_chunks(self):
+        """Test the header is yielded before any query and rows come in chunk-sized pieces."""
+        chunks = iter_csv(SourceTweet.objects.order_by('id'), chunk_size=2)
+
+        with CaptureQueriesContext(connection) as ctx:
+            header = next(chunks)
+        self.assertTrue(header.startswith('Tweet ID,'))
+        self.assertEqual(ctx.captured_queries, [])
+
+        self.assertEqual([chunk.count('\r\n') for chunk in chunks], [2, 2, 1])
+
+    def test_reads_values_not_instances(self):
+        """Test only the exported columns are selected."""
+        chunks = iter_csv(SourceTweet.objects.all())
+        next(chunks)
+
+        with CaptureQueriesContext(connection) as ctx:
+            list(chunks)
+
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertNotIn('processed_at', ctx.captured_queries[0]['sql'])
+
+
+class FilteredExportTests(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        for i in range(6):
+            make_source_tweet(
+                i, likes=i * 10, status='error' if i == 5 else 'success',
+                execution_id='exec_a' if i % 2 else 'exec_b',
+                date=datetime(2025, 8, 10 + i, 12, 0, tzinfo=dt_timezone.utc),
+            )
+        bump_ingestion_generation()  # rows created here bypass ingestion
+        user = get_user_model().objects.create_user(username='analyst', password='pw')
+        self.client.force_login(user)
+        self.url = reverse('twitter:export_tweets')
+
+    def export_ids(self, params):
+        response = self.client.get(self.url, params)
+        body = b''.join(response.streaming_content).decode()
+        return [row[0] for row in csv.reader(io.StringIO(body))][1:]
+
+    def test_export_matches_browser_filters(self):
+        """Test the export holds exactly the tweets the page shows, in the same order."""
+        params = {
+            'min_likes': '10', 'status_filter': 'success', 'execution_id': 'exec_a',
+            'date_from': '2025-08-11', 'date_to': '2025-08-14', 'sort_by': '-likes',
+        }
+
+        page = self.client.get(reverse('twitter:scraped_tweets'), params)
+
+        self.assertEqual(self.export_ids(params), [t.tweet_id for t in page.context['tweets']])
+        self.assertEqual(self.export_ids(params), ['3', '1'])
+
+    def test_page_export(self):
+        """Test type=page exports only the rows of the current keyset page."""
+        with patch.object(ScrapedTweetsView, 'paginate_by', 2):
+            first = self.client.get(reverse('twitter:scraped_tweets'), {'sort_by': '-likes'})
+            cursor = first.context['tweets'].next_cursor
+
+            self.assertEqual(self.export_ids({'sort_by': '-likes', 'type': 'page'}), ['5', '4'])
+            next_page = {'sort_by': '-likes', 'type': 'page', 'cursor': cursor}
+            self.assertEqual(self.export_ids(next_page), ['3', '2'])
+        self.assertEqual(len(self.export_ids({'sort_by': '-likes', 'type': 'all'})), 6)
+
+    def test_ndjson_gzip(self):
+        """Test NDJSON exports stream one object per line, gzipped on request."""
+        response = self.client.get(
+            self.url, {'format': 'ndjson', 'gzip': '1', 'status_filter': 'error'}
+        )
+
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertTrue(response['Content-Disposition'].endswith('.ndjson.gz"'))
+        lines = gzip.decompress(b''.join(response.streaming_content)).decode().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], [{
+            'tweet_id': '5', 'content': 'Stored tweet 5', 'url': 'https://x.com/coophive/status/5',
+            'likes': 50, 'retweets': 0, 'replies': 0, 'quotes': 0, 'views': 0,
+            'date': '2025-08-15T12:00:00+00:00', 'execution_id': 'exec_a', 'status': 'error',
+        }])
+
+    def test_unknown_format(self):
+        """Test an unsupported format is rejected."""
+        response = self.client.get(self.url, {'format': 'xlsx'})
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,42 @@
+from django.http import QueryDict
+from django.test import TestCase
+
+from twitter.filters import TweetFilterSpec
+from twitter.tests.factories import make_source_tweet
+
+
+class TweetFilterSpecTests(TestCase):
+    def test_invalid_values_are_dropped(self):
+        """Test malformed dates, thresholds, flags and sorts are ignored."""
+        spec = TweetFilterSpec.from_params(QueryDict(
+            'date_from=yesterday&date_to=2025-13-01&min_likes=ten&processed_filter=maybe'
+            '&sort_by=-content&status_filter=+error+&min_views=5'
+        ))
+
+        self.assertEqual(spec.params, {'status_filter': 'error', 'min_views': '5'})
+        self.assertEqual(spec.sort_by, '-date')
+
+    def test_search_defaults_to_relevance(self):
+        """Test searches sort by rank unless another sort is given, and rank needs a search."""
+        searched = TweetFilterSpec.from_params({'search_content': 'compute'})
+        self.assertEqual(searched.sort_by, '-search_rank')
+        self.assertEqual(TweetFilterSpec.from_params({'sort_by': '-search_rank'}).sort_by, '-date')
+
+    def test_date_to_includes_the_whole_day(self):
+        """Test date_to keeps tweets from late on that day."""
+        make_source_tweet(1, date='2025-08-14T23:30:00Z')
+        make_source_tweet(2, date='2025-08-15T00:30:00Z')
+
+        spec = TweetFilterSpec.from_params({'date_from': '2025-08-14', 'date_to': '2025-08-14'})
+
+        self.assertEqual(list(spec.apply().values_list('tweet_id', flat=True)), ['1'])
+
+    def test_querystring_round_trips(self):
+        """Test the export link rebuilds the same spec."""
+        spec = TweetFilterSpec.from_params(
+            {'tweet_id_search': '195', 'processed_filter': 'false', 'sort_by': 'date'}
+        )
+
+        again = TweetFilterSpec.from_params(QueryDict(spec.querystring(type='all')))
+
+        self.assertEqual((again.params, again.sort_by), (spec.params, spec.sort_by))
@@ -0,0 +1,116 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from twitter.models import GeneratedTweet, IdempotencyRecord, IngestionJob, SourceTweet
+from twitter.tests.factories import detailed_tweet, simple_tweet
+
+
+class IdempotentReplayTests(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.url = reverse('twitter:api_check_duplicate')
+        self.payload = {"execution_id": "exec_retry", "tweets": [simple_tweet(1), simple_tweet(2)]}
+
+    def test_retry_replays_first_response(self):
+        """Test a retried execution gets the original response instead of '0 new tweets'."""
+        first = self.client.post(self.url, self.payload, format='json')
+
+        with self.assertNumQueries(1):
+            retry = self.client.post(self.url, self.payload, format='json')
+
+        self.assertEqual(retry.status_code, status.HTTP_200_OK)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry.data['summary']['saved_to_database'], 2)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(SourceTweet.objects.count(), 2)
+
+    def test_idempotency_key_header_takes_precedence(self):
+        """Test the Idempotency-Key header keys the replay instead of the execution id."""
+        self.client.post(self.url, self.payload, format='json', HTTP_IDEMPOTENCY_KEY='n8n-run-7')
+
+        retry = self.client.post(
+            self.url, self.payload, format='json', HTTP_IDEMPOTENCY_KEY='n8n-run-7'
+        )
+
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(IdempotencyRecord.objects.get().key, "header:n8n-run-7")
+
+    def test_idempotency_key_reused_with_other_payload(self):
+        """Test a header key reused with a different payload is rejected, not replayed."""
+        self.client.post(self.url, self.payload, format='json', HTTP_IDEMPOTENCY_KEY='n8n-run-7')
+        other = {"execution_id": "exec_other", "tweets": [simple_tweet(3)]}
+
+        response = self.client.post(
+            self.url, other, format='json', HTTP_IDEMPOTENCY_KEY='n8n-run-7'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertFalse(SourceTweet.objects.filter(tweet_id="3").exists())
+
+    def test_later_calls_of_an_execution_are_ingested(self):
+        """Test another payload under the same execution id is ingested, then replayed."""
+        self.client.post(self.url, self.payload, format='json')
+        chunk = {"execution_id": "exec_retry", "tweets": [simple_tweet(3)]}
+
+        second = self.client.post(self.url, chunk, format='json')
+        retry = self.client.post(self.url, chunk, format='json')
+
+        self.assertNotIn('Idempotent-Replayed', second)
+        self.assertEqual(second.data['summary']['saved_to_database'], 1)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.data, second.data)
+        self.assertEqual(SourceTweet.objects.count(), 3)
+        self.assertEqual(IdempotencyRecord.objects.count(), 1)
+
+    def test_expired_record_is_evicted_and_reprocessed(self):
+        """Test records past their TTL are not replayed and are purged on the next store."""
+        IdempotencyRecord.objects.create(
+            endpoint=IngestionJob.KIND_CHECK_DUPLICATE,
+            key="execution:exec_retry",
+            response_data={"stale": True},
+            response_status=200,
+            expires_at=timezone.now() - timedelta(seconds=1),
+        )
+
+        response = self.client.post(self.url, self.payload, format='json')
+
+        self.assertNotIn('stale', response.data)
+        self.assertEqual(response.data['summary']['saved_to_database'], 2)
+        self.assertEqual(IdempotencyRecord.objects.get().response_data, response.data)
+
+    def test_payload_without_execution_id_is_not_cached(self):
+        """Test payloads falling back to default ids always run."""
+        payload = {"data": {"tweets": [detailed_tweet(1)]}}  # defaults to exec_unknown
+
+        self.client.post(self.url, payload, format='json')
+        retry = self.client.post(self.url, payload, format='json')
+
+        self.assertEqual(retry.data['summary']['duplicates_found'], 1)
+        self.assertFalse(IdempotencyRecord.objects.exists())
+
+    @override_settings(N8N_IDEMPOTENCY_TTL=0)
+    def test_zero_ttl_disables_replay(self):
+        """Test N8N_IDEMPOTENCY_TTL=0 turns the replay cache off."""
+        self.client.post(self.url, self.payload, format='json')
+        retry = self.client.post(self.url, self.payload, format='json')
+
+        self.assertEqual(retry.data['summary']['duplicates_found'], 2)
+        self.assertFalse(IdempotencyRecord.objects.exists())
+
+    def test_receive_tweets_replays_with_header(self):
+        """Test receive-tweets replays by Idempotency-Key and keeps accumulating without it."""
+        url = reverse('twitter:api_receive_tweets')
+        batch = {"campaign_batch": "batch_r", "tweets": [{"id": "r-1", "content": "Hello"}]}
+
+        self.client.post(url, batch, format='json', HTTP_IDEMPOTENCY_KEY='gen-1')
+        retry = self.client.post(url, batch, format='json', HTTP_IDEMPOTENCY_KEY='gen-1')
+
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.data['message'], "Received 1 tweets (saved to database)")
+        self.assertEqual(GeneratedTweet.objects.count(), 1)
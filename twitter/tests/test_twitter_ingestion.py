@@ -0,0 +1,362 @@
+import threading
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from unittest import mock
+
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from twitter.ingestion import ingest_source_tweets
+from twitter.models import CampaignBatch, GeneratedTweet, SourceTweet
+from twitter.tests.factories import detailed_tweet, make_source_tweet, simple_tweet
+
+
+class CheckDuplicateTweetAPITests(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.url = reverse('twitter:api_check_duplicate')
+
+    def test_simple_payload_stores_new_tweets(self):
+        """Test that new tweets are stored and echoed back unchanged."""
+        tweets = [simple_tweet(1), simple_tweet(2)]
+        payload = [{"execution_id": "exec_1", "source_url": "https://n8n.coophive.network", "tweets": tweets}]
+
+        response = self.client.post(self.url, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['new_tweets'], tweets)
+        self.assertEqual(response.data['data']['execution_id'], "exec_1")
+        self.assertEqual(response.data['summary']['saved_to_database'], 2)
+        self.assertEqual(
+            response.data['message'],
+            "✅ Success: All 2 tweets are new and have been saved to database"
+        )
+        stored = SourceTweet.objects.get(tweet_id="1")
+        self.assertEqual(stored.likes, 1)
+        self.assertEqual(stored.views, 500)
+        self.assertEqual(stored.execution_id, "exec_1")
+        self.assertEqual(stored.date, datetime(2025, 8, 14, 14, 30, 31, tzinfo=dt_timezone.utc))
+
+    def test_detailed_payload_is_normalized(self):
+        """Test the nested data.tweets format with detailed field names."""
+        payload = {"msg": "run42", "data": {"tweets": [detailed_tweet(10)]}}
+
+        response = self.client.post(self.url, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['execution_id'], "exec_run42")
+        self.assertEqual(response.data['data']['source_url'], "api_detailed")
+        stored = SourceTweet.objects.get(tweet_id="10")
+        self.assertEqual(stored.content, "Detailed tweet 10")
+        self.assertEqual(stored.quotes, 8)
+
+    def test_duplicates_are_counted_and_skipped(self):
+        """Test stored and repeated IDs are reported as duplicates."""
+        make_source_tweet(1)
+        payload = {"execution_id": "exec_2", "tweets": [simple_tweet(1), simple_tweet(2), simple_tweet(2)]}
+
+        response = self.client.post(self.url, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['summary']['duplicates_found'], 2)
+        self.assertEqual(response.data['summary']['new_tweets_found'], 1)
+        self.assertEqual(response.data['summary']['total_processed'], 3)
+        self.assertEqual(
+            response.data['message'],
+            "✅ Success: 1 new tweets saved, 2 duplicates found"
+        )
+        self.assertEqual(SourceTweet.objects.count(), 2)
+
+    def test_tweets_without_id_are_ignored(self):
+        """Test records missing an ID are neither stored nor counted as duplicates."""
+        payload = {"execution_id": "exec_3", "tweets": [simple_tweet(""), simple_tweet(3)]}
+
+        response = self.client.post(self.url, payload, format='json')
+
+        self.assertEqual(response.data['summary']['new_tweets_found'], 1)
+        self.assertEqual(response.data['summary']['duplicates_found'], 0)
+        self.assertEqual(response.data['summary']['total_processed'], 2)
+
+    def test_array_payload_processes_every_execution(self):
+        """Test every element of an n8n array is stored and summarized."""
+        make_source_tweet(1)
+        payload = [
+            {"execution_id": "exec_a", "tweets": [simple_tweet(1), simple_tweet(2)]},
+            {"execution_id": "exec_b", "tweets": [simple_tweet(2), simple_tweet(3)]},
+            {"msg": "c", "data": {"tweets": [detailed_tweet(4)]}},
+        ]
+
+        response = self.client.post(self.url, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['results']
+        self.assertEqual([r['data']['execution_id'] for r in results], ["exec_a", "exec_b", "exec_c"])
+        self.assertEqual([r['summary']['new_tweets_found'] for r in results], [1, 1, 1])
+        self.assertEqual([r['summary']['duplicates_found'] for r in results], [1, 1, 0])
+        self.assertEqual(response.data['summary']['executions_processed'], 3)
+        self.assertEqual(response.data['summary']['saved_to_database'], 3)
+        self.assertEqual(SourceTweet.objects.get(tweet_id="3").execution_id, "exec_b")
+
+
+class ReceiveTweetsAPITests(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.url = reverse('twitter:api_receive_tweets')
+
+    def _batch(self, batch_id, count):
+        return {
+            "campaign_batch": batch_id,
+            "analysis_summary": {"brand_alignment_score": 8},
+            "tweet_count": count,
+            "tweets": [
+                {"id": f"{batch_id}-tweet-{i}", "type": "scientific_compute", "content": f"Tweet {i}"}
+                for i in range(1, count + 1)
+            ],
+        }
+
+    def test_single_batch_keeps_legacy_response(self):
+        """Test a one-element array gets the response n8n expects today."""
+        response = self.client.post(self.url, [self._batch("batch_1", 3)], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            "campaign_batch": "batch_1",
+            "message": "Received 3 tweets (saved to database)",
+            "status": "success",
+        })
+        self.assertEqual(GeneratedTweet.objects.filter(campaign_batch__batch_id="batch_1").count(), 3)
+
+    def test_array_payload_stores_every_batch(self):
+        """Test every campaign batch of an array is stored, skipping known tweets."""
+        self.client.post(self.url, self._batch("batch_1", 2), format='json')
+
+        response = self.client.post(
+            self.url, [self._batch("batch_1", 3), self._batch("batch_2", 2)], format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([r['message'] for r in response.data['results']], [
+            "Received 1 tweets (saved to database)",
+            "Received 2 tweets (saved to database)",
+        ])
+        self.assertEqual(CampaignBatch.objects.count(), 2)
+        self.assertEqual(GeneratedTweet.objects.count(), 5)
+
+    def test_existing_batch_header_is_updated(self):
+        """Test a re-sent batch refreshes its analysis header but keeps review fields and token."""
+        self.client.post(self.url, self._batch("batch_1", 2), format='json')
+        CampaignBatch.objects.filter(batch_id="batch_1").update(status="Reviewed", title="Edited title")
+        token = CampaignBatch.objects.get(batch_id="batch_1").secure_token
+
+        resent = self._batch("batch_1", 3)
+        resent["analysis_summary"] = {"brand_alignment_score": 9.5}
+        self.client.post(self.url, resent, format='json')
+
+        batch = CampaignBatch.objects.get(batch_id="batch_1")
+        self.assertEqual(batch.analysis_summary, {"brand_alignment_score": 9.5})
+        self.assertEqual((batch.total_tweets, batch.brand_alignment_score), (3, 9.5))
+        self.assertEqual((batch.status, batch.title, batch.secure_token), ("Reviewed", "Edited title", token))
+        self.assertTrue(token)
+
+    def test_repeated_batch_in_one_payload(self):
+        """Test a batch_id sent twice in one array stores each tweet once."""
+        response = self.client.post(
+            self.url, [self._batch("batch_1", 2), self._batch("batch_1", 3)], format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([r['message'] for r in response.data['results']], [
+            "Received 2 tweets (saved to database)",
+            "Received 1 tweets (saved to database)",
+        ])
+        self.assertEqual(GeneratedTweet.objects.count(), 3)
+        self.assertEqual(CampaignBatch.objects.get().total_tweets, 3)
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        """Test storing 3 or 60 generated tweets costs the same number of queries."""
+        def count(batch_id, size):
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.post(self.url, self._batch(batch_id, size), format='json')
+            return len(ctx.captured_queries)
+
+        self.assertEqual(count("batch_small", 3), count("batch_large", 60))
+        self.assertEqual(GeneratedTweet.objects.count(), 63)
+
+    def test_tweet_ids_are_unique_per_batch(self):
+        """Test the database rejects a second copy of a tweet in the same batch."""
+        self.client.post(self.url, self._batch("batch_1", 1), format='json')
+        tweet = GeneratedTweet.objects.get()
+        tweet.pk = None
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            tweet.save()
+
+
+class SetBasedIngestionTests(TestCase):
+    def _count_queries(self, tweet_ids):
+        tweets = [simple_tweet(tweet_id) for tweet_id in tweet_ids]
+        with CaptureQueriesContext(connection) as ctx:
+            ingest_source_tweets(tweets, "exec_q", "unknown")
+        return len(ctx.captured_queries)
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        """Test ingestion issues the same number of queries for small and large batches."""
+        make_source_tweet(5)
+        # Both batches fit in one INSERT even under SQLite's bound-parameter limit
+        small = self._count_queries(range(1, 6))
+        large = self._count_queries(range(100, 150))
+
+        self.assertEqual(small, large)
+        self.assertEqual(SourceTweet.objects.count(), 55)
+
+    @mock.patch('twitter.ingestion.supports_insert_returning', return_value=False)
+    def test_fallback_path_without_returning(self, _supports):
+        """Test the lookup + bulk_create path used by backends without RETURNING."""
+        make_source_tweet(1)
+        tweets = [simple_tweet(1), simple_tweet(2), simple_tweet(2)]
+
+        new_tweets, duplicates_found = ingest_source_tweets(tweets, "exec_f", "unknown")
+
+        self.assertEqual(new_tweets, [simple_tweet(2)])
+        self.assertEqual(duplicates_found, 2)
+        self.assertTrue(SourceTweet.objects.filter(tweet_id="2", execution_id="exec_f").exists())
+
+    def test_rows_are_written_in_tweet_id_order(self):
+        """Test rows are inserted in key order while the response keeps payload order."""
+        tweets = [simple_tweet(tweet_id) for tweet_id in (3, 1, 2)]
+
+        new_tweets, _ = ingest_source_tweets(tweets, "exec_o", "unknown")
+
+        self.assertEqual(new_tweets, tweets)
+        stored = SourceTweet.objects.order_by('pk').values_list('tweet_id', flat=True)
+        self.assertEqual(list(stored), ['1', '2', '3'])
+
+
+class EngagementRefreshTests(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.url = reverse('twitter:api_check_duplicate') + '?refresh=true'
+        make_source_tweet(1, likes=1, retweets=2, replies=3, quotes=4, views=500)
+        make_source_tweet(2, likes=10, views=100)
+
+    def test_refresh_updates_changed_counters_only(self):
+        """Test re-scraped duplicates get their latest counters and unchanged rows are skipped."""
+        payload = {"execution_id": "exec_r", "tweets": [
+            simple_tweet(1),  # same counters as stored
+            simple_tweet(2, Likes=25, Views=4000),
+            simple_tweet(3),
+        ]}
+
+        response = self.client.post(self.url, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['summary']['engagement_refreshed'], 1)
+        self.assertEqual(response.data['summary']['duplicates_found'], 2)
+        refreshed = SourceTweet.objects.get(tweet_id="2")
+        self.assertEqual((refreshed.likes, refreshed.views), (25, 4000))
+        self.assertEqual(refreshed.total_engagement, 25 + 2 + 3 + 4)  # Stored column follows the counters
+        # Only the counters change; the original execution keeps ownership
+        self.assertEqual(refreshed.execution_id, "exec_existing")
+
+    def test_default_mode_keeps_stored_counters(self):
+        """Test duplicates are left alone and the response is unchanged without refresh."""
+        payload = {"execution_id": "exec_r", "tweets": [simple_tweet(2, Likes=25)]}
+
+        response = self.client.post(reverse('twitter:api_check_duplicate'), payload, format='json')
+
+        self.assertNotIn('engagement_refreshed', response.data['summary'])
+        self.assertEqual(SourceTweet.objects.get(tweet_id="2").likes, 10)
+
+    def test_latest_occurrence_in_payload_wins(self):
+        """Test a tweet repeated across executions ends with the last counters sent."""
+        payload = [
+            {"execution_id": "exec_a", "tweets": [simple_tweet(5, Likes=1), simple_tweet(2, Likes=11)]},
+            {"execution_id": "exec_b", "tweets": [simple_tweet(5, Likes=7), simple_tweet(2, Likes=12)]},
+        ]
+
+        response = self.client.post(self.url, payload, format='json')
+
+        self.assertEqual(SourceTweet.objects.get(tweet_id="5").likes, 7)
+        self.assertEqual(SourceTweet.objects.get(tweet_id="2").likes, 12)
+        self.assertEqual([r['summary']['engagement_refreshed'] for r in response.data['results']], [0, 2])
+
+    def test_refresh_query_count_does_not_grow(self):
+        """Test refreshing 5 or 50 duplicates costs the same number of queries."""
+        for tweet_id in range(100, 150):
+            make_source_tweet(tweet_id)
+
+        def count(tweet_ids):
+            tweets = [simple_tweet(tweet_id, Likes=99) for tweet_id in tweet_ids]
+            with CaptureQueriesContext(connection) as ctx:
+                ingest_source_tweets(tweets, "exec_q", "unknown", refresh_engagement=True)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(count(range(100, 105)), count(range(105, 150)))
+        self.assertEqual(SourceTweet.objects.filter(likes=99).count(), 50)
+
+    def test_async_job_keeps_refresh_option(self):
+        """Test ?async=true&refresh=true refreshes when the job runs."""
+        payload = {"execution_id": "exec_async", "tweets": [simple_tweet(2, Likes=30)]}
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url + '&async=true', payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(SourceTweet.objects.get(tweet_id="2").likes, 30)
+
+
+class ConcurrentIngestionTests(TransactionTestCase):
+    def test_overlapping_batches_from_many_threads(self):
+        """Test overlapping n8n executions never fail and store each tweet exactly once."""
+        # Every batch shares half of its IDs with its neighbour
+        self._post_concurrently([
+            [simple_tweet(tweet_id) for tweet_id in range(worker * 25, worker * 25 + 50)]
+            for worker in range(8)
+        ])
+
+    def test_overlapping_batches_in_opposite_orders(self):
+        """Test executions meeting the same IDs in opposite orders do not deadlock."""
+        batches = []
+        for worker in range(8):
+            # Overlapping ranges, every other one sent in descending order
+            tweet_ids = range(worker * 50, worker * 50 + 100)
+            ordered = reversed(tweet_ids) if worker % 2 else tweet_ids
+            batches.append([simple_tweet(tweet_id) for tweet_id in ordered])
+        self._post_concurrently(batches)
+
+    def _post_concurrently(self, batches):
+        workers = len(batches)
+        url = reverse('twitter:api_check_duplicate')
+        barrier = threading.Barrier(workers)
+        responses = []
+
+        def post_batch(index):
+            try:
+                barrier.wait()
+                response = APIClient().post(
+                    url, {"execution_id": f"exec_{index}", "tweets": batches[index]}, format='json'
+                )
+                responses.append(response)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=post_batch, args=(i,)) for i in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(responses), workers)
+        self.assertTrue(all(r.status_code == status.HTTP_200_OK for r in responses))
+        unique_ids = {tweet["Tweet ID"] for batch in batches for tweet in batch}
+        self.assertEqual(SourceTweet.objects.count(), len(unique_ids))
+        # Each ID is reported as new by exactly one execution
+        reported_new = [t["Tweet ID"] for r in responses for t in r.data['data']['new_tweets']]
+        self.assertCountEqual(reported_new, unique_ids)
@@ -0,0 +1,100 @@
+from django.test import SimpleTestCase
+
+from twitter import normalizers
+from twitter.normalizers import (
+    TweetSchema,
+    detect_schema,
+    normalize_records,
+    normalize_tweet,
+    register_schema,
+)
+from twitter.tests.factories import detailed_tweet, simple_tweet
+
+
+class SchemaRegistryTests(SimpleTestCase):
+    def tearDown(self):
+        """Drop schemas registered by a test."""
+        normalizers.SCHEMA_REGISTRY[:] = [
+            schema for schema in normalizers.SCHEMA_REGISTRY
+            if schema.name in ('simple', 'detailed')
+        ]
+
+    def test_builtin_formats_are_detected(self):
+        """Test the simple and detailed n8n formats map to their schemas."""
+        self.assertEqual(detect_schema(simple_tweet(1)).name, 'simple')
+        self.assertEqual(detect_schema(detailed_tweet(1)).name, 'detailed')
+        self.assertIsNone(detect_schema({"foo": "bar"}))
+
+    def test_simple_record_fields(self):
+        """Test a simple record maps onto SourceTweet fields."""
+        fields = normalize_tweet(simple_tweet(7, Likes="12", Status="partial"))
+
+        self.assertEqual(fields['tweet_id'], "7")
+        self.assertEqual(fields['content'], "Tweet number 7")
+        self.assertEqual(fields['likes'], 12)
+        self.assertEqual(fields['views'], 500)
+        self.assertEqual(fields['tweet_url'], "https://twitter.com/coophive/status/7")
+        self.assertEqual(fields['status'], "partial")
+
+    def test_detailed_record_fields(self):
+        """Test a detailed record maps onto SourceTweet fields."""
+        fields = normalize_tweet(detailed_tweet(8))
+
+        self.assertEqual(fields['content'], "Detailed tweet 8")
+        self.assertEqual(fields['quotes'], 8)
+        self.assertEqual(fields['tweet_url'], "https://twitter.com/coophive/status/8")
+        self.assertEqual(fields['status'], "success")
+        self.assertEqual(fields['date'].year, 2025)
+
+    def test_mixed_batch_matches_per_record_normalization(self):
+        """Test batch detection gives the same result as normalizing each record alone."""
+        records = [
+            detailed_tweet(1),
+            simple_tweet(2),
+            {"id": "3", "Tweet ID": "3", "Content": "Both keys, simple wins"},
+            {"nothing": "here"},
+            simple_tweet(""),
+        ]
+
+        normalized = normalize_records(records)
+
+        def without_date(fields):
+            return fields and {k: v for k, v in fields.items() if k != 'date'}
+
+        self.assertEqual(
+            [without_date(fields) for fields in normalized],
+            [without_date(normalize_tweet(record)) for record in records]
+        )
+        self.assertEqual(normalized[2]['content'], "Both keys, simple wins")
+        self.assertEqual(normalized[3:], [None, None])
+
+    def test_registering_a_new_scraper_format(self):
+        """Test a registered schema is picked up by batch normalization."""
+        register_schema(TweetSchema(
+            name='apify',
+            id_key='tweetId',
+            text_fields={'content': "full'Text", 'url': 'url', 'tweet_url': 'url'},
+            count_fields={
+                'likes': 'favorites', 'retweets': 'reposts', 'replies': 'replies',
+                'quotes': 'quotes', 'views': 'impressions',
+            },
+            date_key='postedAt',
+        ))
+
+        record = {"tweetId": 99, "full'Text": "Hello", "favorites": "3", "url": "u"}
+        [fields] = normalize_records([record])
+
+        self.assertEqual(fields['tweet_id'], "99")
+        self.assertEqual(fields['content'], "Hello")
+        self.assertEqual(fields['likes'], 3)
+        self.assertEqual(fields['views'], 0)
+        self.assertEqual(fields['tweet_url'], "u")
+
+    def test_schema_must_map_every_count(self):
+        """Test incomplete schemas and duplicate names are rejected."""
+        with self.assertRaises(ValueError):
+            TweetSchema(
+                name='broken', id_key='x', text_fields={}, count_fields={'likes': 'l'}, date_key='d'
+            )
+        with self.assertRaises(ValueError):
+            register_schema(normalizers.get_schema('simple'))
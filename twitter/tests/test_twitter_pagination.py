@@ -0,0 +1,124 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from twitter.models import SourceTweet
+from twitter.pagination import encode_cursor, estimate_count, paginate_keyset
+from twitter.result_cache import bump_ingestion_generation
+from twitter.tests.factories import make_source_tweet
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        now = timezone.now()
+        # Pairs of tweets share a date and like count, so the id tie-break matters
+        for i in range(23):
+            make_source_tweet(i, date=now - timedelta(hours=i // 2), likes=i % 5, retweets=i % 3)
+
+    def _walk(self, sort_by, queryset=None, per_page=5):
+        queryset = queryset if queryset is not None else SourceTweet.objects.all()
+        pages = [paginate_keyset(queryset, sort_by, per_page=per_page)]
+        while pages[-1].has_next:
+            pages.append(paginate_keyset(queryset, sort_by, pages[-1].next_cursor, per_page))
+        return pages
+
+    def test_forward_walk_matches_offset_order(self):
+        """Test every row is served exactly once, in the same order as a plain ORDER BY."""
+        orderings = (
+            ('-date', ('-date', '-pk')),
+            ('date', ('date', 'pk')),
+            ('-likes', ('-likes', '-pk')),
+        )
+        for sort_by, ordering in orderings:
+            pages = self._walk(sort_by)
+            served = [tweet.pk for page in pages for tweet in page]
+
+            expected = SourceTweet.objects.order_by(*ordering).values_list('pk', flat=True)
+            self.assertEqual(served, list(expected))
+            self.assertEqual([page.start_index() for page in pages], [1, 6, 11, 16, 21])
+            self.assertEqual(pages[-1].end_index(), 23)
+
+    def test_engagement_sort(self):
+        """Test the stored total engagement column pages correctly and matches its expression."""
+        queryset = SourceTweet.objects.all()
+
+        served = [tweet.pk for page in self._walk('-total_engagement', queryset) for tweet in page]
+
+        expected = queryset.order_by('-total_engagement', '-pk').values_list('pk', flat=True)
+        self.assertEqual(served, list(expected))
+        total = F('likes') + F('retweets') + F('replies') + F('quotes')
+        self.assertFalse(queryset.exclude(total_engagement=total))
+
+    def test_previous_cursor_returns_previous_page(self):
+        """Test walking back reproduces the earlier pages and numbering."""
+        pages = self._walk('-date')
+
+        back = paginate_keyset(SourceTweet.objects.all(), '-date', pages[3].previous_cursor, 5)
+        first = paginate_keyset(SourceTweet.objects.all(), '-date', pages[1].previous_cursor, 5)
+
+        self.assertEqual(list(back), list(pages[2]))
+        self.assertEqual(back.start_index(), pages[2].start_index())
+        self.assertTrue(back.has_next and back.has_previous)
+        self.assertEqual(list(first), list(pages[0]))
+        self.assertFalse(first.has_previous)
+
+    def test_foreign_or_tampered_cursor_restarts(self):
+        """Test cursors for another sort or with a bad signature fall back to page one."""
+        first = paginate_keyset(SourceTweet.objects.all(), '-date', per_page=5)
+        other_sort = encode_cursor('-likes', first.object_list[-1], 5, 'next')
+
+        for token in (other_sort, first.next_cursor + 'x', 'garbage'):
+            page = paginate_keyset(SourceTweet.objects.all(), '-date', token, 5)
+            self.assertEqual(list(page), list(first))
+
+    def test_deep_pages_cost_one_query(self):
+        """Test the last page needs the same single query as the first."""
+        pages = self._walk('-date')
+
+        for cursor in (None, pages[-1].previous_cursor, pages[-2].next_cursor):
+            with CaptureQueriesContext(connection) as ctx:
+                paginate_keyset(SourceTweet.objects.all(), '-date', cursor, 5)
+            self.assertEqual(len(ctx.captured_queries), 1)
+            self.assertNotIn('OFFSET', ctx.captured_queries[0]['sql'].upper())
+
+    def test_estimate_count_is_exact_off_postgres(self):
+        """Test SQLite reports an exact, non-approximate count."""
+        self.assertEqual(estimate_count(SourceTweet.objects.filter(likes=0)), (5, False))
+
+
+class ScrapedTweetsPaginationTests(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        now = timezone.now()
+        for i in range(60):
+            make_source_tweet(
+                i, date=now - timedelta(minutes=i), execution_id="exec_a" if i % 2 else "exec_b"
+            )
+        bump_ingestion_generation()  # rows created here bypass ingestion
+        user = get_user_model().objects.create_user(username='pager', password='pw')
+        self.client.force_login(user)
+
+    def test_next_link_keeps_filters(self):
+        """Test the Next link carries the cursor and the active filters."""
+        url = reverse('twitter:scraped_tweets')
+        response = self.client.get(url, {'sort_by': '-date'})
+
+        first = response.context['tweets']
+        self.assertEqual(len(first), 50)
+        self.assertContains(response, 'sort_by=-date&amp;cursor=')
+
+        response = self.client.get(url, {'sort_by': '-date', 'cursor': first.next_cursor})
+
+        self.assertEqual(
+            [t.tweet_id for t in response.context['tweets']], [str(i) for i in range(50, 60)]
+        )
+        context = response.context
+        self.assertEqual((context['showing_start'], context['showing_end']), (51, 60))
+        self.assertEqual(response.context['total_filtered'], 60)
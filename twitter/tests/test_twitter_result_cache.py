@@ -0,0 +1,113 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from twitter.result_cache import (
+    bump_ingestion_generation,
+    cache_metrics,
+    canonical_filters,
+    get_cache,
+    ingestion_generation,
+    reset_cache_metrics,
+    result_cache_key,
+)
+from twitter.tests.factories import make_source_tweet, simple_tweet
+from twitter.tests.test_twitter_stats import tweet_queries
+
+
+class ResultCacheKeyTests(TestCase):
+    def test_equivalent_filters_share_a_key(self):
+        """Test ordering, blanks, whitespace and leading zeros do not split the cache."""
+        self.assertEqual(
+            result_cache_key('page', {'min_likes': '05', 'search_content': ' a   b ', 'execution_id': ''}, 1),
+            result_cache_key('page', {'search_content': 'a b', 'min_likes': '5'}, 1),
+        )
+        self.assertEqual(canonical_filters({'b': '1', 'a': ' x '}), {'a': 'x', 'b': '1'})
+
+    def test_generation_changes_the_key(self):
+        """Test bumping the generation moves every key."""
+        before = result_cache_key('page', {'sort_by': '-date'})
+
+        bump_ingestion_generation()
+
+        self.assertNotEqual(result_cache_key('page', {'sort_by': '-date'}), before)
+
+    def test_lost_generation_restarts_ahead(self):
+        """Test an evicted counter restarts above every generation handed out before."""
+        generation = bump_ingestion_generation()
+
+        get_cache().delete('twitter:scraped-tweets:generation')
+
+        self.assertGreater(ingestion_generation(), generation)
+
+
+class ScrapedTweetsResultCacheTests(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        for i in range(3):
+            make_source_tweet(i, likes=i)
+        bump_ingestion_generation()  # rows created here bypass ingestion
+        reset_cache_metrics()
+        self.client.force_login(get_user_model().objects.create_user(username='cached', password='pw'))
+        self.url = reverse('twitter:scraped_tweets')
+
+    def test_repeat_load_is_served_from_cache(self):
+        """Test reloading the same filters, written differently, runs no tweet queries."""
+        self.client.get(self.url, {'min_likes': '1', 'sort_by': '-likes'})
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, {'sort_by': '-likes', 'min_likes': '01', 'tweet_id_search': ''})
+
+        self.assertEqual(tweet_queries(ctx), [])
+        self.assertEqual([t.tweet_id for t in response.context['tweets']], ['2', '1'])
+        self.assertEqual(response.context['filtered_tweets_count'], 2)
+        self.assertEqual(cache_metrics()['hits'], 2)  # page and global stats
+
+    def test_ingestion_invalidates(self):
+        """Test tweets stored through the n8n endpoint show up on the next load."""
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            APIClient().post(reverse('twitter:api_check_duplicate'), [{
+                "execution_id": "exec_new", "source_url": "https://n8n.coophive.network", "tweets": [simple_tweet(9)],
+            }], format='json')
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.context['filtered_tweets_count'], 4)
+        self.assertEqual(response.context['total_tweets'], 4)
+
+    def test_duplicate_only_ingestion_keeps_cache(self):
+        """Test a scrape that stores nothing leaves cached pages valid."""
+        generation = ingestion_generation()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            APIClient().post(reverse('twitter:api_check_duplicate'), [{
+                "execution_id": "exec_again", "source_url": "https://n8n.coophive.network", "tweets": [simple_tweet(1)],
+            }], format='json')
+
+        self.assertEqual(ingestion_generation(), generation)
+
+    @override_settings(SCRAPED_TWEETS_CACHE_SECONDS=0)
+    def test_zero_ttl_disables(self):
+        """Test a zero TTL always recomputes and records no lookups."""
+        self.client.get(self.url)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self.url)
+
+        self.assertEqual(len(tweet_queries(ctx)), 3)  # table count, aggregate, page
+        self.assertEqual(cache_metrics()['hit_rate'], None)
+
+    def test_metrics_endpoint(self):
+        """Test the metrics endpoint reports hits, misses and the hit rate."""
+        self.client.get(self.url)
+        self.client.get(self.url)
+
+        response = APIClient().get(reverse('twitter:api_scraped_tweets_cache_metrics'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['cache']['hits'], response.data['cache']['misses']), (2, 2))
+        self.assertEqual(response.data['cache']['hit_rate'], 0.5)
@@ -0,0 +1,164 @@
+from unittest import mock
+
+from django.contrib.admin.sites import site
+from django.contrib.auth import get_user_model
+from django.db.models import Exists, OuterRef
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from twitter.ingestion import ingest_source_tweets
+from twitter.models import SourceTweet
+from twitter.result_cache import bump_ingestion_generation
+from twitter.search import (
+    create_search_index,
+    forget_search_backend,
+    parse_search_query,
+    search_backend,
+    search_condition,
+    search_tweets,
+    to_fts5_query,
+    to_tsquery,
+)
+from twitter.tests.factories import make_source_tweet, simple_tweet
+
+
+class SearchQueryParsingTests(TestCase):
+    def test_terms_phrases_and_prefixes(self):
+        """Test the search box syntax is split into typed parts."""
+        self.assertEqual(parse_search_query('compute "open network" decentral* co-op'), [
+            ('term', ['compute']),
+            ('phrase', ['open', 'network']),
+            ('prefix', ['decentral']),
+            ('phrase', ['co', 'op']),
+        ])
+
+    def test_rendered_queries_only_contain_words(self):
+        """Test operators and quotes typed by users never reach the query syntax."""
+        parts = parse_search_query("""it's" | ! & 'x'):* NEAR(""")
+
+        self.assertEqual(to_tsquery(parts), "'it' <-> 's' & 'x':* & 'NEAR'")
+        self.assertEqual(to_fts5_query(parts), '"it s" "x"* "NEAR"')
+
+
+class FullTextSearchTests(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        create_search_index()
+        # The index is rolled back with the test, the cached backend is not
+        self.addCleanup(forget_search_backend)
+        make_source_tweet(1, content="Decentralized compute markets are running on CoopHive")
+        make_source_tweet(2, content="Compute, compute, compute: the open network for compute")
+        make_source_tweet(3, content="Network open to everyone")
+        make_source_tweet(4, content="Nothing to see here")
+
+    def _ids(self, text):
+        tweets = search_tweets(SourceTweet.objects.all(), text).order_by('-search_rank')
+        return [tweet.tweet_id for tweet in tweets]
+
+    def test_uses_fts5_on_sqlite(self):
+        """Test the SQLite test database gets the FTS5 shadow table."""
+        self.assertEqual(search_backend(), 'fts5')
+
+    def test_ranked_by_relevance(self):
+        """Test tweets mentioning the term more often rank first."""
+        self.assertEqual(self._ids("compute"), ["2", "1"])
+
+    def test_phrase_and_prefix(self):
+        """Test phrases respect word order and prefixes match word starts."""
+        self.assertEqual(self._ids('"open network"'), ["2"])
+        self.assertEqual(self._ids("decentral*"), ["1"])
+        self.assertEqual(self._ids("compu*"), ["2", "1"])
+        self.assertEqual(self._ids("compu"), [])
+
+    def test_stemming(self):
+        """Test inflected forms match, like PostgreSQL's english config."""
+        self.assertEqual(self._ids("run"), ["1"])
+
+    def test_index_follows_writes(self):
+        """Test raw ingestion inserts, content edits and deletes are reflected."""
+        ingest_source_tweets([simple_tweet(9, Content="Brand new gossip")], "exec_s", "unknown")
+        SourceTweet.objects.filter(tweet_id="4").update(content="Now about gossip")
+        SourceTweet.objects.filter(tweet_id="9").delete()
+
+        self.assertEqual(self._ids("gossip"), ["4"])
+
+    def test_backend_is_looked_up_once(self):
+        """Test the index lookup is cached per connection and forgotten when the index changes."""
+        search_backend()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(search_backend(), 'fts5')
+
+        forget_search_backend()
+
+        with self.assertNumQueries(1):
+            search_backend()
+
+    def test_condition_works_inside_subqueries(self):
+        """Test the condition stays valid when Django aliases the tweets table."""
+        # Tweets with another tweet mentioning "network" (2 and 3 match)
+        others = SourceTweet.objects.filter(search_condition("network")).exclude(pk=OuterRef('pk'))
+
+        matches = SourceTweet.objects.filter(Exists(others)).order_by('tweet_id')
+
+        self.assertEqual(list(matches.values_list('tweet_id', flat=True)), ["1", "2", "3", "4"])
+
+    def test_stop_words_only_fall_back_to_icontains(self):
+        """Test a PostgreSQL query emptied by stop words still matches like icontains."""
+        with mock.patch('twitter.search.tsquery_has_lexemes', return_value=False):
+            condition = search_condition("the", backend='postgresql')
+
+        matches = SourceTweet.objects.filter(condition)
+
+        self.assertEqual(list(matches.values_list('tweet_id', flat=True)), ["2"])
+
+    def test_icontains_fallback(self):
+        """Test other backends still filter on every term."""
+        matches = SourceTweet.objects.filter(search_condition("open network", backend='icontains'))
+
+        self.assertEqual(sorted(matches.values_list('tweet_id', flat=True)), ["2", "3"])
+
+
+class SearchIntegrationTests(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        create_search_index()
+        self.addCleanup(forget_search_backend)
+        make_source_tweet(1, content="Decentralized compute")
+        make_source_tweet(2, content="compute compute compute")
+        make_source_tweet(3, content="Unrelated")
+        bump_ingestion_generation()  # rows created here bypass ingestion
+        self.user = get_user_model().objects.create_user(
+            username='searcher', password='pw', is_staff=True
+        )
+        self.client.force_login(self.user)
+
+    def test_scraped_tweets_page_defaults_to_relevance(self):
+        """Test the page search uses the index and sorts by rank."""
+        response = self.client.get(reverse('twitter:scraped_tweets'), {'search_content': 'compute'})
+
+        self.assertEqual([tweet.tweet_id for tweet in response.context['tweets']], ["2", "1"])
+        self.assertEqual(response.context['filtered_tweets_count'], 2)
+
+    def test_export_applies_search(self):
+        """Test the CSV export honours the search box."""
+        response = self.client.get(
+            reverse('twitter:export_tweets'), {'search_content': 'decentralized'}
+        )
+
+        rows = b''.join(response.streaming_content).decode().strip().splitlines()
+        self.assertEqual(len(rows), 2)
+        self.assertTrue(rows[1].startswith("1,"))
+
+    def test_admin_search(self):
+        """Test admin search combines the index with tweet and execution IDs."""
+        request = RequestFactory().get('/')
+        request.user = self.user
+        model_admin = site._registry[SourceTweet]
+
+        tweets = SourceTweet.objects.all()
+        matches, _ = model_admin.get_search_results(request, tweets, "decentral*")
+        by_id, _ = model_admin.get_search_results(request, tweets, "3")
+
+        self.assertEqual(list(matches.values_list('tweet_id', flat=True)), ["1"])
+        self.assertEqual(list(by_id.values_list('tweet_id', flat=True)), ["3"])
@@ -0,0 +1,77 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from twitter.models import SourceTweet
+from twitter.result_cache import bump_ingestion_generation
+from twitter.stats import filtered_tweet_stats, global_tweet_stats
+from twitter.tests.factories import make_source_tweet
+
+
+def tweet_queries(ctx):
+    """SQL of the captured queries that read the tweets table."""
+    return [q['sql'] for q in ctx.captured_queries if 'twitter_sourcetweet' in q['sql']]
+
+
+class ScrapedTweetsStatsTests(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        for i in range(6):
+            make_source_tweet(i, likes=i, retweets=1, views=10, execution_id=f"exec_{i % 3}")
+        bump_ingestion_generation()  # rows created here bypass ingestion
+        self.client.force_login(get_user_model().objects.create_user(username='stats', password='pw'))
+        self.url = reverse('twitter:scraped_tweets')
+
+    def test_filtered_stats_single_query(self):
+        """Test the count, sums and distinct executions come from one query."""
+        with self.assertNumQueries(1):
+            stats = filtered_tweet_stats(SourceTweet.objects.filter(likes__gte=2))
+
+        self.assertEqual(stats, {
+            'filtered_tweets_count': 4, 'total_likes': 14, 'total_retweets': 4,
+            'total_views': 40, 'total_executions': 3,
+        })
+        self.assertEqual(filtered_tweet_stats(SourceTweet.objects.none())['total_likes'], 0)
+
+    def test_page_load_query_budget(self):
+        """Test a new filter combination reads the tweets table twice: one aggregate, one page."""
+        self.client.get(self.url)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, {'min_likes': '3', 'execution_id': 'exec_1'})
+
+        self.assertEqual(len(tweet_queries(ctx)), 2)
+        self.assertEqual(response.context['filtered_tweets_count'], 1)
+        self.assertEqual(response.context['total_likes'], 4)
+        self.assertEqual(response.context['total_tweets'], 6)
+        self.assertEqual(list(response.context['execution_ids']), ['exec_0', 'exec_1', 'exec_2'])
+
+    def test_deletes_refresh_global_stats(self):
+        """Test deleting tweets drops the cached totals."""
+        self.assertEqual(global_tweet_stats()['total_tweets'], 6)
+
+        response = APIClient().delete(
+            reverse('twitter:api_bulk_delete_tweets'),
+            {'tweet_ids': list(SourceTweet.objects.filter(execution_id="exec_0").values_list('id', flat=True))},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(global_tweet_stats()['total_tweets'], 4)
+
+    def test_ingestion_refreshes_global_stats(self):
+        """Test newly stored tweets drop the cached totals once committed."""
+        global_tweet_stats()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            APIClient().post(reverse('twitter:api_check_duplicate'), {
+                "execution_id": "exec_new",
+                "source_url": "https://n8n.coophive.network",
+                "tweets": [{"id": "new_1", "text": "Hello", "url": "https://x.com/a/status/new_1"}],
+            }, format='json')
+
+        self.assertEqual(global_tweet_stats()['total_tweets'], 7)
+        self.assertIn("exec_new", global_tweet_stats()['execution_ids'])
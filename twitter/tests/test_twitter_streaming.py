@@ -0,0 +1,100 @@
+import io
+import json
+from unittest import mock
+
+import ijson
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from twitter import streaming
+from twitter.models import Execution, SourceTweet
+from twitter.tests.factories import detailed_tweet, make_source_tweet, simple_tweet
+
+
+class StreamingDuplicateCheckTests(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.url = reverse('twitter:api_check_duplicate')
+
+    def _post_streaming(self, payload, url=None):
+        response = self.client.post(url or f"{self.url}?stream=true", payload, format='json')
+        self.assertTrue(response.streaming)
+        return response, json.loads(b''.join(response.streaming_content))
+
+    def _post_buffered(self, payload):
+        return self.client.post(self.url, payload, format='json').json()
+
+    @mock.patch('twitter.streaming.STREAM_CHUNK_SIZE', 2)
+    def test_streamed_response_matches_buffered_response(self):
+        """Test the streaming path answers exactly like the request.data path."""
+        make_source_tweet(3)
+        tweets = [simple_tweet(i, Content="Café ☕") for i in range(1, 7)] + [simple_tweet(2)]
+        payload = {"execution_id": "exec_s", "source_url": "https://n8n.coophive.network", "tweets": tweets}
+
+        response, streamed = self._post_streaming(payload)
+        SourceTweet.objects.exclude(tweet_id="3").delete()
+        buffered = self._post_buffered(payload)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(streamed, buffered)
+        self.assertEqual(streamed['summary']['duplicates_found'], 2)
+        self.assertEqual(streamed['summary']['new_tweets_found'], 5)
+
+    @mock.patch('twitter.streaming.STREAM_CHUNK_SIZE', 2)
+    def test_header_after_tweets_is_applied_to_earlier_chunks(self):
+        """Test rows flushed before execution_id arrives are patched with the final values."""
+        payload = [
+            {"data": {"tweets": [detailed_tweet(i) for i in range(1, 6)]}, "msg": "late"},
+            {"tweets": [simple_tweet(9)], "execution_id": "exec_second"},
+        ]
+
+        _, streamed = self._post_streaming(payload)
+
+        self.assertEqual([r['data']['execution_id'] for r in streamed['results']], ["exec_late", "exec_second"])
+        self.assertEqual(SourceTweet.objects.filter(execution_id="exec_late", source_url="api_detailed").count(), 5)
+        self.assertEqual(SourceTweet.objects.get(tweet_id="9").source_url, "unknown")
+        self.assertFalse(SourceTweet.objects.filter(execution__execution_id__startswith="streaming-").exists())
+        self.assertFalse(Execution.objects.filter(execution_id__startswith="streaming-").exists())
+
+    @override_settings(N8N_STREAMING_THRESHOLD=10)
+    def test_large_bodies_stream_automatically(self):
+        """Test bodies above N8N_STREAMING_THRESHOLD bypass request.data."""
+        response, streamed = self._post_streaming(
+            {"execution_id": "exec_big", "tweets": [simple_tweet(1)]}, url=self.url
+        )
+
+        self.assertEqual(streamed['data']['new_tweets'], [simple_tweet(1)])
+
+    def test_invalid_json_returns_error(self):
+        """Test malformed bodies get the usual error response."""
+        response = self.client.post(
+            f"{self.url}?stream=true", '{"tweets": [', content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertEqual(response.json()['status'], "error")
+
+    def test_failed_stream_closes_every_spool(self):
+        """Test a body that breaks mid-stream closes the spooled echoes it had opened."""
+        body = json.dumps([
+            {"execution_id": "exec_a", "tweets": [simple_tweet(1), simple_tweet(2)]},
+            {"execution_id": "exec_b", "tweets": [simple_tweet(3)]},
+        ])[:-20]
+        states = []
+        execution_state = streaming._ExecutionState
+
+        def track(*args, **kwargs):
+            state = execution_state(*args, **kwargs)
+            states.append(state)
+            return state
+
+        with mock.patch('twitter.streaming._ExecutionState', side_effect=track):
+            with self.assertRaises(ijson.IncompleteJSONError):
+                streaming.ingest_scrape_stream(io.BytesIO(body.encode()), chunk_size=1)
+
+        self.assertEqual(len(states), 2)
+        self.assertTrue(all(state.echo.closed for state in states))
+        self.assertFalse(SourceTweet.objects.exists())
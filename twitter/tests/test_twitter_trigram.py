@@ -0,0 +1,101 @@
+from django.contrib.admin.sites import site
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from twitter.models import Execution, SourceTweet
+from twitter.result_cache import bump_ingestion_generation
+from twitter.tests.factories import make_source_tweet
+from twitter.trigram import create_trigram_indexes, drop_trigram_indexes, substring_condition
+
+
+def tweet_ids(queryset):
+    """Sorted tweet IDs of a queryset."""
+    return sorted(queryset.values_list('tweet_id', flat=True))
+
+
+def by_tweet_id(needle):
+    """Tweets whose ID contains ``needle``, through ``substring_condition``."""
+    return SourceTweet.objects.filter(substring_condition(SourceTweet, 'tweet_id', needle))
+
+
+class TrigramLookupTests(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        create_trigram_indexes()
+        make_source_tweet("1956012345678", execution_id="Exec_Morning_01")
+        make_source_tweet("1956099999999", execution_id="exec_evening_02")
+        make_source_tweet("1800000000000", execution_id="exec_evening_02")
+
+    def test_matches_icontains(self):
+        """Test indexed lookups return exactly what icontains returns."""
+        for needle in ("19560", "99999", "0000000", "1956012345678", "nope", '"78'):
+            self.assertEqual(
+                tweet_ids(by_tweet_id(needle)),
+                tweet_ids(SourceTweet.objects.filter(tweet_id__icontains=needle)),
+            )
+
+    def test_case_insensitive_execution_lookup(self):
+        """Test execution IDs match regardless of case."""
+        condition = substring_condition(Execution, 'execution_id', 'MORNING')
+        executions = Execution.objects.filter(condition)
+
+        self.assertEqual(
+            list(executions.values_list('execution_id', flat=True)), ["Exec_Morning_01"]
+        )
+
+    def test_index_and_fallbacks(self):
+        """Test the trigram table is queried, except for short needles or a missing index."""
+        self.assertIn('MATCH', str(by_tweet_id('195').query))
+        self.assertNotIn('MATCH', str(by_tweet_id('19').query))
+
+        drop_trigram_indexes()
+
+        self.assertNotIn('MATCH', str(by_tweet_id('195').query))
+
+    def test_triggers_keep_index_in_sync(self):
+        """Test inserts, ID changes and deletes reach the trigram table."""
+        make_source_tweet("1777777777777")
+        SourceTweet.objects.filter(tweet_id="1800000000000").update(tweet_id="1811111111111")
+        SourceTweet.objects.filter(tweet_id="1956099999999").delete()
+
+        self.assertEqual(tweet_ids(by_tweet_id("77777")), ["1777777777777"])
+        self.assertEqual(tweet_ids(by_tweet_id("11111")), ["1811111111111"])
+        self.assertEqual(tweet_ids(by_tweet_id("0000000000")), [])
+        self.assertEqual(tweet_ids(by_tweet_id("99999")), [])
+
+
+class TrigramIntegrationTests(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        create_trigram_indexes()
+        make_source_tweet("1956012345678", execution_id="exec_morning_01")
+        make_source_tweet("1800000000000", execution_id="exec_evening_02")
+        bump_ingestion_generation()  # rows created here bypass ingestion
+        self.user = get_user_model().objects.create_user(
+            username='ids', password='pw', is_staff=True
+        )
+        self.client.force_login(self.user)
+
+    def test_tweet_id_search_uses_index(self):
+        """Test the browser's tweet ID search goes through the trigram table."""
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(
+                reverse('twitter:scraped_tweets'), {'tweet_id_search': '6012'}
+            )
+
+        self.assertEqual([t.tweet_id for t in response.context['tweets']], ["1956012345678"])
+        queries = [q['sql'] for q in ctx.captured_queries]
+        self.assertTrue([sql for sql in queries if 'twitter_sourcetweet_tweet_id_trgm' in sql])
+
+    def test_admin_partial_execution_search(self):
+        """Test admin search finds tweets by part of their execution ID."""
+        request = RequestFactory().get('/')
+        request.user = self.user
+
+        model_admin = site._registry[SourceTweet]
+        matches, _ = model_admin.get_search_results(request, SourceTweet.objects.all(), "EVENING")
+
+        self.assertEqual(list(matches.values_list('tweet_id', flat=True)), ["1800000000000"])
@@ -0,0 +1,125 @@
+"""
+Trigram indexes for partial-ID lookups on tweet_id and execution_id.
+
+A B-tree cannot serve ``LIKE '%...%'``, so these get their own indexes:
+
+- PostgreSQL: ``pg_trgm`` GIN indexes on ``UPPER(column)``, the exact
+  expression Django's ``icontains`` compares, so plain ``icontains`` filters
+  use them with no query changes
+- SQLite: an FTS5 ``trigram`` table per column (SQLite 3.34+), external
+  content kept in sync by triggers like the content search index, queried
+  with a quoted MATCH string (case-insensitive substring)
+- Needles shorter than three characters have no trigram, and other
+  databases have no such index: both fall back to ``icontains``
+
+``substring_condition`` picks the right form. Migration 0012 creates the
+indexes from its own frozen copy of this DDL, so a change here needs a new
+migration. Migrations that make SQLite rebuild one of the tables drop its
+triggers and must recreate them the same way. ``create_trigram_indexes`` is
+safe to call again.
+"""
+import logging
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+logger = logging.getLogger(__name__)
+
+MIN_TRIGRAM_LENGTH = 3
+
+# (table, column) -> PostgreSQL index / SQLite FTS5 table name
+TRIGRAM_TARGETS = {
+    ('twitter_sourcetweet', 'tweet_id'): 'twitter_sourcetweet_tweet_id_trgm',
+    ('twitter_execution', 'execution_id'): 'twitter_execution_execution_id_trgm',
+}
+
+
+def _postgres_index_sql():
+    statements = ["CREATE EXTENSION IF NOT EXISTS pg_trgm"]
+    for (table, column), name in TRIGRAM_TARGETS.items():
+        statements.append(
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table} "
+            f"USING GIN ((UPPER({column}::text)) gin_trgm_ops)"
+        )
+    return statements
+
+
+def _sqlite_index_sql():
+    statements = []
+    for (table, column), name in TRIGRAM_TARGETS.items():
+        statements += [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5("
+            f"{column}, content='{table}', content_rowid='id', tokenize='trigram')",
+            f"CREATE TRIGGER IF NOT EXISTS {name}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {name}(rowid, {column}) VALUES (new.id, new.{column}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {name}_ad AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {name}({name}, rowid, {column}) "
+            f"VALUES ('delete', old.id, old.{column}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {name}_au AFTER UPDATE OF {column} ON {table} BEGIN "
+            f"INSERT INTO {name}({name}, rowid, {column}) VALUES ('delete', old.id, old.{column}); "
+            f"INSERT INTO {name}(rowid, {column}) VALUES (new.id, new.{column}); END",
+            f"INSERT INTO {name}({name}) VALUES ('rebuild')",
+        ]
+    return statements
+
+
+def _execute(conn, statements):
+    with conn.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def create_trigram_indexes(conn=connection):
+    """Create the backend's trigram indexes if they are missing"""
+    if conn.vendor == 'postgresql':
+        _execute(conn, _postgres_index_sql())
+    elif conn.vendor == 'sqlite':
+        try:
+            _execute(conn, _sqlite_index_sql())
+        except Exception as e:
+            # SQLite before 3.34 has no trigram tokenizer; lookups stay on icontains
+            logger.warning(
+                f"SQLite trigram tokenizer unavailable, ID lookups fall back to icontains: {e}"
+            )
+
+
+def drop_trigram_indexes(conn=connection):
+    if conn.vendor == 'postgresql':
+        _execute(conn, [f"DROP INDEX IF EXISTS {name}" for name in TRIGRAM_TARGETS.values()])
+    elif conn.vendor == 'sqlite':
+        statements = []
+        for name in TRIGRAM_TARGETS.values():
+            statements += [
+                f"DROP TRIGGER IF EXISTS {name}_{suffix}" for suffix in ('ai', 'ad', 'au')
+            ]
+            statements.append(f"DROP TABLE IF EXISTS {name}")
+        _execute(conn, statements)
+
+
+def _sqlite_table_exists(conn, name):
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [name])
+        return cursor.fetchone() is not None
+
+
+def substring_condition(model, field_name, text, conn=connection):
+    """
+    Filter condition for rows of ``model`` whose ``field_name`` contains
+    ``text``, case-insensitively, through the trigram index when one exists.
+    """
+    text = text.strip()
+    fallback = Q(**{f'{field_name}__icontains': text})
+    table = model._meta.db_table
+    column = model._meta.get_field(field_name).column
+    name = TRIGRAM_TARGETS.get((table, column))
+    if name is None or conn.vendor != 'sqlite' or len(text) < MIN_TRIGRAM_LENGTH:
+        # PostgreSQL's UPPER(...) LIKE is what the pg_trgm index is built for
+        return fallback
+    if not _sqlite_table_exists(conn, name):
+        return fallback
+    # pk__in keeps the condition valid when Django aliases the table inside a subquery
+    return Q(pk__in=RawSQL(
+        f"SELECT rowid FROM {name} WHERE {name} MATCH %s",
+        ['"' + text.replace('"', '""') + '"'],
+    ))
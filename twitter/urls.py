@@ -11,13 +11,18 @@ urlpatterns = [
     path('sourcetweet/', views.ScrapedTweetsView.as_view(), name='scraped_tweets'),
     path('scraped-tweets/', views.ScrapedTweetsView.as_view(), name='scraped_tweets_alt'),
     path('sourcetweet/export/', views.ExportTweetsView.as_view(), name='export_tweets'),
+    path('export-jobs/', views.ExportJobCreateView.as_view(), name='export_jobs'),
+    path('export-jobs/<uuid:job_id>/', views.ExportJobStatusView.as_view(), name='export_job_status'),
+    path('export-jobs/<uuid:job_id>/download/', views.ExportJobDownloadView.as_view(), name='export_job_download'),
     
     # FLASK API COMPATIBILITY - CRITICAL FOR N8N INTEGRATION
     path('api/check-duplicate-tweet/', views.CheckDuplicateTweetAPIView.as_view(), name='api_check_duplicate'),
     path('api/receive-tweets/', views.ReceiveTweetsAPIView.as_view(), name='api_receive_tweets'),
+    path('api/ingestion-jobs/<uuid:job_id>/', views.IngestionJobStatusAPIView.as_view(), name='api_ingestion_job_status'),
     
     # AJAX API ENDPOINTS FOR FRONTEND INTERACTIONS
     path('api/tweet-details/<int:tweet_id>/', views.TweetDetailAPIView.as_view(), name='api_tweet_details'),
+    path('api/engagement-series/', views.EngagementSeriesAPIView.as_view(), name='api_engagement_series'),
     path('api/delete-tweet/<int:tweet_id>/', views.DeleteTweetAPIView.as_view(), name='api_delete_tweet'),
     path('api/bulk-delete-tweets/', views.BulkDeleteTweetsAPIView.as_view(), name='api_bulk_delete_tweets'),
     
@@ -27,6 +32,8 @@ urlpatterns = [
     path('api/reject-generated-tweet/<int:tweet_id>/', views.RejectGeneratedTweetAPIView.as_view(), name='api_reject_generated_tweet'),
     path('api/delete-generated-tweet/<int:tweet_id>/', views.DeleteGeneratedTweetAPIView.as_view(), name='api_delete_generated_tweet'),
     path('api/post-tweet-to-x/<int:tweet_id>/', views.PostTweetToXAPIView.as_view(), name='api_post_tweet_to_x'),
+    path('api/campaign-stats/<str:campaign_batch>/', views.CampaignStatsAPIView.as_view(), name='api_campaign_stats'),
+    path('api/scraped-tweets/cache-metrics/', views.ScrapedTweetsCacheMetricsAPIView.as_view(), name='api_scraped_tweets_cache_metrics'),
     
     # MAIN INTERFACES (matches Flask app URLs)
     path('generate-tweets/', views.GenerateTweetsView.as_view(), name='generate_tweets'),
@@ -1,8 +1,10 @@
 from django.shortcuts import render, get_object_or_404
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.http import HttpResponse, JsonResponse, HttpResponseRedirect
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.gzip import gzip_page
 from django.views.decorators.http import require_http_methods
 from django.utils.decorators import method_decorator
 from django.views.generic import TemplateView, View
@@ -12,17 +14,119 @@ from rest_framework import status
 from django.utils import timezone
 from django.db import transaction, models
 import json
+import os
+from datetime import timedelta
 import logging
-from dateutil import parser as date_parser
-from .models import SourceTweet, CampaignBatch, GeneratedTweet
+from django.urls import reverse
+from .models import SourceTweet, CampaignBatch, GeneratedTweet, IngestionJob, ExportJob
+from .ingestion import process_duplicate_check, process_receive_tweets
+from .compression import decompress_request
+from .counters import campaign_status_stats
+from .dates import parse_date_value
+from .engagement import engagement_series
+from .export_jobs import (
+    download_filename,
+    export_path,
+    export_ttl,
+    job_status,
+    ranged_file_response,
+    worker_available,
+)
+from .exports import EXPORT_FORMATS, export_response
+from .filters import TweetFilterSpec
+from .pagination import paginate_keyset
+from .result_cache import bump_ingestion_generation, cache_metrics, cached_result
+from .stats import filtered_tweet_stats, global_tweet_stats
+from .idempotency import get_replay, idempotency_key, payload_hash, payload_mismatch, store_response
+from .streaming import stream_duplicate_check, wants_streaming
+from .tasks import process_export_job, process_ingestion_job
 
 logger = logging.getLogger(__name__)
 
+# ============================================================================
+# ASYNC INGESTION MODE - 202 ACCEPTED + JOB POLLING
+# ============================================================================
+
+def wants_async(request):
+    """n8n opts into background processing with ?async=true or Prefer: respond-async"""
+    if request.query_params.get('async', '').lower() in ('1', 'true', 'yes'):
+        return True
+    return 'respond-async' in request.headers.get('Prefer', '').lower()
+
+def wants_refresh(request):
+    """?refresh=true / false overrides N8N_REFRESH_ENGAGEMENT for one request"""
+    value = request.query_params.get('refresh', '').lower()
+    if value in ('1', 'true', 'yes'):
+        return True
+    if value in ('0', 'false', 'no'):
+        return False
+    return settings.N8N_REFRESH_ENGAGEMENT
+
+def enqueue_ingestion_job(request, kind, options=None):
+    """Persist the raw payload, queue it for the worker and answer 202 with the job ID"""
+    job = IngestionJob.objects.create(kind=kind, payload=request.data, options=options or {})
+
+    def dispatch_job():
+        try:
+            process_ingestion_job.delay(str(job.job_id))
+        except Exception as e:
+            # The payload is already stored; the job stays pending for a requeue
+            logger.error(f"Could not queue ingestion job {job.job_id}: {str(e)}")
+
+    transaction.on_commit(dispatch_job)
+
+    status_url = request.build_absolute_uri(
+        reverse('twitter:api_ingestion_job_status', args=[job.job_id])
+    )
+    logger.info(f"Queued {kind} ingestion job {job.job_id}")
+    return Response({
+        "job_id": str(job.job_id),
+        "status": "accepted",
+        "status_url": status_url,
+        "message": "Payload accepted for background processing"
+    }, status=status.HTTP_202_ACCEPTED, headers={'Location': status_url})
+
+# ============================================================================
+# IDEMPOTENT REPLAY - N8N WEBHOOK RETRIES
+# ============================================================================
+
+def process_idempotently(request, endpoint, processor):
+    """Run ``processor`` once per key and payload; retries get the stored response"""
+    key = idempotency_key(request, request.data)
+    if key is None:
+        response_data, http_status = processor(request.data)
+        return Response(response_data, status=http_status)
+
+    body_hash = payload_hash(request.data)
+    record = get_replay(endpoint, key)
+    if record is not None:
+        if record.body_hash == body_hash:
+            logger.info(f"Replaying stored {endpoint} response for {key}")
+            return Response(
+                record.response_data, status=record.response_status, headers={'Idempotent-Replayed': 'true'}
+            )
+        if payload_mismatch(key):
+            logger.warning(f"{endpoint} {key} reused with a different payload")
+            return Response({
+                "status": "error",
+                "message": "Idempotency-Key was already used with a different payload"
+            }, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        logger.info(f"New payload for {endpoint} {key}, processing it")
+
+    response_data, http_status = processor(request.data)
+    if http_status >= 400:
+        # Failures are not cached so the retry gets a real second attempt
+        return Response(response_data, status=http_status)
+    record = store_response(endpoint, key, body_hash, response_data, http_status)
+    return Response(record.response_data, status=record.response_status)
+
 # ============================================================================
 # FLASK API COMPATIBILITY ENDPOINTS - CRITICAL FOR N8N INTEGRATION
 # ============================================================================
 
 @method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(gzip_page, name='dispatch')
+@method_decorator(decompress_request, name='dispatch')
 class CheckDuplicateTweetAPIView(APIView):
     """
     CRITICAL: Primary endpoint that n8n hits first
@@ -32,147 +136,22 @@ class CheckDuplicateTweetAPIView(APIView):
     permission_classes = []
 
     def post(self, request):
-        try:
-            data = request.data
-            
-            # Handle array format from n8n (like SAMPLE_SIMPLE_IN.JSON)
-            if isinstance(data, list) and len(data) > 0:
-                data = data[0]  # Extract first object from array
-            
-            # Handle nested data format (like SAMPLE_DETAILED_IN.JSON)
-            if 'data' in data and 'tweets' in data['data']:
-                # Detailed format: data.data.tweets
-                tweets = data['data']['tweets']
-                execution_id = data.get('execution_id', f"exec_{data.get('msg', 'unknown')}")
-                source_url = data.get('source_url', 'api_detailed')
-                batch_metadata = data.get('batch_metadata', {})
-            else:
-                # Simple format: data.tweets
-                execution_id = data.get('execution_id')
-                source_url = data.get('source_url', 'unknown')
-                tweets = data.get('tweets', [])
-                batch_metadata = data.get('batch_metadata', {})
-            
-            logger.info(f"Checking duplicates for execution {execution_id}, {len(tweets)} tweets")
-            
-            new_tweets = []
-            duplicates_found = 0
-            
-            with transaction.atomic():
-                for tweet_data in tweets:
-                    # Handle different field formats
-                    if 'Tweet ID' in tweet_data:
-                        # Simple format (SAMPLE_SIMPLE_IN.JSON)
-                        tweet_id = tweet_data.get('Tweet ID')
-                        content = tweet_data.get('Content', '')
-                        likes = tweet_data.get('Likes', 0)
-                        retweets = tweet_data.get('Retweets', 0)
-                        replies = tweet_data.get('Replies', 0)
-                        quotes = tweet_data.get('Quotes', 0)
-                        views = tweet_data.get('Views', 0)
-                        url = tweet_data.get('URL', '')
-                        tweet_url = tweet_data.get('Tweet', '')
-                        date_str = tweet_data.get('Date', '')
-                        status_val = tweet_data.get('Status', 'success')
-                    else:
-                        # Detailed format (SAMPLE_DETAILED_IN.JSON)
-                        tweet_id = tweet_data.get('id')
-                        content = tweet_data.get('text', '')
-                        likes = tweet_data.get('likeCount', 0)
-                        retweets = tweet_data.get('retweetCount', 0)
-                        replies = tweet_data.get('replyCount', 0)
-                        quotes = tweet_data.get('quoteCount', 0)
-                        views = tweet_data.get('viewCount', 0)
-                        url = tweet_data.get('url', '')
-                        tweet_url = tweet_data.get('twitterUrl', '')
-                        date_str = tweet_data.get('createdAt', '')
-                        status_val = 'success'
-                    
-                    if not tweet_id:
-                        continue
-                    
-                    # Check if tweet already exists
-                    if SourceTweet.objects.filter(tweet_id=str(tweet_id)).exists():
-                        duplicates_found += 1
-                        logger.debug(f"Duplicate found: {tweet_id}")
-                        continue
-                    
-                    # Parse date - handle multiple formats from n8n
-                    try:
-                        if date_str:
-                            # Try ISO format first (2025-08-14T16:07:32.837Z)
-                            if 'T' in date_str:
-                                tweet_date = timezone.datetime.fromisoformat(
-                                    date_str.replace('Z', '+00:00')
-                                )
-                            else:
-                                # Handle Twitter format: "Thu Aug 14 14:30:31 +0000 2025"
-                                tweet_date = date_parser.parse(date_str)
-                                if tweet_date.tzinfo is None:
-                                    tweet_date = timezone.make_aware(tweet_date)
-                        else:
-                            tweet_date = timezone.now()
-                    except (ValueError, AttributeError, ImportError):
-                        tweet_date = timezone.now()
-                    
-                    # Create new SourceTweet
-                    source_tweet = SourceTweet.objects.create(
-                        tweet_id=str(tweet_id),
-                        url=url,
-                        content=content,
-                        likes=int(likes),
-                        retweets=int(retweets),
-                        replies=int(replies),
-                        quotes=int(quotes),
-                        views=int(views),
-                        date=tweet_date,
-                        status=status_val,
-                        tweet_url=tweet_url,
-                        execution_id=execution_id,
-                        source_url=source_url
-                    )
-                    
-                    # Add to new tweets list (preserve original format)
-                    new_tweets.append(tweet_data)
-                    logger.debug(f"Stored new tweet: {tweet_id}")
-            
-            # Prepare response in exact n8n expected format (matching out.json)
-            response_data = {
-                "data": {
-                    "duplicate_ids": [],  # Could be populated with actual duplicate IDs if needed
-                    "execution_id": execution_id,
-                    "new_tweets": new_tweets,
-                    "source_url": source_url
-                },
-                "debug_info": {
-                    "error_count": 0,
-                    "processed_count": len(tweets),
-                    "saved_count": len(new_tweets)
-                },
-                "message": f"✅ Success: All {len(new_tweets)} tweets are new and have been saved to database" if duplicates_found == 0 else f"✅ Success: {len(new_tweets)} new tweets saved, {duplicates_found} duplicates found",
-                "status": "success",
-                "summary": {
-                    "duplicates_found": duplicates_found,
-                    "execution_id_duplicates": 0,  # Could track execution ID duplicates separately
-                    "new_tweets_found": len(new_tweets),
-                    "saved_to_database": len(new_tweets),
-                    "total_processed": len(tweets),
-                    "tweet_id_duplicates": duplicates_found
-                }
-            }
-            
-            logger.info(f"Duplicate check complete: {len(new_tweets)} new, {duplicates_found} duplicates")
-            return Response(response_data, status=status.HTTP_200_OK)
-            
-        except Exception as e:
-            logger.error(f"Error in check-duplicate-tweet: {str(e)}")
-            return Response({
-                "status": "error",
-                "message": f"Error processing tweets: {str(e)}",
-                "data": None
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        refresh_engagement = wants_refresh(request)
+        if wants_async(request):
+            return enqueue_ingestion_job(
+                request, IngestionJob.KIND_CHECK_DUPLICATE, {'refresh_engagement': refresh_engagement}
+            )
+        if wants_streaming(request):
+            # Large scrapes are parsed straight off the socket instead of via request.data
+            return stream_duplicate_check(request._request, refresh_engagement=refresh_engagement)
+        return process_idempotently(
+            request, IngestionJob.KIND_CHECK_DUPLICATE,
+            lambda data: process_duplicate_check(data, refresh_engagement=refresh_engagement)
+        )
 
 @method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(gzip_page, name='dispatch')
+@method_decorator(decompress_request, name='dispatch')
 class ReceiveTweetsAPIView(APIView):
     """
     Store generated tweet batches from n8n AI workflow
@@ -181,73 +160,28 @@ class ReceiveTweetsAPIView(APIView):
     permission_classes = []
 
     def post(self, request):
-        try:
-            data = request.data
-            
-            # Handle array format from n8n (like in.json)
-            if isinstance(data, list) and len(data) > 0:
-                data = data[0]  # Extract first object from array
-            
-            campaign_batch_id = data.get('campaign_batch')
-            
-            logger.info(f"Receiving generated tweets for batch {campaign_batch_id}")
-            
-            with transaction.atomic():
-                # Create or get campaign batch
-                campaign_batch, created = CampaignBatch.objects.get_or_create(
-                    batch_id=campaign_batch_id,
-                    defaults={
-                        'analysis_summary': data.get('analysis_summary', {}),
-                        'total_tweets': data.get('tweet_count', 0),
-                        'ready_for_deployment': data.get('ready_for_deployment', 0),
-                        'source_type': data.get('source_type', 'multi_agent_automation'),
-                        'title': data.get('title', 'Generated Content'),
-                        'description': data.get('description', ''),
-                        'brand_alignment_score': data.get('analysis_summary', {}).get('brand_alignment_score')
-                    }
-                )
-                
-                # Store individual tweets
-                tweets_stored = 0
-                for tweet_data in data.get('tweets', []):
-                    # Check if tweet already exists to avoid duplicates
-                    if not GeneratedTweet.objects.filter(
-                        campaign_batch=campaign_batch,
-                        tweet_id=tweet_data.get('id')
-                    ).exists():
-                        GeneratedTweet.objects.create(
-                            campaign_batch=campaign_batch,
-                            tweet_id=tweet_data.get('id'),
-                            type=tweet_data.get('type', 'generated'),
-                            content=tweet_data.get('content'),
-                            character_count=tweet_data.get('character_count', len(tweet_data.get('content', ''))),
-                            engagement_hook=tweet_data.get('engagement_hook', ''),
-                            coophive_elements=tweet_data.get('coophive_elements', []),
-                            discord_voice_patterns=tweet_data.get('discord_voice_patterns', []),
-                            theme_connection=tweet_data.get('theme_connection', ''),
-                            ready_for_deployment=tweet_data.get('ready_for_deployment', True),
-                            status=tweet_data.get('status', 'Brand Aligned'),
-                            is_edited=tweet_data.get('is_edited', False)
-                        )
-                        tweets_stored += 1
-            
-            # Return response in exact format expected by n8n (matching out.json)
-            response_data = {
-                "campaign_batch": campaign_batch_id,
-                "message": f"Received {tweets_stored} tweets (saved to database)",
-                "status": "success"
-            }
-            
-            logger.info(f"Successfully stored campaign batch {campaign_batch_id}: {tweets_stored} tweets")
-            return Response(response_data, status=status.HTTP_200_OK)
-            
-        except Exception as e:
-            logger.error(f"Error in receive-tweets: {str(e)}")
-            return Response({
-                "campaign_batch": data.get('campaign_batch', 'unknown'),
-                "message": f"Error storing tweets: {str(e)}",
-                "status": "error"
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        if wants_async(request):
+            return enqueue_ingestion_job(request, IngestionJob.KIND_RECEIVE_TWEETS)
+        return process_idempotently(request, IngestionJob.KIND_RECEIVE_TWEETS, process_receive_tweets)
+
+@method_decorator(gzip_page, name='dispatch')
+class IngestionJobStatusAPIView(APIView):
+    """
+    Poll a queued n8n payload - returns 202 while pending, then the exact
+    response body (and status code) the synchronous endpoint would have sent
+    """
+    authentication_classes = []  # No auth required for n8n
+    permission_classes = []
+
+    def get(self, request, job_id):
+        job = get_object_or_404(IngestionJob, job_id=job_id)
+        if job.status in (IngestionJob.STATUS_COMPLETED, IngestionJob.STATUS_FAILED):
+            return Response(job.response_data, status=job.response_status)
+        return Response({
+            "job_id": str(job.job_id),
+            "status": job.status,
+            "message": f"Job is {job.status}"
+        }, status=status.HTTP_202_ACCEPTED)
 
 # ============================================================================
 # AJAX API ENDPOINTS FOR FRONTEND INTERACTIONS
@@ -295,6 +229,41 @@ class TweetDetailAPIView(APIView):
                 'error': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@method_decorator(gzip_page, name='dispatch')
+class EngagementSeriesAPIView(APIView):
+    """
+    Aligned engagement series for plotting, e.g.
+    ?tweet_ids=1,2&post_ids=7&metric=likes&interval=hour&start=2025-08-01T00:00:00Z
+    """
+    authentication_classes = []
+    permission_classes = []
+
+    def get(self, request):
+        params = request.query_params
+        end = parse_date_value(params.get('end')) or timezone.now()
+        start = parse_date_value(params.get('start')) or end - timedelta(days=7)
+        tweet_ids = [value for value in params.get('tweet_ids', '').split(',') if value]
+        post_ids = [value for value in params.get('post_ids', '').split(',') if value]
+        try:
+            series = engagement_series(
+                start, end,
+                interval=params.get('interval', 'hour'),
+                metric=params.get('metric', 'likes'),
+                tweet_ids=tweet_ids,
+                post_ids=post_ids,
+            )
+        except ValueError as e:
+            return Response({'success': False, 'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'success': True,
+            'metric': params.get('metric', 'likes'),
+            'interval': params.get('interval', 'hour'),
+            'buckets': [bucket.isoformat() for bucket in series['buckets']],
+            'tweets': series['tweets'],
+            'posts': {str(post_id): values for post_id, values in series['posts'].items()},
+        }, status=status.HTTP_200_OK)
+
 @method_decorator(csrf_exempt, name='dispatch')
 class DeleteTweetAPIView(APIView):
     """
@@ -308,6 +277,7 @@ class DeleteTweetAPIView(APIView):
             tweet = get_object_or_404(SourceTweet, id=tweet_id)
             tweet_id_text = tweet.tweet_id
             tweet.delete()
+            bump_ingestion_generation()
             
             logger.info(f"Tweet {tweet_id_text} deleted successfully")
             
@@ -354,6 +324,7 @@ class BulkDeleteTweetsAPIView(APIView):
             
             # Delete tweets
             tweets_to_delete.delete()
+            bump_ingestion_generation()
             
             logger.info(f"Bulk deleted {deleted_count} tweets")
             
@@ -415,7 +386,7 @@ class ApproveGeneratedTweetAPIView(APIView):
     def post(self, request, tweet_id):
         try:
             tweet = get_object_or_404(GeneratedTweet, id=tweet_id)
-            tweet.status = 'approved'
+            tweet.status = 'Approved'
             tweet.save()
             
             logger.info(f"Generated tweet {tweet_id} approved")
@@ -443,7 +414,7 @@ class RejectGeneratedTweetAPIView(APIView):
     def post(self, request, tweet_id):
         try:
             tweet = get_object_or_404(GeneratedTweet, id=tweet_id)
-            tweet.status = 'rejected'
+            tweet.status = 'Rejected'
             tweet.save()
             
             logger.info(f"Generated tweet {tweet_id} rejected")
@@ -487,6 +458,36 @@ class DeleteGeneratedTweetAPIView(APIView):
                 'error': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+class CampaignStatsAPIView(APIView):
+    """
+    Live per-status tweet counts for a campaign batch, so the review page can
+    refresh its overview without reloading
+    """
+    authentication_classes = []
+    permission_classes = []
+
+    def get(self, request, campaign_batch):
+        batch = get_object_or_404(CampaignBatch, batch_id=campaign_batch)
+
+        return Response({
+            'success': True,
+            'campaign_batch': batch.batch_id,
+            'stats': campaign_status_stats(batch),
+        }, status=status.HTTP_200_OK)
+
+class ScrapedTweetsCacheMetricsAPIView(APIView):
+    """
+    Hit/miss counters of the scraped tweets result cache
+    """
+    authentication_classes = []
+    permission_classes = []
+
+    def get(self, request):
+        return Response({
+            'success': True,
+            'cache': cache_metrics(),
+        }, status=status.HTTP_200_OK)
+
 @method_decorator(csrf_exempt, name='dispatch')
 class PostTweetToXAPIView(APIView):
     """
@@ -501,7 +502,7 @@ class PostTweetToXAPIView(APIView):
             
             # TODO: Implement actual X.com API integration
             # For now, just mark as posted
-            tweet.status = 'posted'
+            tweet.status = 'Posted'
             tweet.posted_at = timezone.now()
             tweet.save()
             
@@ -527,189 +528,156 @@ class PostTweetToXAPIView(APIView):
 class ScrapedTweetsView(LoginRequiredMixin, TemplateView):
     """Scraped Tweets Database Interface - /twitter/sourcetweet/"""
     template_name = 'twitter/scraped_tweets.html'
+    paginate_by = 50  # Show 50 tweets per page
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        # Get all source tweets as base queryset
-        tweets = SourceTweet.objects.all()
-        
-        # Apply filters based on GET parameters
-        filters = {}
-        
-        # Content search
-        search_content = self.request.GET.get('search_content', '').strip()
-        if search_content:
-            tweets = tweets.filter(content__icontains=search_content)
-            filters['search_content'] = search_content
-        
-        # Tweet ID search
-        tweet_id_search = self.request.GET.get('tweet_id_search', '').strip()
-        if tweet_id_search:
-            tweets = tweets.filter(tweet_id__icontains=tweet_id_search)
-            filters['tweet_id_search'] = tweet_id_search
-        
-        # Execution ID filter
-        execution_filter = self.request.GET.get('execution_id', '').strip()
-        if execution_filter:
-            tweets = tweets.filter(execution_id__icontains=execution_filter)
-            filters['execution_id'] = execution_filter
-        
-        # Date range filters
-        date_from = self.request.GET.get('date_from')
-        if date_from:
-            tweets = tweets.filter(date__gte=date_from)
-            filters['date_from'] = date_from
-            
-        date_to = self.request.GET.get('date_to')
-        if date_to:
-            from django.utils import timezone
-            import datetime
-            try:
-                # Parse date and add time
-                date_obj = datetime.datetime.strptime(date_to, '%Y-%m-%d')
-                date_obj = date_obj.replace(hour=23, minute=59, second=59)
-                tweets = tweets.filter(date__lte=date_obj)
-                filters['date_to'] = date_to
-            except ValueError:
-                # Invalid date format, skip filter
-                pass
-        
-        # Status filter
-        status_filter = self.request.GET.get('status_filter', '').strip()
-        if status_filter:
-            tweets = tweets.filter(status=status_filter)
-            filters['status_filter'] = status_filter
+        # Filters and sort shared with the export, every filter uses an index
+        spec = TweetFilterSpec.from_params(self.request.GET)
+        tweets = spec.apply()
+        filters, sort_by = spec.params, spec.sort_by
+        execution_filter = filters.get('execution_id', '')
         
-        # Engagement threshold filters
-        min_likes = self.request.GET.get('min_likes')
-        if min_likes and min_likes.isdigit():
-            tweets = tweets.filter(likes__gte=int(min_likes))
-            filters['min_likes'] = min_likes
-            
-        min_retweets = self.request.GET.get('min_retweets')
-        if min_retweets and min_retweets.isdigit():
-            tweets = tweets.filter(retweets__gte=int(min_retweets))
-            filters['min_retweets'] = min_retweets
-            
-        min_views = self.request.GET.get('min_views')
-        if min_views and min_views.isdigit():
-            tweets = tweets.filter(views__gte=int(min_views))
-            filters['min_views'] = min_views
+        # Keyset pagination: opaque cursors, page N costs the same as page 1
+        per_page = self.paginate_by
+        cursor = self.request.GET.get('cursor', '')
         
-        # Processed filter
-        processed_filter = self.request.GET.get('processed_filter', '').strip()
-        if processed_filter == 'true':
-            tweets = tweets.filter(is_processed=True)
-            filters['processed_filter'] = processed_filter
-        elif processed_filter == 'false':
-            tweets = tweets.filter(is_processed=False)
-            filters['processed_filter'] = processed_filter
-        
-        # Sorting
-        sort_by = self.request.GET.get('sort_by', '-date')
-        if sort_by == '-total_engagement':
-            # Calculate total engagement as sum of likes + retweets + replies + quotes
-            tweets = tweets.annotate(
-                total_engagement=models.F('likes') + models.F('retweets') + models.F('replies') + models.F('quotes')
-            ).order_by('-total_engagement')
-        elif sort_by in ['-date', 'date', '-likes', '-retweets', '-views']:
-            tweets = tweets.order_by(sort_by)
-        else:
-            tweets = tweets.order_by('-date')  # Default sorting
-        
-        # Calculate statistics (before pagination)
-        total_tweets = SourceTweet.objects.count()  # Total in database
-        filtered_tweets_count = tweets.count()  # After filters
-        
-        # Calculate aggregated statistics for filtered results
-        aggregated_stats = tweets.aggregate(
-            total_likes=models.Sum('likes'),
-            total_retweets=models.Sum('retweets'),
-            total_views=models.Sum('views')
+        # Filtered numbers in one aggregate query, cached with the page until new tweets land
+        result = cached_result(
+            'page',
+            {**filters, 'sort_by': sort_by, 'cursor': cursor},
+            lambda: {
+                'stats': filtered_tweet_stats(tweets),
+                'page': paginate_keyset(tweets, sort_by, cursor, per_page),
+            },
         )
-        
-        total_likes = aggregated_stats['total_likes'] or 0
-        total_retweets = aggregated_stats['total_retweets'] or 0
-        total_views = aggregated_stats['total_views'] or 0
-        total_executions = tweets.values('execution_id').distinct().count()
-        
-        # Pagination
-        page = self.request.GET.get('page', 1)
-        per_page = 50  # Show 50 tweets per page
-        
-        from django.core.paginator import Paginator
-        paginator = Paginator(tweets, per_page)
-        tweets_page = paginator.get_page(page)
-        
-        # Get unique execution IDs for filter dropdown
-        execution_ids = SourceTweet.objects.values_list('execution_id', flat=True).distinct().filter(execution_id__isnull=False)
+        filtered_stats, tweets_page = result['stats'], result['page']
+        global_stats = global_tweet_stats()
         
         context.update({
             'tweets': tweets_page,
-            'total_tweets': total_tweets,
-            'filtered_tweets_count': filtered_tweets_count,
-            'total_likes': total_likes,
-            'total_retweets': total_retweets,
-            'total_views': total_views,
-            'total_executions': total_executions,
-            'execution_ids': execution_ids,
+            **filtered_stats,
+            **global_stats,
             'current_execution_filter': execution_filter,
-            'showing_start': tweets_page.start_index() if tweets_page else 0,
-            'showing_end': tweets_page.end_index() if tweets_page else 0,
-            'total_filtered': tweets_page.paginator.count if tweets_page else 0,
+            'showing_start': tweets_page.start_index(),
+            'showing_end': tweets_page.end_index(),
+            'total_filtered': filtered_stats['filtered_tweets_count'],
             'active_filters': filters,
+            'export_query': spec.querystring(),
         })
         
         return context
 
 class ExportTweetsView(LoginRequiredMixin, View):
-    """Export tweets to CSV - /twitter/sourcetweet/export/"""
+    """Export tweets as CSV or NDJSON - /twitter/sourcetweet/export/"""
     
     def get(self, request):
-        import csv
-        from django.http import HttpResponse
-        
-        # Get filter parameters
-        execution_filter = request.GET.get('execution_id', '')
+        # Same filters and order as the scraped tweets page
+        spec = TweetFilterSpec.from_params(request.GET)
         export_type = request.GET.get('type', 'all')  # 'page' or 'all'
+        export_format = request.GET.get('format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return JsonResponse(
+                {'error': f"Unsupported format '{export_format}', use one of: {', '.join(EXPORT_FORMATS)}"},
+                status=400
+            )
+        compress = request.GET.get('gzip', '').lower() in ('1', 'true', 'yes')
         
-        # Get tweets based on filter
-        tweets = SourceTweet.objects.all().order_by('-date')
-        if execution_filter:
-            tweets = tweets.filter(execution_id__icontains=execution_filter)
+        tweets = spec.ordered()
+        if export_type == 'page':
+            # Only the rows on screen: the same keyset page the browser shows for this cursor
+            page = paginate_keyset(
+                spec.apply(), spec.sort_by, request.GET.get('cursor', ''), ScrapedTweetsView.paginate_by
+            )
+            tweets = tweets.filter(pk__in=[tweet.pk for tweet in page])
         
-        # Create CSV response
-        response = HttpResponse(content_type='text/csv')
-        filename = f"scraped_tweets_{timezone.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        # Rows are streamed straight from the database cursor
+        return export_response(tweets, export_format, compress)
+
+# ============================================================================
+# BACKGROUND EXPORT JOBS - QUEUE, POLL, RESUMABLE DOWNLOAD
+# ============================================================================
+
+def get_export_job(request, job_id):
+    """The job if it belongs to the user (staff see every job), else 404"""
+    jobs = ExportJob.objects.all()
+    if not request.user.is_staff:
+        jobs = jobs.filter(created_by=request.user)
+    return get_object_or_404(jobs, job_id=job_id)
+
+class ExportJobCreateView(LoginRequiredMixin, View):
+    """Queue a full export to be written in the background - POST /twitter/export-jobs/"""
+    
+    def post(self, request):
+        if not worker_available():
+            return JsonResponse({
+                'error': "Background exports need a Celery worker (CELERY_BROKER_URL), "
+                         "use the streaming export instead"
+            }, status=503)
+        kind = request.POST.get('kind', ExportJob.KIND_SOURCE_TWEETS)
+        export_format = request.POST.get('format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return JsonResponse(
+                {'error': f"Unsupported format '{export_format}', use one of: {', '.join(EXPORT_FORMATS)}"},
+                status=400
+            )
+        if kind == ExportJob.KIND_SOURCE_TWEETS:
+            # Same filters and order as the scraped tweets page
+            spec = TweetFilterSpec.from_params(request.POST)
+            params = {**spec.params, 'sort_by': spec.sort_by}
+        elif kind == ExportJob.KIND_CAMPAIGN_BATCH:
+            batch_id = request.POST.get('batch_id', '').strip()
+            if batch_id:
+                get_object_or_404(CampaignBatch, batch_id=batch_id)
+            params = {'batch_id': batch_id} if batch_id else {}
+        else:
+            return JsonResponse({'error': f"Unknown export kind '{kind}'"}, status=400)
         
-        writer = csv.writer(response)
+        job = ExportJob.objects.create(
+            kind=kind, export_format=export_format, params=params, created_by=request.user,
+            expires_at=timezone.now() + export_ttl(),
+        )
         
-        # Write header
-        writer.writerow([
-            'Tweet ID', 'Content', 'URL', 'Likes', 'Retweets', 'Replies', 
-            'Quotes', 'Views', 'Date', 'Execution ID', 'Status'
-        ])
+        def dispatch_job():
+            try:
+                process_export_job.delay(str(job.job_id))
+            except Exception as e:
+                # The job is stored; it stays pending until the sweeper removes it
+                logger.error(f"Could not queue export job {job.job_id}: {str(e)}")
         
-        # Write data
-        for tweet in tweets:
-            writer.writerow([
-                tweet.tweet_id,
-                tweet.content,
-                tweet.url,
-                tweet.likes,
-                tweet.retweets,
-                tweet.replies,
-                tweet.quotes,
-                tweet.views,
-                tweet.date.strftime('%Y-%m-%d %H:%M:%S'),
-                tweet.execution_id,
-                tweet.status
-            ])
+        transaction.on_commit(dispatch_job)
         
+        status_url = request.build_absolute_uri(reverse('twitter:export_job_status', args=[job.job_id]))
+        logger.info(f"Queued {kind} export job {job.job_id}")
+        response = JsonResponse({
+            'job_id': str(job.job_id),
+            'status': 'accepted',
+            'status_url': status_url,
+        }, status=202)
+        response['Location'] = status_url
         return response
 
+class ExportJobStatusView(LoginRequiredMixin, View):
+    """Poll an export job's progress - GET /twitter/export-jobs/<job_id>/"""
+    
+    def get(self, request, job_id):
+        job = get_export_job(request, job_id)
+        download_url = request.build_absolute_uri(reverse('twitter:export_job_download', args=[job.job_id]))
+        return JsonResponse(job_status(job, download_url))
+
+class ExportJobDownloadView(LoginRequiredMixin, View):
+    """Download a finished export, resumable with Range requests - /twitter/export-jobs/<job_id>/download/"""
+    
+    def get(self, request, job_id):
+        job = get_export_job(request, job_id)
+        if job.status != ExportJob.STATUS_COMPLETED:
+            return JsonResponse({'error': f"Export is {job.status}", 'status': job.status}, status=409)
+        path = export_path(job.file_name)
+        if job.expires_at <= timezone.now() or not os.path.exists(path):
+            return JsonResponse({'error': 'Export has expired'}, status=410)
+        return ranged_file_response(request, path, download_filename(job), f'"{job.job_id}-{job.file_size}"')
+
 class GenerateTweetsView(TemplateView):
     """Main dashboard showing all campaign batches - /generate-tweets/"""
     template_name = 'twitter/generate_tweets.html'
@@ -728,16 +696,9 @@ class CampaignReviewView(TemplateView):
         batch_id = kwargs.get('campaign_batch')
         campaign_batch = get_object_or_404(CampaignBatch, batch_id=batch_id)
         
-        # Calculate statistics
+        # Statistics come from the batch's status counters, no aggregate queries
         tweets = campaign_batch.tweets.all()
-        stats = {
-            'total_tweets': tweets.count(),
-            'draft': tweets.filter(status='Draft').count(),
-            'approved': tweets.filter(status='Approved').count(),
-            'posted': tweets.filter(status='Posted').count(),
-            'rejected': tweets.filter(status='Rejected').count(),
-            'deleted': tweets.filter(status='Deleted').count(),
-        }
+        stats = campaign_batch.status_counts
         
         context.update({
             'campaign_batch': campaign_batch,